@@ -11,8 +11,12 @@ from datetime import datetime
 from dotenv import load_dotenv
 
 from utils.data_analyzer import DataAnalyzer
+from utils.streaming_analyzer import StreamingAnalyzer, resolve_data_path
 from utils.pdf_generator import PDFReportGenerator
-from utils.client_manager import ClientManager, EmailSender
+from utils.pdf_profiler import PDFProfiler
+from utils.batch_reports import get_batch_generator
+from utils.client_manager import EmailSender, get_client_manager
+from utils.client_import import read_clients_file
 
 # Load environment variables
 load_dotenv()
@@ -64,9 +68,42 @@ if 'df' not in st.session_state:
 if 'analyzer' not in st.session_state:
     st.session_state.analyzer = None
 if 'client_manager' not in st.session_state:
-    st.session_state.client_manager = ClientManager()
+    # Un store por proceso, compartido entre sesiones (no una copia por sesión)
+    st.session_state.client_manager = get_client_manager()
 if 'email_sender' not in st.session_state:
     st.session_state.email_sender = EmailSender()
+if 'save_report_copies' not in st.session_state:
+    st.session_state.save_report_copies = os.getenv('AUTOREPORT_SAVE_PDFS', '').lower() in ('1', 'true', 'yes')
+if 'compact_pdfs' not in st.session_state:
+    st.session_state.compact_pdfs = os.getenv('AUTOREPORT_COMPACT_PDFS', 'true').lower() in ('1', 'true', 'yes')
+if 'incremental_pdfs' not in st.session_state:
+    # Opt-in: guarda en disco (.autoreport_cache/pages) las secciones de cada PDF
+    st.session_state.incremental_pdfs = os.getenv('AUTOREPORT_INCREMENTAL_PDFS', '').lower() in ('1', 'true', 'yes')
+
+# Modo streaming: solo se leen CSVs dentro de este directorio (vacío: solo uploads)
+STREAMING_DATA_DIR = os.getenv('AUTOREPORT_DATA_DIR', '')
+# CSVs subidos más grandes que esto se analizan por bloques en vez de cargarse enteros
+STREAMING_UPLOAD_BYTES = int(os.getenv('AUTOREPORT_STREAMING_UPLOAD_MB', '200')) * 1024 * 1024
+
+# Tiempos por etapa y página de cada PDF en el log del servidor
+PROFILE_PDFS = os.getenv('AUTOREPORT_PROFILE_PDFS', '').lower() in ('1', 'true', 'yes')
+
+
+def pdf_profiler():
+    """Profiler que loguea cada PDF generado, solo si AUTOREPORT_PROFILE_PDFS está activo."""
+    return PDFProfiler(memory=False, log=True) if PROFILE_PDFS else None
+
+
+def save_report_copy(pdf_bytes: bytes, file_name: str):
+    """Guarda una copia del PDF en reports/ si está activado en Settings. Devuelve la ruta o None."""
+    if not st.session_state.save_report_copies:
+        return None
+    os.makedirs("reports", exist_ok=True)
+    pdf_path = os.path.join("reports", file_name)
+    with open(pdf_path, 'wb') as f:
+        f.write(pdf_bytes)
+    return pdf_path
+
 
 # Header
 st.markdown('<div class="main-header">📊 AutoReport</div>', unsafe_allow_html=True)
@@ -88,11 +125,11 @@ with st.sidebar:
     st.markdown("---")
     
     # Stats
-    total_clients = len(st.session_state.client_manager.get_all_clients())
+    total_clients = st.session_state.client_manager.get_report_totals()['clients']
     st.metric("Total Clientes", total_clients)
     
     if st.session_state.df is not None:
-        st.metric("Registros Cargados", len(st.session_state.df))
+        st.metric("Registros Cargados", st.session_state.analyzer.record_count())
 
 # Main tabs
 tab1, tab2, tab3, tab4 = st.tabs(["📁 Upload Data", "📊 Preview Dashboard", "👥 Clientes", "⚙️ Settings"])
@@ -122,16 +159,24 @@ with tab1:
         
         if uploaded_file is not None:
             try:
-                # Load data
-                if uploaded_file.name.endswith('.csv'):
-                    df = pd.read_csv(uploaded_file)
-                else:
-                    df = pd.read_excel(uploaded_file)
+                # Load data (solo cuando cambia el archivo; los reruns reutilizan el analyzer).
+                # Un archivo ya visto se carga desde la caché columnar sin re-parsear.
+                if st.session_state.get('uploaded_file_id') != uploaded_file.file_id:
+                    if uploaded_file.name.endswith('.csv') and uploaded_file.size > STREAMING_UPLOAD_BYTES:
+                        # CSV grande: se lee por bloques desde el upload, sin copiarlo ni cargarlo entero
+                        uploaded_file.seek(0)
+                        with st.spinner("Analizando archivo por bloques..."):
+                            analyzer = StreamingAnalyzer(uploaded_file)
+                    else:
+                        analyzer = DataAnalyzer.from_upload(uploaded_file.getvalue(), uploaded_file.name)
+                    
+                    st.session_state.df = analyzer.df
+                    st.session_state.analyzer = analyzer
+                    st.session_state.uploaded_file_id = uploaded_file.file_id
                 
-                st.session_state.df = df
-                st.session_state.analyzer = DataAnalyzer(df)
+                df = st.session_state.df
                 
-                st.success(f"✅ Archivo cargado: {uploaded_file.name} ({len(df)} registros)")
+                st.success(f"✅ Archivo cargado: {uploaded_file.name} ({st.session_state.analyzer.record_count():,} registros)")
                 
                 # Show preview
                 with st.expander("👀 Ver datos (primeras 10 filas)"):
@@ -171,6 +216,36 @@ with tab1:
                 
             except Exception as e:
                 st.error(f"❌ Error al cargar archivo: {e}")
+        
+        # Archivos más grandes que la memoria: lectura por bloques desde el directorio de datos
+        with st.expander("📦 Archivo grande (modo streaming)"):
+            st.markdown(
+                "Para CSVs que no caben en memoria: se analizan por bloques sin cargarlos completos. "
+                f"Los CSVs subidos de más de {STREAMING_UPLOAD_BYTES // (1024 * 1024)} MB se analizan así automáticamente."
+            )
+            
+            if STREAMING_DATA_DIR:
+                stream_name = st.text_input("Archivo en el directorio de datos", placeholder="transacciones_2024.csv")
+                stream_chunksize = st.number_input("Filas por bloque", min_value=10_000, value=200_000, step=50_000)
+                
+                if st.button("⚡ Analizar en streaming"):
+                    stream_path = resolve_data_path(STREAMING_DATA_DIR, stream_name)
+                    if stream_path is not None:
+                        try:
+                            with st.spinner("Analizando archivo por bloques..."):
+                                analyzer = StreamingAnalyzer(stream_path, chunksize=int(stream_chunksize))
+                            
+                            st.session_state.df = analyzer.df
+                            st.session_state.analyzer = analyzer
+                            st.session_state.uploaded_file_id = None
+                            
+                            st.success(f"✅ Archivo analizado: {os.path.basename(stream_path)} ({analyzer.record_count():,} registros)")
+                        except Exception as e:
+                            st.error(f"❌ Error al analizar archivo: {e}")
+                    else:
+                        st.error("❌ Archivo no disponible en el directorio de datos")
+            else:
+                st.caption("Para leer archivos del servidor, configura AUTOREPORT_DATA_DIR.")
     
     with col2:
         st.info("""
@@ -198,6 +273,7 @@ with tab2:
         metrics = analyzer.get_key_metrics()
         charts = analyzer.get_chart_data()
         insights = analyzer.get_insights()
+        growth_horizons = analyzer.get_growth_horizons()
         
         # Key Metrics
         st.subheader("📊 Métricas Clave")
@@ -225,6 +301,19 @@ with tab2:
                     delta="↑ 12%" if i == 0 else None  # Simulated growth
                 )
         
+        # Crecimiento por período (WoW, MoM, QoQ, YoY) con el mismo costo que uno
+        if len(growth_horizons) > 1:
+            st.markdown("**📅 Crecimiento por Período**")
+            
+            horizon_cols = st.columns(len(growth_horizons))
+            for horizon_col, horizon in zip(horizon_cols, growth_horizons.values()):
+                with horizon_col:
+                    st.metric(
+                        label=horizon['label'],
+                        value=f"${horizon['current']:,.2f}",
+                        delta=f"{horizon['value']:+.1f}%"
+                    )
+        
         st.markdown("---")
         
         # Charts
@@ -236,6 +325,28 @@ with tab2:
             if charts['line_chart']:
                 line_data = charts['line_chart']
                 
+                # Serie reducida (LTTB): permite acercar un rango a más resolución
+                if line_data.get('downsampled'):
+                    st.caption(
+                        f"Mostrando {len(line_data['x_data']):,} de {line_data['total_points']:,} puntos"
+                    )
+                    
+                    with st.expander("🔍 Acercar rango de fechas"):
+                        first_date = pd.to_datetime(line_data['x_data'][0]).date()
+                        last_date = pd.to_datetime(line_data['x_data'][-1]).date()
+                        zoom_range = st.date_input(
+                            "Rango",
+                            value=(first_date, last_date),
+                            min_value=first_date,
+                            max_value=last_date
+                        )
+                        
+                        if isinstance(zoom_range, tuple) and len(zoom_range) == 2:
+                            zoom_end = pd.Timestamp(zoom_range[1]) + pd.Timedelta(days=1) - pd.Timedelta(1)
+                            zoomed = analyzer.get_time_series(zoom_range[0], zoom_end)
+                            if zoomed and zoomed['x_data']:
+                                line_data = zoomed
+                
                 option = {
                     "title": {"text": line_data['title'], "left": "center"},
                     "tooltip": {"trigger": "axis"},
@@ -335,6 +446,28 @@ with tab2:
         
         st.markdown("---")
         
+        # Multi-dimension breakdown: se lee del cubo ya materializado, sin recalcular
+        cube = analyzer.get_cube()
+        if cube is not None and (len(cube.dimensions) > 1 or len(cube.measures) > 1):
+            st.subheader("🧊 Análisis Multi-dimensión")
+            
+            cube_col1, cube_col2, cube_col3 = st.columns(3)
+            with cube_col1:
+                cube_measure = st.selectbox("Métrica", cube.measures)
+            with cube_col2:
+                cube_view = st.selectbox("Dimensiones", cube.views(), format_func=lambda dims: " × ".join(dims))
+            with cube_col3:
+                cube_how = st.selectbox(
+                    "Agregación",
+                    ['sum', 'mean', 'count'],
+                    format_func={'sum': 'Total', 'mean': 'Promedio', 'count': 'Registros'}.get
+                )
+            
+            cube_slice = cube.top(cube_view, cube_measure, n=20, how=cube_how)
+            st.dataframe(cube_slice.reset_index(), use_container_width=True)
+            
+            st.markdown("---")
+        
         # Insights
         st.subheader("💡 Insights Automáticos")
         
@@ -348,11 +481,17 @@ with tab2:
         # Actions
         st.subheader("🚀 Acciones")
         
+        include_appendix = st.checkbox(
+            "📎 Incluir anexo con datos completos",
+            value=False,
+            help="Agrega al PDF la serie diaria completa y todas las categorías (puede sumar muchas páginas)"
+        )
+        
         action_col1, action_col2, action_col3 = st.columns(3)
         
         with action_col1:
             # Select client
-            clients = st.session_state.client_manager.get_all_clients()
+            clients = st.session_state.client_manager.list_clients()
             
             if clients:
                 client_options = {f"{c['name']} ({c['email']})": c['id'] for c in clients}
@@ -372,47 +511,67 @@ with tab2:
             if st.button("📥 Generar PDF", type="primary", use_container_width=True):
                 with st.spinner("Generando PDF profesional..."):
                     try:
-                        # Get client name
+                        # Get client name and brand color
                         client_name = "Demo Client"
+                        brand_color = None
                         if hasattr(st.session_state, 'selected_client_id') and st.session_state.selected_client_id:
                             client = st.session_state.client_manager.get_client(st.session_state.selected_client_id)
                             if client:
                                 client_name = client['name']
+                                brand_color = client.get('brand_color')
                         
                         # Prepare data for PDF
                         pdf_data = {
                             'metrics': metrics,
                             'charts': charts,
-                            'insights': insights
+                            'insights': insights,
+                            'growth_horizons': growth_horizons,
+                            'breakdowns': analyzer.get_breakdowns()
                         }
+                        if include_appendix:
+                            pdf_data['appendix'] = analyzer.get_appendix_tables()
                         
-                        # Generate PDF
-                        output_path = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+                        # Generate PDF (en memoria; la copia en disco es opcional)
+                        file_name = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
                         generator = PDFReportGenerator(
                             client_name=client_name,
                             data=pdf_data,
-                            output_path=output_path
+                            output_path=None,
+                            brand_color=brand_color,
+                            compact=st.session_state.compact_pdfs,
+                            incremental=st.session_state.incremental_pdfs,
+                            profiler=pdf_profiler()
                         )
                         
-                        pdf_path = generator.generate()
+                        pdf_bytes = generator.render()
+                        pdf_path = save_report_copy(pdf_bytes, file_name)
+                        
+                        # El botón de email reutiliza este PDF en lugar de generar otro
+                        st.session_state.last_report = {
+                            'client_id': st.session_state.get('selected_client_id'),
+                            'fingerprint': analyzer.fingerprint,
+                            'appendix': include_appendix,
+                            'file_name': file_name,
+                            'pdf_bytes': pdf_bytes,
+                            'pdf_path': pdf_path
+                        }
                         
-                        st.success(f"✅ PDF generado: {pdf_path}")
+                        st.success(f"✅ PDF generado: {pdf_path or file_name} ({generator.output_size / 1024:,.1f} KB)")
                         
                         # Download button
-                        with open(pdf_path, "rb") as pdf_file:
-                            st.download_button(
-                                label="⬇️ Descargar PDF",
-                                data=pdf_file,
-                                file_name=output_path,
-                                mime="application/pdf",
-                                use_container_width=True
-                            )
+                        st.download_button(
+                            label="⬇️ Descargar PDF",
+                            data=pdf_bytes,
+                            file_name=file_name,
+                            mime="application/pdf",
+                            use_container_width=True
+                        )
                         
                         # Save to client history
                         if hasattr(st.session_state, 'selected_client_id') and st.session_state.selected_client_id:
                             st.session_state.client_manager.add_report_to_client(
                                 st.session_state.selected_client_id,
-                                {'metrics': metrics, 'pdf_path': pdf_path}
+                                {'metrics': metrics, 'pdf_path': pdf_path or ''}
                             )
                         
                     except Exception as e:
@@ -427,37 +586,58 @@ with tab2:
                         try:
                             client = st.session_state.client_manager.get_client(st.session_state.selected_client_id)
                             
-                            # Generate PDF first
-                            pdf_data = {
-                                'metrics': metrics,
-                                'charts': charts,
-                                'insights': insights
-                            }
-                            
-                            output_path = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-                            generator = PDFReportGenerator(
-                                client_name=client['name'],
-                                data=pdf_data,
-                                output_path=output_path
-                            )
-                            
-                            pdf_path = generator.generate()
+                            last_report = st.session_state.get('last_report')
+                            if (last_report and last_report['client_id'] == client['id']
+                                    and last_report['fingerprint'] == analyzer.fingerprint
+                                    and last_report.get('appendix') == include_appendix):
+                                # Mismo cliente y mismos datos: se adjunta el PDF ya generado
+                                file_name = last_report['file_name']
+                                pdf_bytes = last_report['pdf_bytes']
+                                pdf_path = last_report['pdf_path']
+                                is_new_report = False
+                            else:
+                                pdf_data = {
+                                    'metrics': metrics,
+                                    'charts': charts,
+                                    'insights': insights,
+                                    'growth_horizons': growth_horizons,
+                                    'breakdowns': analyzer.get_breakdowns()
+                                }
+                                if include_appendix:
+                                    pdf_data['appendix'] = analyzer.get_appendix_tables()
+                                
+                                file_name = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+                                generator = PDFReportGenerator(
+                                    client_name=client['name'],
+                                    data=pdf_data,
+                                    output_path=None,
+                                    brand_color=client.get('brand_color'),
+                                    compact=st.session_state.compact_pdfs,
+                                    incremental=st.session_state.incremental_pdfs,
+                                    profiler=pdf_profiler()
+                                )
+                                
+                                pdf_bytes = generator.render()
+                                pdf_path = save_report_copy(pdf_bytes, file_name)
+                                is_new_report = True
                             
                             # Send email
                             success = st.session_state.email_sender.send_report(
                                 to_email=client['email'],
                                 client_name=client['name'],
-                                pdf_path=pdf_path
+                                pdf_bytes=pdf_bytes,
+                                filename=file_name
                             )
                             
                             if success:
                                 st.success(f"✅ Email enviado a {client['email']}")
                                 
-                                # Save to history
-                                st.session_state.client_manager.add_report_to_client(
-                                    st.session_state.selected_client_id,
-                                    {'metrics': metrics, 'pdf_path': pdf_path}
-                                )
+                                # Save to history (el PDF recién generado ya quedó registrado)
+                                if is_new_report:
+                                    st.session_state.client_manager.add_report_to_client(
+                                        st.session_state.selected_client_id,
+                                        {'metrics': metrics, 'pdf_path': pdf_path or ''}
+                                    )
                             else:
                                 st.warning("⚠️ Email no configurado. Verifica SENDGRID_API_KEY en Settings")
                         
@@ -496,16 +676,112 @@ with tab3:
                 else:
                     st.error("❌ Nombre y email son obligatorios")
     
+    # Alta masiva: valida y deduplica todo el archivo y lo guarda en una sola escritura
+    with st.expander("📥 Importar / exportar clientes", expanded=False):
+        st.markdown("CSV o Excel con columnas **email** (obligatoria), name, company y brand_color "
+                    "(también en español: correo, nombre, empresa, color)")
+        clients_file = st.file_uploader("Archivo de clientes", type=['csv', 'xlsx', 'xls'], key="clients_import_file")
+        
+        if clients_file is not None and st.button("📥 Importar clientes", use_container_width=True):
+            try:
+                result = st.session_state.client_manager.import_clients(
+                    read_clients_file(clients_file.getvalue(), clients_file.name)
+                )
+                st.success(f"✅ {len(result['imported'])} clientes importados")
+                if result['duplicates']:
+                    st.warning(f"⚠️ {len(result['duplicates'])} filas omitidas por email repetido")
+                if result['invalid']:
+                    st.warning(f"⚠️ {len(result['invalid'])} filas con email inválido")
+                skipped = result['duplicates'] + result['invalid']
+                if skipped:
+                    st.dataframe(pd.DataFrame(skipped).sort_values('row'), use_container_width=True, hide_index=True)
+            except Exception as e:
+                st.error(f"❌ Error al importar clientes: {e}")
+        
+        st.download_button(
+            "📤 Exportar clientes (CSV)",
+            data=st.session_state.client_manager.export_clients().to_csv(index=False).encode('utf-8'),
+            file_name=f"clientes_{datetime.now().strftime('%Y%m%d')}.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+    
     st.markdown("---")
     
-    # List clients
-    clients = st.session_state.client_manager.get_all_clients()
+    # List clients (sin histórico: los contadores vienen del store)
+    clients = st.session_state.client_manager.list_clients()
     
     if not clients:
         st.info("📭 No hay clientes aún. Añade uno arriba.")
     else:
         st.subheader(f"👥 Clientes ({len(clients)})")
         
+        # Batch: un reporte por cliente con los datos cargados, en paralelo
+        with st.expander("📦 Generar reportes para todos los clientes", expanded=False):
+            email_batch = st.checkbox(
+                "📧 Enviar cada reporte por email al terminar",
+                help="Envío en paralelo, con límite de tasa y reintentos ante errores temporales"
+            )
+            if st.session_state.analyzer is None:
+                st.info("Sube un archivo en la pestaña Upload Data primero")
+            elif st.button("🚀 Generar en lote", use_container_width=True):
+                batch_analyzer = st.session_state.analyzer
+                batch_data = {
+                    'metrics': batch_analyzer.get_key_metrics(),
+                    'charts': batch_analyzer.get_chart_data(),
+                    'insights': batch_analyzer.get_insights(),
+                    'growth_horizons': batch_analyzer.get_growth_horizons(),
+                    'breakdowns': batch_analyzer.get_breakdowns()
+                }
+                
+                batch_dir = os.path.join("reports", datetime.now().strftime('%Y%m%d_%H%M%S'))
+                os.makedirs(batch_dir, exist_ok=True)
+                jobs = [
+                    {
+                        'client_name': client['name'],
+                        'data': batch_data,
+                        'output_path': os.path.join(batch_dir, f"report_{client['id']}.pdf"),
+                        'brand_color': client.get('brand_color'),
+                        'compact': st.session_state.compact_pdfs,
+                        'incremental': st.session_state.incremental_pdfs,
+                        'profile': PROFILE_PDFS
+                    }
+                    for client in clients
+                ]
+                
+                with st.spinner(f"Generando {len(jobs)} reportes..."):
+                    results = get_batch_generator().generate(jobs)
+                
+                for client, result in zip(clients, results):
+                    if result['ok']:
+                        st.session_state.client_manager.add_report_to_client(
+                            client['id'],
+                            {'metrics': batch_data['metrics'], 'pdf_path': result['output_path']}
+                        )
+                
+                generated = sum(1 for result in results if result['ok'])
+                batch_kb = sum(result.get('bytes') or 0 for result in results) / 1024
+                st.success(f"✅ {generated}/{len(results)} reportes generados en {batch_dir} ({batch_kb:,.1f} KB)")
+                for result in results:
+                    if not result['ok']:
+                        st.error(f"❌ {result['client_name']}: {result['error']}")
+                
+                if email_batch:
+                    email_jobs = [
+                        {
+                            'to_email': client['email'],
+                            'client_name': client['name'],
+                            'pdf_path': result['output_path']
+                        }
+                        for client, result in zip(clients, results) if result['ok']
+                    ]
+                    with st.spinner(f"Enviando {len(email_jobs)} emails..."):
+                        sent = st.session_state.email_sender.send_bulk(email_jobs)
+                    st.success(f"📧 {sum(1 for result in sent if result['ok'])}/{len(sent)} emails enviados")
+                    for result in sent:
+                        if not result['ok']:
+                            st.error(f"❌ {result['to_email']}: {result['error']} ({result['attempts']} intentos)")
+        
         for client in clients:
             with st.container():
                 col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
@@ -518,8 +794,7 @@ with tab3:
                     if client.get('company'):
                         st.markdown(f"🏢 {client['company']}")
                     
-                    reports_count = len(client.get('reports', []))
-                    st.markdown(f"📊 {reports_count} reportes enviados")
+                    st.markdown(f"📊 {client['report_count']} reportes enviados")
                 
                 with col3:
                     if st.button("📋 Histórico", key=f"hist_{client['id']}"):
@@ -532,13 +807,28 @@ with tab3:
                 
                 # Show history if selected
                 if hasattr(st.session_state, 'show_history') and st.session_state.show_history == client['id']:
-                    reports = client.get('reports', [])
-                    
-                    if reports:
+                    if client['report_count']:
                         st.markdown("**Histórico de Reportes:**")
-                        for i, report in enumerate(reversed(reports[-5:])):  # Last 5
+                        page = 1
+                        if client['report_count'] > 5:
+                            page = st.number_input(
+                                "Página",
+                                min_value=1,
+                                max_value=-(-client['report_count'] // 5),
+                                value=1,
+                                key=f"hist_page_{client['id']}"
+                            )
+                        # Solo la página pedida, del más nuevo al más viejo
+                        history = st.session_state.client_manager.get_client_reports_page(client['id'], page=page, per_page=5)
+                        for report in history['reports']:
                             date = datetime.fromisoformat(report['date']).strftime("%Y-%m-%d %H:%M")
                             st.markdown(f"- {date}")
+                        
+                        # Tendencia desde la serie columnar, sin recorrer el histórico
+                        revenue = st.session_state.client_manager.get_metric_series(client['id'], 'total_revenue', last=52)
+                        if revenue.notna().sum() > 1:
+                            st.caption("Revenue de los últimos 52 reportes")
+                            st.line_chart(revenue.dropna())
                     else:
                         st.info("Sin reportes aún")
                 
@@ -599,20 +889,40 @@ with tab4:
     
     st.markdown("---")
     
+    st.subheader("📄 Reportes PDF")
+    st.session_state.save_report_copies = st.checkbox(
+        "💾 Guardar una copia de cada PDF en reports/",
+        value=st.session_state.save_report_copies,
+        help="Los PDFs se generan en memoria para descargar y enviar; la copia en disco es opcional"
+    )
+    st.session_state.compact_pdfs = st.checkbox(
+        "🗜️ PDFs compactos",
+        value=st.session_state.compact_pdfs,
+        help="Streams comprimidos y en binario: adjuntos más livianos, mismo contenido"
+    )
+    st.session_state.incremental_pdfs = st.checkbox(
+        "♻️ Reutilizar páginas sin cambios",
+        value=st.session_state.incremental_pdfs,
+        help="Guarda cada página renderizada en .autoreport_cache/pages y solo vuelve a generar "
+             "las que cambiaron. Deja copias de los reportes en el disco del servidor"
+    )
+    
+    st.markdown("---")
+    
     st.subheader("📊 Estadísticas de Uso")
     
     stat_col1, stat_col2, stat_col3 = st.columns(3)
     
+    totals = st.session_state.client_manager.get_report_totals()
+    
     with stat_col1:
-        total_clients = len(st.session_state.client_manager.get_all_clients())
-        st.metric("Total Clientes", total_clients)
+        st.metric("Total Clientes", totals['clients'])
     
     with stat_col2:
-        total_reports = sum(
-            len(c.get('reports', [])) 
-            for c in st.session_state.client_manager.get_all_clients()
-        )
-        st.metric("Total Reportes Enviados", total_reports)
+        st.metric("Total Reportes Enviados", totals['reports'])
+        if totals['last_report_at']:
+            last_sent = datetime.fromisoformat(totals['last_report_at']).strftime("%Y-%m-%d %H:%M")
+            st.caption(f"Último envío: {last_sent}")
     
     with stat_col3:
         if st.session_state.df is not None:
@@ -0,0 +1,126 @@
+"""
+Benchmark: plan de agregación compartido vs. el camino anterior de DataAnalyzer.
+Compara get_key_metrics + get_chart_data + get_insights sobre datos sintéticos.
+
+Uso:
+    python benchmarks/bench_aggregation.py --rows 2000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_analyzer import DataAnalyzer
+from utils.result_cache import ResultCache
+
+
+def make_frame(rows: int, categories: int = 50, customers: int = 10000, seed: int = 42) -> pd.DataFrame:
+    """Genera un DataFrame con el esquema de examples/ecommerce_example.csv."""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D')
+    return pd.DataFrame({
+        'date': dates,
+        'revenue': rng.gamma(2.0, 500.0, rows).round(2),
+        'orders': rng.integers(1, 100, rows),
+        'category': pd.Series(rng.integers(0, categories, rows)).map(lambda i: f'Category {i}'),
+        'customer': pd.Series(rng.integers(0, customers, rows)).map(lambda i: f'Customer {i}'),
+    })
+
+
+def legacy_chart_data(analyzer: DataAnalyzer) -> dict:
+    """Camino anterior: copia del frame + groupby + sort completo por cada chart."""
+    df = analyzer.df
+    detected = analyzer.detected_columns
+    revenue_col = [c for c in detected['numeric'] if detected['metrics'].get(c) == 'currency'][0]
+    date_col = detected['dates'][0]
+    category_col = detected['categories'][0]
+    charts = {}
+    
+    df_copy = df.copy()
+    df_copy[revenue_col] = pd.to_numeric(df_copy[revenue_col], errors='coerce')
+    grouped = df_copy.groupby(date_col)[revenue_col].sum().reset_index().sort_values(date_col)
+    charts['line_chart'] = (grouped[date_col].astype(str).tolist(), grouped[revenue_col].tolist())
+    
+    for name in ('pie_chart', 'bar_chart'):
+        df_copy = df.copy()
+        df_copy[revenue_col] = pd.to_numeric(df_copy[revenue_col], errors='coerce')
+        grouped = df_copy.groupby(category_col)[revenue_col].sum().reset_index()
+        grouped = grouped.sort_values(revenue_col, ascending=False).head(10)
+        charts[name] = (grouped[category_col].tolist(), grouped[revenue_col].tolist())
+    
+    return charts
+
+
+def legacy_growth(analyzer: DataAnalyzer) -> float:
+    """Camino anterior del growth: copia, re-parseo, sort y dos máscaras."""
+    df_sorted = analyzer.df.copy()
+    df_sorted['date'] = pd.to_datetime(df_sorted['date'])
+    df_sorted['revenue'] = pd.to_numeric(df_sorted['revenue'], errors='coerce')
+    df_sorted = df_sorted.sort_values('date')
+    latest_date = df_sorted['date'].max()
+    week_ago = latest_date - pd.Timedelta(days=7)
+    two_weeks_ago = latest_date - pd.Timedelta(days=14)
+    current_week = df_sorted[df_sorted['date'] >= week_ago]['revenue'].sum()
+    previous_week = df_sorted[(df_sorted['date'] >= two_weeks_ago) & (df_sorted['date'] < week_ago)]['revenue'].sum()
+    return (current_week - previous_week) / previous_week * 100
+
+
+def legacy_pipeline(analyzer: DataAnalyzer):
+    # get_insights llamaba de nuevo a get_key_metrics y get_chart_data
+    for _ in range(2):
+        legacy_growth(analyzer)
+        legacy_chart_data(analyzer)
+
+
+def fresh_analyzer(analyzer: DataAnalyzer) -> DataAnalyzer:
+    """Analyzer nuevo sobre los mismos datos: sin plan, comparador ni resultados cacheados.
+
+    Reusa el esquema detectado y el fingerprint, que el camino anterior tampoco medía.
+    """
+    return DataAnalyzer(analyzer.df, cache=ResultCache(), detected_columns=analyzer.detected_columns,
+                        fingerprint=analyzer.fingerprint)
+
+
+def planned_pipeline(analyzer: DataAnalyzer):
+    analyzer.get_key_metrics()
+    analyzer.get_chart_data()
+    analyzer.get_insights()
+
+
+def timeit(fn, make, repeat: int) -> float:
+    """Mejor tiempo de `repeat` corridas, cada una sobre un analyzer recién hecho por `make`."""
+    best = float('inf')
+    for _ in range(repeat):
+        analyzer = make()
+        start = time.perf_counter()
+        fn(analyzer)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    df = make_frame(args.rows)
+    analyzer = DataAnalyzer(df)
+    
+    legacy = timeit(legacy_pipeline, lambda: analyzer, args.repeat)
+    planned = timeit(planned_pipeline, lambda: fresh_analyzer(analyzer), args.repeat)
+    
+    print(f"rows={args.rows:,}")
+    print(f"legacy  : {legacy * 1000:10.1f} ms")
+    print(f"planned : {planned * 1000:10.1f} ms")
+    print(f"speedup : {legacy / planned:10.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: tabla del anexo con ChunkedTable (LongTables por bloque) vs. un
+único LongTable con todas las filas. Mide tiempo de render y pico de RSS;
+cada caso corre en un proceso nuevo.
+
+Uso:
+    python benchmarks/bench_appendix.py --rows 1000 10000 100000 --naive-max 20000
+"""
+
+import argparse
+import io
+import multiprocessing as mp
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.platypus import LongTable, SimpleDocTemplate
+
+from run_suite import PeakMemory
+from utils.long_table import FORMATTERS, ChunkedTable
+from utils.report_template import get_report_template
+
+COL_WIDTHS = [3.1 * inch, 2 * inch, 1.2 * inch]
+
+
+def make_table(rows: int, seed: int = 42) -> dict:
+    """Serie diaria como la de DataAnalyzer.get_appendix_tables()."""
+    rng = np.random.default_rng(seed)
+    revenue = rng.gamma(2.0, 500.0, rows).round(2)
+    dates = pd.date_range('2000-01-01', periods=rows, freq='D').strftime('%Y-%m-%d')
+    return {
+        'columns': ['date', 'revenue', '% of Total'],
+        'formats': ['text', 'currency', 'percentage'],
+        'data': [dates.tolist(), revenue.tolist(), (revenue / revenue.sum() * 100).tolist()]
+    }
+
+
+def chunked(table: dict, style):
+    return [ChunkedTable(table['columns'], table['data'], table['formats'], COL_WIDTHS, style)]
+
+
+def naive(table: dict, style):
+    """Todas las celdas formateadas en un solo LongTable, partido por platypus."""
+    formatters = [FORMATTERS[fmt] for fmt in table['formats']]
+    cells = [table['columns']] + [
+        [formatter(value) for formatter, value in zip(formatters, values)]
+        for values in zip(*table['data'])
+    ]
+    long_table = LongTable(cells, colWidths=COL_WIDTHS, rowHeights=12, repeatRows=1)
+    long_table.setStyle(style)
+    return [long_table]
+
+
+def run_case(method: str, rows: int) -> dict:
+    table = make_table(rows)
+    style = get_report_template().table_styles['appendix']
+    build = chunked if method == 'chunked' else naive
+    
+    with PeakMemory() as memory:
+        start = time.perf_counter()
+        buffer = io.BytesIO()
+        SimpleDocTemplate(buffer, pagesize=letter).build(build(table, style))
+        elapsed = time.perf_counter() - start
+    return {'seconds': elapsed, 'peak_mb': memory.delta_mb, 'kb': len(buffer.getvalue()) / 1024}
+
+
+def _run(queue, *args):
+    queue.put(run_case(*args))
+
+
+def run_isolated(*args) -> dict:
+    queue = mp.Queue()
+    process = mp.Process(target=_run, args=(queue, *args))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--naive-max', type=int, default=20_000, help='Filas máximas para el LongTable único')
+    args = parser.parse_args()
+    
+    print(f"{'rows':>9s} {'method':>8s} {'time s':>8s} {'us/row':>8s} {'peak MB':>8s} {'PDF KB':>8s}")
+    for rows in args.rows:
+        for method in ('chunked', 'naive'):
+            if method == 'naive' and rows > args.naive_max:
+                continue
+            result = run_isolated(method, rows)
+            print(f"{rows:9,d} {method:>8s} {result['seconds']:8.2f} {result['seconds'] / rows * 1e6:8.1f} "
+                  f"{result['peak_mb']:8.1f} {result['kb']:8.0f}")
+
+
+if __name__ == '__main__':
+    main()
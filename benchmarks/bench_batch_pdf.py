@@ -0,0 +1,73 @@
+"""
+Benchmark: reportes por segundo generando un lote en serie vs. con
+BatchReportGenerator (pool de procesos calentado) y distinto número de workers.
+
+Uso:
+    python benchmarks/bench_batch_pdf.py --reports 200 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_pdf import BRAND_COLORS, report_data
+from utils.batch_reports import BatchReportGenerator
+from utils.pdf_generator import PDFReportGenerator
+
+
+def make_jobs(data: dict, reports: int, output_dir: str) -> list:
+    return [
+        {
+            'client_name': f'Client {i}',
+            'data': data,
+            'output_path': os.path.join(output_dir, f'report_{i}.pdf'),
+            'brand_color': BRAND_COLORS[i % len(BRAND_COLORS)]
+        }
+        for i in range(reports)
+    ]
+
+
+def sequential(jobs: list) -> float:
+    start = time.perf_counter()
+    for job in jobs:
+        PDFReportGenerator(**job).generate()
+    return time.perf_counter() - start
+
+
+def pooled(jobs: list, workers: int) -> float:
+    with BatchReportGenerator(max_workers=workers) as batch:
+        # El pool ya está caliente: solo se mide el lote
+        start = time.perf_counter()
+        results = batch.generate(jobs)
+        elapsed = time.perf_counter() - start
+    failed = [result for result in results if not result['ok']]
+    if failed:
+        raise RuntimeError(failed[0]['error'])
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reports', type=int, default=200)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+    
+    data = report_data()
+    print(f"reports={args.reports} cpus={os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as output_dir:
+        jobs = make_jobs(data, args.reports, output_dir)
+        
+        baseline = sequential(jobs)
+        print(f"{'sequential':12s} {args.reports / baseline:8.1f} reports/s")
+        for workers in sorted(set(args.workers)):
+            elapsed = pooled(jobs, workers)
+            print(f"{f'{workers} workers':12s} {args.reports / elapsed:8.1f} reports/s  ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
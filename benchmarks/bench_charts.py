@@ -0,0 +1,75 @@
+"""
+Benchmark: charts del PDF construidos en cada reporte vs. servidos desde la
+caché por contenido (en memoria y en disco, como los ve un worker nuevo).
+
+Uso:
+    python benchmarks/bench_charts.py --points 30 240 2000 --repeat 20
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.chart_cache import ChartCache
+from utils.pdf_charts import BUILDERS, CHART_HEIGHT, CHART_WIDTH, chart_inputs
+
+
+def make_charts(points: int, seed: int = 42) -> dict:
+    """Charts con la forma de DataAnalyzer.get_chart_data()."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2025-01-01', periods=points, freq='D')
+    labels = [f'Category {i}' for i in range(10)]
+    values = sorted(rng.gamma(2.0, 5000.0, 10).round(2).tolist(), reverse=True)
+    return {
+        'line': {'x_data': dates.astype(str).tolist(), 'y_data': rng.gamma(2.0, 500.0, points).round(2).tolist()},
+        'pie': {'labels': labels, 'values': values}
+    }
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, nargs='+', default=[30, 240, 2000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    style = {'brand_color': '#1f77b4', 'width': CHART_WIDTH, 'height': CHART_HEIGHT}
+    
+    print(f"{'points':>7s} {'chart':>5s} {'build ms':>10s} {'memory ms':>10s} {'disk ms':>10s} {'disk KB':>8s}")
+    for points in args.points:
+        charts = make_charts(points)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for kind, chart in charts.items():
+                data = chart_inputs(kind, chart)
+                
+                build = best_of(lambda: BUILDERS[kind](data, style), args.repeat)
+                
+                cache = ChartCache(cache_dir)
+                cache.get_or_build(kind, data, style, BUILDERS[kind])
+                memory = best_of(lambda: cache.get_or_build(kind, data, style, BUILDERS[kind]), args.repeat)
+                # Caché nueva sobre el mismo directorio: lo que ve otro worker
+                disk = best_of(lambda: ChartCache(cache_dir).get_or_build(kind, data, style, BUILDERS[kind]),
+                               args.repeat)
+                
+                size = os.path.getsize(os.path.join(cache_dir, f"{cache.key_for(kind, data, style)}.json"))
+                print(f"{points:7d} {kind:>5s} {build * 1000:10.2f} {memory * 1000:10.3f} "
+                      f"{disk * 1000:10.2f} {size / 1024:8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: alta de N clientes de un CSV con `add_client` uno por uno
+(camino anterior: una escritura por cliente) vs. `import_clients` (una
+validación vectorizada y una sola escritura), en cada backend.
+
+Uso:
+    python benchmarks/bench_client_import.py --clients 1000 5000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.client_manager import ClientManager
+from utils.client_storage import JSONClientStorage, SQLiteClientStorage
+
+
+def make_frame(clients: int) -> pd.DataFrame:
+    """Clientes de una agencia, con un 2% de emails repetidos como en un CSV real."""
+    return pd.DataFrame({
+        'name': [f'Client {i}' for i in range(clients)],
+        'email': [f'client{i - i % 50 if i % 50 == 49 else i}@example.com' for i in range(clients)],
+        'company': [f'Company {i}' for i in range(clients)],
+        'brand_color': ['#1f77b4'] * clients
+    })
+
+
+def open_storage(backend: str, tmp: str, name: str):
+    if backend == 'json':
+        return JSONClientStorage(os.path.join(tmp, f'{name}.json'))
+    return SQLiteClientStorage(os.path.join(tmp, f'{name}.db'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, nargs='+', default=[1_000, 5_000])
+    args = parser.parse_args()
+    
+    print(f"{'clients':>8s} {'backend':>8s} {'one by one s':>13s} {'bulk s':>8s} {'speedup':>8s}")
+    for clients in args.clients:
+        frame = make_frame(clients)
+        for backend in ('json', 'sqlite'):
+            with tempfile.TemporaryDirectory() as tmp:
+                # Camino anterior: dedupe a mano y un add_client (una escritura) por fila
+                manager = ClientManager(os.path.join(tmp, 'loop.json'), storage=open_storage(backend, tmp, 'loop'))
+                start = time.perf_counter()
+                seen = set()
+                for row in frame.to_dict('records'):
+                    if row['email'].lower() not in seen:
+                        seen.add(row['email'].lower())
+                        manager.add_client(row['name'], row['email'], row['company'], row['brand_color'])
+                loop_seconds = time.perf_counter() - start
+                
+                manager = ClientManager(os.path.join(tmp, 'bulk.json'), storage=open_storage(backend, tmp, 'bulk'))
+                start = time.perf_counter()
+                result = manager.import_clients(frame)
+                bulk_seconds = time.perf_counter() - start
+                assert len(result['imported']) == len(seen), (len(result['imported']), len(seen))
+                
+                print(f"{clients:8,d} {backend:>8s} {loop_seconds:13.2f} {bulk_seconds:8.3f} "
+                      f"{loop_seconds / bulk_seconds:7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: backends de ClientManager (JSON vs. SQLite) con muchos clientes
+y años de histórico. Mide lo que paga cada envío de reporte: buscar al
+cliente (por id y por email) y guardar el reporte en su histórico; y el
+arranque (`reopen`), ya migrado el histórico al formato de cada backend.
+
+Uso:
+    python benchmarks/bench_clients.py --clients 1000 5000 --reports 150 --ops 200
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.client_storage import JSONClientStorage, SQLiteClientStorage
+
+
+def make_clients(clients: int, reports: int) -> list:
+    """Clientes con `reports` reportes semanales cada uno (≈3 años con 150)."""
+    metrics = {'total_revenue': 12345.67, 'total_orders': 321, 'avg_order_value': 38.46, 'growth_rate': 4.2}
+    return [
+        {
+            'id': i,
+            'name': f'Client {i}',
+            'email': f'Client{i}@Example.com',
+            'company': f'Company {i}',
+            'brand_color': '#1f77b4',
+            'created_at': '2023-01-02T09:00:00',
+            'reports': [
+                {'date': f'2023-01-02T09:{w % 60:02d}:00', 'metrics': metrics, 'pdf_path': ''}
+                for w in range(reports)
+            ]
+        }
+        for i in range(1, clients + 1)
+    ]
+
+
+def run(storage, clients: int, ops: int) -> dict:
+    """Tiempo promedio (ms) de cada operación, sobre `ops` clientes repartidos."""
+    ids = [1 + (i * 7919) % clients for i in range(ops)]
+    timings = {}
+    for name, op in (
+        ('get', lambda i: storage.get(i)),
+        ('by_email', lambda i: storage.get_by_email(f'client{i}@example.com')),
+        ('add_report', lambda i: storage.add_report(i, {'date': '2026-01-05T09:00:00', 'metrics': {}, 'pdf_path': ''}))
+    ):
+        start = time.perf_counter()
+        for client_id in ids:
+            op(client_id)
+        timings[name] = (time.perf_counter() - start) / ops * 1000
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, nargs='+', default=[1_000, 5_000])
+    parser.add_argument('--reports', type=int, default=150, help='Reportes en el histórico de cada cliente')
+    parser.add_argument('--ops', type=int, default=200)
+    args = parser.parse_args()
+    
+    print(f"{'clients':>8s} {'backend':>8s} {'open ms':>9s} {'reopen ms':>10s} {'get ms':>8s} "
+          f"{'email ms':>9s} {'add ms':>9s}")
+    for clients in args.clients:
+        data = make_clients(clients, args.reports)
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, 'clients_data.json')
+            with open(json_path, 'w') as f:
+                json.dump(data, f)
+            # Copia para el backend JSON, que pasa el histórico a su log al abrirlo
+            shutil.copy(json_path, os.path.join(tmp, 'clients_json.json'))
+            
+            for backend in ('json', 'sqlite'):
+                # La primera apertura incluye la migración desde el JSON con el histórico adentro
+                open_times = []
+                for _ in range(2):
+                    start = time.perf_counter()
+                    if backend == 'json':
+                        storage = JSONClientStorage(os.path.join(tmp, 'clients_json.json'))
+                    else:
+                        storage = SQLiteClientStorage(os.path.join(tmp, 'clients_data.db'), migrate_from=json_path)
+                    open_times.append((time.perf_counter() - start) * 1000)
+                timings = run(storage, clients, args.ops)
+                storage.close()
+                print(f"{clients:8,d} {backend:>8s} {open_times[0]:9.1f} {open_times[1]:10.1f} {timings['get']:8.3f} "
+                      f"{timings['by_email']:9.3f} {timings['add_report']:9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: cubo de métricas (un groupby + rollups) vs. un groupby por vista.
+Mide cómo escala el costo con el número de filas, dimensiones y medidas.
+
+Uso:
+    python benchmarks/bench_cube.py --rows 100000 1000000 --dimensions 2 3 4 --measures 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cube import MetricCube
+
+
+# (nombre, cardinalidad) en el orden en que se agregan las dimensiones
+DIMENSIONS = [('store_name', 40), ('region', 6), ('category', 25), ('channel', 4), ('segment', 8)]
+
+
+def make_frame(rows: int, dimensions: int, measures: int, seed: int = 42) -> pd.DataFrame:
+    """Datos tipo retail (examples/retail_example.csv) con más dimensiones y medidas."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for name, cardinality in DIMENSIONS[:dimensions]:
+        labels = np.array([f'{name} {i}' for i in range(cardinality)], dtype=object)
+        data[name] = pd.Series(labels[rng.integers(0, cardinality, rows)], dtype='str')
+    for i in range(measures):
+        data[f'total_sales_{i}'] = rng.gamma(2.0, 500.0, rows).round(2)
+    return pd.DataFrame(data)
+
+
+def naive_views(df: pd.DataFrame, dimensions, measures) -> int:
+    """Un groupby sobre las filas por cada vista (dimensión o par) y medida."""
+    cube = MetricCube(pd.DataFrame(), dimensions, measures, {})
+    results = 0
+    for dims in cube.views():
+        for measure in measures:
+            df.groupby(list(dims), sort=True)[measure].agg(['sum', 'count', 'mean'])
+            results += 1
+    return results
+
+
+def cube_views(df: pd.DataFrame, dimensions, measures) -> int:
+    cube = MetricCube.build(df, dimensions, measures)
+    return len(cube.cells)
+
+
+def timeit(fn, repeat: int, *args):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--dimensions', type=int, nargs='+', default=[2, 3, 4, 5])
+    parser.add_argument('--measures', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    print(f"{'rows':>10s} {'dims':>4s} {'views':>5s} {'cells':>8s} {'naive ms':>10s} {'cube ms':>10s} {'speedup':>8s}")
+    for rows in args.rows:
+        for dimensions in args.dimensions:
+            df = make_frame(rows, dimensions, args.measures)
+            dims = [name for name, _ in DIMENSIONS[:dimensions]]
+            measures = [col for col in df.columns if col not in dims]
+            
+            naive, views = timeit(naive_views, args.repeat, df, dims, measures)
+            cube, cells = timeit(cube_views, args.repeat, df, dims, measures)
+            print(f"{rows:10,d} {dimensions:4d} {views // len(measures):5d} {cells:8,d} "
+                  f"{naive * 1000:10.1f} {cube * 1000:10.1f} {naive / cube:7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: envío de N reportes contra un SendGrid local (mock_sendgrid.py)
+con latencia, límite de tasa y errores 5xx. Compara el camino anterior (uno
+por vez, sin reintentos: los errores se pierden) con `send_bulk` (pool de
+hilos, token bucket y reintentos con backoff).
+
+Uso:
+    python benchmarks/bench_email.py --recipients 200 --latency 0.1 --server-rate 50 --error-rate 0.05
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_sendgrid import MockSendGrid
+from utils.client_manager import EmailSender
+from utils.email_dispatch import SendGridTransport
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--recipients', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.1, help='Latencia de cada respuesta del mock (s)')
+    parser.add_argument('--server-rate', type=float, default=50, help='Envíos/s que acepta el mock antes del 429')
+    parser.add_argument('--error-rate', type=float, default=0.05, help='Fracción de 503 del mock')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--rate', type=float, default=40, help='Envíos/s del token bucket')
+    parser.add_argument('--pdf-kb', type=int, default=60, help='Tamaño del PDF adjunto')
+    args = parser.parse_args()
+    
+    pdf_bytes = os.urandom(args.pdf_kb * 1024)
+    jobs = [
+        {'to_email': f'client{i}@example.com', 'client_name': f'Client {i}', 'pdf_bytes': pdf_bytes}
+        for i in range(args.recipients)
+    ]
+    
+    print(f"{'mode':>10s} {'seconds':>8s} {'sent':>6s} {'lost':>6s} {'attempts':>9s} {'429s':>6s} {'5xx':>6s}")
+    for mode, options in (
+        ('serial', {'max_workers': 1, 'rate_per_second': None, 'max_retries': 0}),
+        ('bulk', {'max_workers': args.workers, 'rate_per_second': args.rate, 'max_retries': 4})
+    ):
+        with MockSendGrid(latency=args.latency, rate=args.server_rate, error_rate=args.error_rate, seed=1) as server:
+            sender = EmailSender('test', transport=SendGridTransport('test', host=server.url))
+            start = time.perf_counter()
+            results = sender.send_bulk(jobs, **options)
+            seconds = time.perf_counter() - start
+            sent = sum(1 for result in results if result['ok'])
+            assert sent == len(server.delivered), (sent, len(server.delivered))
+            print(f"{mode:>10s} {seconds:8.2f} {sent:6d} {len(jobs) - sent:6d} "
+                  f"{sum(result['attempts'] for result in results):9d} {server.statuses[429]:6d} {server.statuses[503]:6d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: regeneración incremental del reporte con la caché de secciones.
+Compara un render completo contra el modo incremental en frío (sin nada
+cacheado), en caliente (sin cambios), tras una corrección menor (cambia
+un insight: solo se re-renderiza la página 1) y para otro cliente con los
+mismos datos (se re-renderizan las páginas con su nombre).
+
+Uso:
+    python benchmarks/bench_incremental.py --reports 20 --appendix
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_pdf import EXAMPLE, report_data
+from utils.data_analyzer import DataAnalyzer
+from utils.page_cache import PageCache
+from utils.pdf_generator import PDFReportGenerator
+
+
+def run(data: dict, reports: int, cache=None, edit: bool = False, clients: bool = False):
+    """Tiempo promedio por reporte; con `edit` cada reporte trae un insight distinto y con `clients` otro cliente."""
+    start = time.perf_counter()
+    for i in range(reports):
+        if edit:
+            data = {**data, 'insights': data['insights'][:-1] + [f'Corrección {i}']}
+        client_name = f'Client {i}' if clients else 'Client'
+        generator = PDFReportGenerator(client_name=client_name, data=data, output_path=None,
+                                       incremental=cache is not None, page_cache=cache)
+        generator.render()
+    return (time.perf_counter() - start) / reports, generator
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reports', type=int, default=20)
+    parser.add_argument('--appendix', action='store_true', help='Incluye el anexo con los datos completos')
+    args = parser.parse_args()
+    
+    data = report_data()
+    if args.appendix:
+        data['appendix'] = DataAnalyzer(pd.read_csv(EXAMPLE)).get_appendix_tables()
+    run(data, 1)
+    
+    print(f"{'mode':14s} {'ms/report':>10s} {'rendered':>40s}")
+    full_time, _ = run(data, args.reports)
+    print(f"{'full':14s} {full_time * 1000:10.1f} {'all':>40s}")
+    
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # En frío: cada reporte con una caché vacía nueva
+        cold = [run(data, 1, PageCache(cache_dir=None)) for _ in range(args.reports)]
+        cold_time = sum(seconds for seconds, _ in cold) / len(cold)
+        print(f"{'cold':14s} {cold_time * 1000:10.1f} {','.join(cold[-1][1].rendered_sections):>40s}")
+        
+        cache = PageCache(cache_dir=cache_dir)
+        run(data, 1, cache)
+        for mode, edit, clients in (('warm', False, False), ('insight edited', True, False),
+                                    ('other client', False, True)):
+            seconds, generator = run(data, args.reports, cache, edit=edit, clients=clients)
+            rendered = ','.join(generator.rendered_sections) or '-'
+            print(f"{mode:14s} {seconds * 1000:10.1f} {rendered:>40s}")
+
+
+if __name__ == '__main__':
+    main()
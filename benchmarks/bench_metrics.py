@@ -0,0 +1,113 @@
+"""
+Benchmark: consultas históricas de métricas recorriendo el JSON de cada
+reporte (camino anterior) vs. las series columnares de MetricsStore.
+
+- `series`: total_revenue de un cliente en sus últimos 52 reportes.
+- `latest`: growth del último reporte de la semana, para todos los clientes.
+- `append`: guardar un reporte más en la serie de un cliente (solo columnar:
+  es el costo que la serie agrega a cada reporte guardado).
+
+Uso:
+    python benchmarks/bench_metrics.py --clients 1000 2000 --reports 150
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.client_storage import SQLiteClientStorage
+from utils.metrics_store import MetricsStore
+
+
+# Reportes agregados al medir `append` (suficientes para pasar por una fusión del log)
+APPENDS = 200
+
+
+def make_reports(reports: int, seed: int) -> list:
+    """`reports` reportes semanales hasta hoy, con el formato de métricas del analizador."""
+    start = datetime.now() - timedelta(weeks=reports - 1)
+    return [
+        {
+            'date': (start + timedelta(weeks=w)).isoformat(),
+            'metrics': {
+                'total_revenue': {'value': 10_000.0 + (seed * 31 + w * 17) % 5_000, 'label': 'Revenue', 'format': 'currency'},
+                'total_orders': {'value': 300 + w % 40, 'label': 'Orders', 'format': 'number'},
+                'growth': {'value': ((seed + w) % 21 - 10) / 2, 'label': 'Growth', 'format': 'percent'}
+            },
+            'pdf_path': ''
+        }
+        for w in range(reports)
+    ]
+
+
+def timed(fn, repeat: int = 3) -> tuple:
+    """Mejor tiempo (ms) de `repeat` corridas y el último resultado."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, nargs='+', default=[1_000, 2_000])
+    parser.add_argument('--reports', type=int, default=150, help='Reportes en el histórico de cada cliente')
+    args = parser.parse_args()
+    
+    print(f"{'clients':>8s} {'query':>8s} {'dicts ms':>10s} {'columnar ms':>12s} {'speedup':>8s}")
+    for clients in args.clients:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = SQLiteClientStorage(os.path.join(tmp, 'clients_data.db'))
+            store = MetricsStore(os.path.join(tmp, 'clients_data_metrics'))
+            for i in range(clients):
+                client = storage.insert({'name': f'Client {i}', 'email': f'client{i}@example.com'})
+                reports = make_reports(args.reports, i)
+                for report in reports:
+                    storage.add_report(client['id'], report)
+                store.rebuild(client['id'], reports)
+            client_id = clients // 2
+            since = datetime.now() - timedelta(days=7)
+            
+            def series_dicts():
+                reports = storage.reports(client_id)[-52:]
+                return sum(r['metrics']['total_revenue']['value'] for r in reports)
+            
+            def latest_dicts():
+                growth = {}
+                for client in storage.all_clients():
+                    for report in client['reports']:
+                        if datetime.fromisoformat(report['date']) >= since:
+                            growth[client['id']] = report['metrics']['growth']['value']
+                return growth
+            
+            for name, dicts, columnar in (
+                ('series', series_dicts, lambda: store.series(client_id, 'total_revenue', last=52).sum()),
+                ('latest', latest_dicts, lambda: store.latest(['growth'], since=since)['growth'])
+            ):
+                dicts_ms, expected = timed(dicts)
+                columnar_ms, result = timed(columnar)
+                if name == 'series':
+                    assert abs(expected - result) < 1e-6, (expected, result)
+                else:
+                    assert expected == result.to_dict(), 'latest differs'
+                print(f"{clients:8,d} {name:>8s} {dicts_ms:10.2f} {columnar_ms:12.2f} {dicts_ms / columnar_ms:7.1f}x")
+            
+            # Agregar al log del cliente no depende del largo de su histórico (cada tanto se fusiona con la base)
+            extra = make_reports(APPENDS, clients)
+            start = time.perf_counter()
+            for report in extra:
+                store.append(client_id, report['date'], report['metrics'])
+            append_ms = (time.perf_counter() - start) * 1000 / APPENDS
+            print(f"{clients:8,d} {'append':>8s} {'':>10s} {append_ms:12.2f}")
+            storage.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: limpieza de strings numéricos encadenando .str.replace (camino
+anterior) vs. utils.numeric_cleaning.clean_numeric.
+Cada variante corre en un proceso nuevo para medir el pico de memoria (RSS).
+
+Uso:
+    python benchmarks/bench_numeric_cleaning.py --rows 3000000
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.numeric_cleaning import clean_numeric
+
+
+def make_column(rows: int, dtype: str, seed: int = 1) -> pd.Series:
+    """Columna de montos tipo "$1,234.56"."""
+    rng = np.random.default_rng(seed)
+    values = rng.gamma(2.0, 500.0, rows)
+    return pd.Series([f'${value:,.2f}' for value in values], dtype=dtype)
+
+
+def legacy_clean(series: pd.Series) -> pd.Series:
+    return pd.to_numeric(
+        series.astype(str).str.replace(',', '').str.replace('$', '').str.replace('%', ''),
+        errors='coerce'
+    )
+
+
+def new_clean(series: pd.Series) -> pd.Series:
+    return clean_numeric(series)[0]
+
+
+VARIANTS = {'legacy': legacy_clean, 'clean_numeric': new_clean}
+
+
+def _run(variant: str, rows: int, dtype: str, queue):
+    series = make_column(rows, dtype)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    result = VARIANTS[variant](series)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, (peak - baseline) / 1024, str(result.dtype)))
+
+
+def run_isolated(variant: str, rows: int, dtype: str):
+    queue = mp.Queue()
+    process = mp.Process(target=_run, args=(variant, rows, dtype, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=3_000_000)
+    args = parser.parse_args()
+    
+    print(f"rows={args.rows:,}")
+    for dtype in ('str', 'object'):
+        for variant in VARIANTS:
+            elapsed, extra_mb, result_dtype = run_isolated(variant, args.rows, dtype)
+            print(f"{dtype:6s} {variant:14s} {elapsed * 1000:9.1f} ms  +{extra_mb:8.1f} MB peak RSS  -> {result_dtype}")
+
+
+if __name__ == '__main__':
+    main()
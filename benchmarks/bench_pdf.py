@@ -0,0 +1,76 @@
+"""
+Benchmark: generación de PDF por reporte con plantilla compilada (estilos y
+páginas estáticas cacheados por proceso) vs. compilarla en cada reporte.
+
+Uso:
+    python benchmarks/bench_pdf.py --reports 50 --brands 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import report_template
+from utils.data_analyzer import DataAnalyzer
+from utils.pdf_generator import PDFReportGenerator
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples', 'ecommerce_example.csv')
+BRAND_COLORS = ['#1f77b4', '#c0392b', '#27ae60', '#8e44ad', '#f39c12', '#16a085', '#2c3e50', '#d35400']
+
+
+def report_data() -> dict:
+    analyzer = DataAnalyzer(pd.read_csv(EXAMPLE))
+    return {
+        'metrics': analyzer.get_key_metrics(),
+        'charts': analyzer.get_chart_data(),
+        'insights': analyzer.get_insights(),
+        'growth_horizons': analyzer.get_growth_horizons(),
+        'breakdowns': analyzer.get_breakdowns()
+    }
+
+
+def run(data: dict, reports: int, brands: int, warm: bool, output_dir: str) -> float:
+    """Tiempo promedio por reporte, rotando clientes entre `brands` colores."""
+    report_template._templates.clear()
+    start = time.perf_counter()
+    for i in range(reports):
+        if not warm:
+            # Sin caché: estilos y páginas estáticas se compilan en cada reporte
+            report_template._templates.clear()
+        PDFReportGenerator(
+            client_name=f'Client {i}',
+            data=data,
+            output_path=os.path.join(output_dir, f'report_{i}.pdf'),
+            brand_color=BRAND_COLORS[i % brands]
+        ).generate()
+    return (time.perf_counter() - start) / reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reports', type=int, default=50)
+    parser.add_argument('--brands', type=int, default=5, choices=range(1, len(BRAND_COLORS) + 1))
+    args = parser.parse_args()
+    
+    data = report_data()
+    with tempfile.TemporaryDirectory() as output_dir:
+        # Primera pasada descartada: importa fuentes e inicializa reportlab
+        run(data, 3, 1, True, output_dir)
+        cold = run(data, args.reports, args.brands, False, output_dir)
+        warm = run(data, args.reports, args.brands, True, output_dir)
+    
+    print(f"reports={args.reports} brands={args.brands}")
+    print(f"compiled per report : {cold * 1000:8.1f} ms/report")
+    print(f"cached template     : {warm * 1000:8.1f} ms/report")
+    print(f"saved per report    : {(cold - warm) * 1000:8.1f} ms")
+    print(f"speedup             : {cold / warm:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
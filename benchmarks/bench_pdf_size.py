@@ -0,0 +1,73 @@
+"""
+Benchmark: tamaño y tiempo de render del PDF normal vs. modo compacto
+(streams comprimidos y en binario, sin ASCII85), con los datos de
+examples/ y con series sintéticas largas.
+
+Uso:
+    python benchmarks/bench_pdf_size.py --reports 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import generate
+from utils.data_analyzer import DataAnalyzer
+from utils.pdf_generator import PDFReportGenerator
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples')
+
+
+def report_data(df: pd.DataFrame) -> dict:
+    analyzer = DataAnalyzer(df)
+    return {
+        'metrics': analyzer.get_key_metrics(),
+        'charts': analyzer.get_chart_data(),
+        'insights': analyzer.get_insights(),
+        'growth_horizons': analyzer.get_growth_horizons(),
+        'breakdowns': analyzer.get_breakdowns()
+    }
+
+
+def datasets():
+    for name in sorted(os.listdir(EXAMPLES)):
+        if name.endswith('.csv'):
+            yield name[:-len('.csv')], pd.read_csv(os.path.join(EXAMPLES, name))
+    # Un año de datos diarios: line chart con todos sus puntos
+    yield 'synthetic_ecommerce_100k', generate('ecommerce', 100_000)
+
+
+def run(data: dict, reports: int, compact: bool):
+    """Tiempo promedio por reporte y tamaño del PDF."""
+    start = time.perf_counter()
+    for i in range(reports):
+        generator = PDFReportGenerator(client_name=f'Client {i}', data=data, output_path=None, compact=compact)
+        generator.render()
+    return (time.perf_counter() - start) / reports, generator.output_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reports', type=int, default=20)
+    args = parser.parse_args()
+    
+    print(f"{'dataset':26s} {'normal KB':>10s} {'compact KB':>11s} {'saved':>7s} "
+          f"{'normal ms':>10s} {'compact ms':>11s}")
+    for name, df in datasets():
+        data = report_data(df)
+        # Un reporte previo: charts y plantilla ya cacheados en ambos modos
+        run(data, 1, compact=False)
+        normal_time, normal_size = run(data, args.reports, compact=False)
+        compact_time, compact_size = run(data, args.reports, compact=True)
+        print(f"{name:26s} {normal_size / 1024:10.1f} {compact_size / 1024:11.1f} "
+              f"{1 - compact_size / normal_size:7.1%} {normal_time * 1000:10.1f} {compact_time * 1000:11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Servidor local que imita `POST /v3/mail/send` de SendGrid, para probar y
+medir el envío masivo sin mandar emails de verdad. Simula latencia,
+límite de tasa (429 con Retry-After) y una fracción de errores 5xx.
+
+Uso como script (y la app apuntando a él):
+    python benchmarks/mock_sendgrid.py --port 8025 --latency 0.1 --rate 50 --error-rate 0.05
+    SENDGRID_API_KEY=test SENDGRID_API_HOST=http://127.0.0.1:8025 streamlit run app.py
+
+Uso desde código:
+    with MockSendGrid(latency=0.1, error_rate=0.05) as server:
+        sender = EmailSender('test', transport=SendGridTransport('test', host=server.url))
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class MockSendGrid:
+    """Mock de la API de envío de SendGrid en un hilo de fondo.
+
+    - `latency`: segundos que tarda cada respuesta.
+    - `rate`: envíos por segundo aceptados (ventana de 1 s); el resto recibe 429.
+    - `error_rate`: fracción de envíos que fallan con 503.
+    `statuses` cuenta los códigos devueltos y `delivered` los mensajes aceptados.
+    """
+    
+    def __init__(self, port: int = 0, latency: float = 0.05, rate: Optional[float] = None,
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.rate = rate
+        self.error_rate = error_rate
+        self.statuses: Counter = Counter()
+        self.delivered = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window = (0, 0)
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+    
+    def _respond(self, body: bytes):
+        """Código de respuesta y headers para un envío (llamado desde el hilo del request)."""
+        time.sleep(self.latency)
+        with self._lock:
+            second = int(time.monotonic())
+            window, count = self._window
+            count = count + 1 if window == second else 1
+            self._window = (second, count)
+            if self.rate is not None and count > self.rate:
+                status, headers = 429, {'Retry-After': '1'}
+            elif self._random.random() < self.error_rate:
+                status, headers = 503, {}
+            else:
+                status, headers = 202, {}
+                self.delivered.append(json.loads(body))
+            self.statuses[status] += 1
+        return status, headers
+    
+    def _handler(self):
+        mock = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if self.path.rstrip('/') != '/v3/mail/send':
+                    status, headers = 404, {}
+                elif not self.headers.get('Authorization', '').startswith('Bearer '):
+                    status, headers = 401, {}
+                else:
+                    status, headers = mock._respond(body)
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+    
+    def start(self) -> 'MockSendGrid':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def serve_forever(self):
+        """Atiende en el hilo actual hasta Ctrl+C."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+    
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self) -> 'MockSendGrid':
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8025)
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--rate', type=float, default=None, help='Envíos por segundo antes de responder 429')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fracción de envíos que responden 503')
+    args = parser.parse_args()
+    
+    server = MockSendGrid(args.port, args.latency, args.rate, args.error_rate)
+    print(f"Mock SendGrid on {server.url} (Ctrl+C to stop)")
+    server.serve_forever()
+    print(f"Statuses: {dict(server.statuses)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""
+Suite de benchmarks del pipeline de DataAnalyzer sobre datos sintéticos.
+Mide tiempo y pico de memoria (RSS) de cada etapa: detección de columnas,
+métricas clave, charts, insights y cubo. Cada caso corre en un proceso nuevo.
+
+Uso:
+    python benchmarks/run_suite.py --rows 10k 100k 1M --output results.json
+    python benchmarks/run_suite.py --schemas retail --rows 5M --cardinality store_name=2000
+    python benchmarks/run_suite.py --rows 1M --compare results.json --threshold 0.15
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import SCHEMAS, generate, parse_cardinalities, write_csv
+from utils.data_analyzer import DataAnalyzer
+from utils.result_cache import ResultCache
+
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def parse_rows(value: str) -> int:
+    """'10k', '2.5M', '50M' o un entero."""
+    multipliers = {'k': 1_000, 'm': 1_000_000}
+    suffix = value[-1].lower()
+    if suffix in multipliers:
+        return int(float(value[:-1]) * multipliers[suffix])
+    return int(value)
+
+
+def current_rss() -> int:
+    """RSS actual del proceso en bytes (Linux); fuera de Linux, el pico histórico."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class PeakMemory:
+    """Muestrea el RSS en un hilo aparte mientras dura el bloque `with`."""
+    
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.start = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss())
+            time.sleep(self.interval)
+    
+    def __enter__(self) -> 'PeakMemory':
+        self.start = self.peak = current_rss()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+    
+    @property
+    def delta_mb(self) -> float:
+        return (self.peak - self.start) / 1024 ** 2
+
+
+def run_case(schema: str, rows: int, cardinalities: Dict[str, int], dirty_numbers: bool,
+             source: str, seed: int) -> List[Dict[str, Any]]:
+    """Ejecuta todas las etapas para un esquema y tamaño. Devuelve una fila por etapa."""
+    results = []
+    
+    def measure(stage: str, fn):
+        with PeakMemory() as memory:
+            start = time.perf_counter()
+            value = fn()
+            elapsed = time.perf_counter() - start
+        results.append({
+            'schema': schema,
+            'rows': rows,
+            'stage': stage,
+            'seconds': round(elapsed, 6),
+            'peak_mb': round(memory.delta_mb, 2)
+        })
+        return value
+    
+    if source == 'csv':
+        # Incluye el parseo del CSV, como en una subida real
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        try:
+            write_csv(schema, rows, path, cardinalities=cardinalities, dirty_numbers=dirty_numbers, seed=seed)
+            df = measure('read_csv', lambda: pd.read_csv(path))
+        finally:
+            os.remove(path)
+    else:
+        df = generate(schema, rows, cardinalities=cardinalities, dirty_numbers=dirty_numbers, seed=seed)
+    
+    # Caché propia: ninguna etapa se beneficia de resultados de otro caso
+    analyzer = measure('detect', lambda: DataAnalyzer(df, cache=ResultCache()))
+    measure('key_metrics', analyzer.get_key_metrics)
+    measure('chart_data', analyzer.get_chart_data)
+    measure('insights', analyzer.get_insights)
+    measure('cube', analyzer.get_cube)
+    return results
+
+
+def _run(queue, *args):
+    try:
+        queue.put(('ok', run_case(*args)))
+    except Exception as e:
+        queue.put(('error', f"{type(e).__name__}: {e}"))
+
+
+def run_isolated(*args) -> List[Dict[str, Any]]:
+    """Corre un caso en un proceso nuevo para que los picos de memoria no se mezclen."""
+    queue = mp.Queue()
+    process = mp.Process(target=_run, args=(queue, *args))
+    process.start()
+    status, payload = queue.get()
+    process.join()
+    if status != 'ok':
+        raise RuntimeError(payload)
+    return payload
+
+
+def environment() -> Dict[str, Any]:
+    """Versiones y commit, para comparar corridas entre releases."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float,
+            min_seconds: float = 0.005) -> bool:
+    """Imprime la variación contra una corrida anterior. True si no hay regresiones.
+
+    Las etapas que tardan menos de `min_seconds` en ambas corridas no cuentan
+    como regresión: a esa escala domina el ruido.
+    """
+    previous = {(r['schema'], r['rows'], r['stage']): r for r in baseline['results']}
+    ok = True
+    
+    print(f"\nvs. {baseline['environment'].get('commit') or 'baseline'} ({baseline['environment']['timestamp']})")
+    for result in results:
+        before = previous.get((result['schema'], result['rows'], result['stage']))
+        if before is None or before['seconds'] <= 0:
+            continue
+        
+        change = result['seconds'] / before['seconds'] - 1
+        regression = change > threshold and max(result['seconds'], before['seconds']) >= min_seconds
+        ok &= not regression
+        flag = '  REGRESSION' if regression else ''
+        print(f"{result['schema']:10s} {result['rows']:>12,d} {result['stage']:12s} "
+              f"{before['seconds'] * 1000:10.1f} -> {result['seconds'] * 1000:10.1f} ms ({change:+.1%}){flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--schemas', nargs='+', choices=sorted(SCHEMAS), default=sorted(SCHEMAS))
+    parser.add_argument('--rows', nargs='+', type=parse_rows, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--cardinality', nargs='*', default=[], metavar='COLUMN=N')
+    parser.add_argument('--dirty-numbers', action='store_true', help='Montos como texto ("$1,234.56")')
+    parser.add_argument('--source', choices=['frame', 'csv'], default='frame',
+                        help='csv: escribe el archivo y mide también read_csv')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Archivo JSON con los resultados')
+    parser.add_argument('--compare', help='JSON de una corrida anterior')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Regresión tolerada (0.2 = +20%%)')
+    parser.add_argument('--min-ms', type=float, default=5.0, help='Ignora etapas más rápidas que esto')
+    args = parser.parse_args()
+    
+    cardinalities = parse_cardinalities(args.cardinality)
+    results = []
+    
+    print(f"{'schema':10s} {'rows':>12s} {'stage':12s} {'time ms':>10s} {'peak MB':>10s}")
+    for schema in args.schemas:
+        for rows in args.rows:
+            case = run_isolated(schema, rows, cardinalities, args.dirty_numbers, args.source, args.seed)
+            for result in case:
+                print(f"{schema:10s} {rows:>12,d} {result['stage']:12s} "
+                      f"{result['seconds'] * 1000:10.1f} {result['peak_mb']:10.1f}")
+            results.extend(case)
+    
+    report = {
+        'environment': environment(),
+        'config': {
+            'cardinalities': cardinalities,
+            'dirty_numbers': args.dirty_numbers,
+            'source': args.source,
+            'seed': args.seed
+        },
+        'results': results
+    }
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        if baseline.get('config') != report['config']:
+            print(f"Warning: baseline config differs: {baseline.get('config')}")
+        if not compare(results, baseline, args.threshold, args.min_ms / 1000):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
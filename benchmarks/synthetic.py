@@ -0,0 +1,131 @@
+"""
+Generador de datos sintéticos con los esquemas de examples/ (ecommerce, retail, saas),
+escalables de miles a decenas de millones de filas y con cardinalidades configurables.
+
+Uso:
+    python benchmarks/synthetic.py ecommerce --rows 5000000 --output /tmp/ecommerce_5m.csv
+    python benchmarks/synthetic.py retail --rows 1000000 --cardinality store_name=500 --output retail.csv
+"""
+
+import argparse
+import os
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Columnas de cada esquema: (nombre, tipo, parámetros). Los tipos:
+#   date     -> fechas como texto, `periods` valores ('D' diario, 'MS' mensual)
+#   currency -> montos gamma(2, scale) con 2 decimales
+#   count    -> enteros uniformes en [low, high)
+#   rate     -> proporciones uniformes en [low, high)
+#   category -> etiquetas "<prefijo> <i>" con `cardinality` valores distintos
+SCHEMAS = {
+    'ecommerce': [
+        ('date', 'date', {'periods': 365, 'freq': 'D', 'start': '2025-01-01'}),
+        ('revenue', 'currency', {'scale': 500.0}),
+        ('orders', 'count', {'low': 1, 'high': 100}),
+        ('product', 'category', {'cardinality': 200, 'prefix': 'Product'}),
+        ('category', 'category', {'cardinality': 20, 'prefix': 'Category'}),
+        ('customer', 'category', {'cardinality': 10000, 'prefix': 'Customer'}),
+    ],
+    'retail': [
+        ('date', 'date', {'periods': 365, 'freq': 'D', 'start': '2025-01-01'}),
+        ('store_name', 'category', {'cardinality': 50, 'prefix': 'Store'}),
+        ('total_sales', 'currency', {'scale': 6000.0}),
+        ('transactions', 'count', {'low': 50, 'high': 300}),
+        ('avg_ticket', 'currency', {'scale': 40.0}),
+        ('region', 'category', {'cardinality': 6, 'prefix': 'Region'}),
+    ],
+    'saas': [
+        ('month', 'date', {'periods': 36, 'freq': 'MS', 'start': '2023-01-01', 'format': '%Y-%m'}),
+        ('mrr', 'currency', {'scale': 4000.0}),
+        ('churn_rate', 'rate', {'low': 0.0, 'high': 0.1}),
+        ('new_customers', 'count', {'low': 0, 'high': 50}),
+        ('plan_type', 'category', {'cardinality': 4, 'prefix': 'Plan'}),
+        ('feature_usage', 'count', {'low': 0, 'high': 1000}),
+    ],
+}
+
+
+def _labels(prefix: str, cardinality: int) -> np.ndarray:
+    return np.array([f'{prefix} {i}' for i in range(cardinality)], dtype=object)
+
+
+def generate(schema: str, rows: int, cardinalities: Optional[Dict[str, int]] = None,
+             seed: int = 42, dirty_numbers: bool = False) -> pd.DataFrame:
+    """DataFrame sintético con el esquema pedido, tal como lo dejaría `pd.read_csv`.
+
+    `cardinalities` reemplaza la cardinalidad de columnas categóricas o fechas.
+    Con `dirty_numbers` los montos salen como texto ("$1,234.56") para ejercitar
+    la limpieza numérica de la detección.
+    """
+    cardinalities = cardinalities or {}
+    rng = np.random.default_rng(seed)
+    data = {}
+    
+    for name, kind, params in SCHEMAS[schema]:
+        if kind == 'date':
+            periods = cardinalities.get(name, params['periods'])
+            dates = pd.date_range(params['start'], periods=periods, freq=params['freq'])
+            labels = np.asarray(dates.strftime(params.get('format', '%Y-%m-%d')), dtype=object)
+            data[name] = pd.Series(labels[rng.integers(0, periods, rows)], dtype='str')
+        elif kind == 'currency':
+            values = rng.gamma(2.0, params['scale'], rows).round(2)
+            if dirty_numbers:
+                data[name] = pd.Series(values).map('${:,.2f}'.format).astype('str')
+            else:
+                data[name] = values
+        elif kind == 'count':
+            data[name] = rng.integers(params['low'], params['high'], rows)
+        elif kind == 'rate':
+            data[name] = rng.uniform(params['low'], params['high'], rows).round(4)
+        elif kind == 'category':
+            cardinality = cardinalities.get(name, params['cardinality'])
+            labels = _labels(params['prefix'], cardinality)
+            data[name] = pd.Series(labels[rng.integers(0, cardinality, rows)], dtype='str')
+    
+    return pd.DataFrame(data)
+
+
+def generate_chunks(schema: str, rows: int, chunk_rows: int = 1_000_000, seed: int = 42,
+                    **kwargs) -> Iterator[pd.DataFrame]:
+    """Genera `rows` filas en bloques, para archivos que no entran en memoria."""
+    for i, start in enumerate(range(0, rows, chunk_rows)):
+        yield generate(schema, min(chunk_rows, rows - start), seed=seed + i, **kwargs)
+
+
+def write_csv(schema: str, rows: int, path: str, chunk_rows: int = 1_000_000, **kwargs) -> str:
+    """Escribe el dataset sintético a CSV por bloques."""
+    for i, chunk in enumerate(generate_chunks(schema, rows, chunk_rows, **kwargs)):
+        chunk.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+    return path
+
+
+def parse_cardinalities(values) -> Dict[str, int]:
+    """["customer=100000", ...] -> {"customer": 100000}."""
+    cardinalities = {}
+    for value in values or []:
+        name, _, count = value.partition('=')
+        cardinalities[name] = int(count)
+    return cardinalities
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('schema', choices=sorted(SCHEMAS))
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--cardinality', nargs='*', default=[], metavar='COLUMN=N')
+    parser.add_argument('--dirty-numbers', action='store_true')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', required=True)
+    args = parser.parse_args()
+    
+    write_csv(args.schema, args.rows, args.output, seed=args.seed,
+              cardinalities=parse_cardinalities(args.cardinality), dirty_numbers=args.dirty_numbers)
+    print(f"{args.output}: {args.rows:,} rows, {os.path.getsize(args.output) / 1024 ** 2:,.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""
+get_batch_generator: sesiones que lo piden a la vez comparten un solo pool.
+"""
+
+import threading
+import time
+
+from utils import batch_reports
+
+
+def test_concurrent_callers_get_one_pool(monkeypatch):
+    created = []
+    
+    class SlowPool:
+        def __init__(self, max_workers=None):
+            # Ensancha la ventana entre el chequeo y la asignación
+            time.sleep(0.05)
+            created.append(self)
+    
+    monkeypatch.setattr(batch_reports, 'BatchReportGenerator', SlowPool)
+    monkeypatch.setattr(batch_reports, '_shared_batch', None)
+    barrier = threading.Barrier(8)
+    results = []
+    
+    def call():
+        barrier.wait()
+        results.append(batch_reports.get_batch_generator())
+    
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(created) == 1
+    assert all(result is created[0] for result in results)
@@ -0,0 +1,51 @@
+"""
+Breakdowns del PDF: pocas vistas del cubo, sin columnas tipo ID ni de
+muchas categorías; el cubo completo sigue disponible para la UI.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.data_analyzer import DataAnalyzer
+
+
+def sales(rows: int = 2000) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=rows, freq='h').strftime('%Y-%m-%d'),
+        'category': rng.choice([f'Category {i}' for i in range(5)], rows),
+        'region': rng.choice(['North', 'South', 'East', 'West'], rows),
+        'channel': rng.choice(['Web', 'Store', 'Phone'], rows),
+        'segment': rng.choice(['Retail', 'Wholesale'], rows),
+        'store': rng.choice([f'Store {i}' for i in range(120)], rows),
+        'order_id': [f'ORD-{i:06d}' for i in range(rows)],
+        'revenue': rng.uniform(10, 500, rows).round(2)
+    })
+
+
+def test_breakdowns_are_curated():
+    analyzer = DataAnalyzer(sales())
+    breakdowns = analyzer.get_breakdowns()
+    views = [tuple(breakdown['dimensions']) for breakdown in breakdowns]
+    used = {dim for view in views for dim in view}
+    
+    assert len(breakdowns) == DataAnalyzer.MAX_REPORT_BREAKDOWNS
+    # Primero las vistas simples, de menos categorías
+    assert views == [('segment',), ('channel',), ('region',)]
+    assert not used & {'order_id', 'store'}
+    assert ('category',) not in views
+
+
+def test_full_cube_keeps_every_view():
+    analyzer = DataAnalyzer(sales())
+    cube = analyzer.get_cube()
+    
+    assert 'store' in cube.dimensions
+    assert len(cube.views()) > len(analyzer.get_breakdowns(max_views=100))
+
+
+def test_id_like_names_are_skipped():
+    df = sales().assign(customer_id=lambda frame: frame['region'].str[:1])
+    views = [tuple(breakdown['dimensions']) for breakdown in DataAnalyzer(df).get_breakdowns(max_views=100)]
+    
+    assert all('customer_id' not in view for view in views)
@@ -0,0 +1,59 @@
+"""
+ChartCache en disco: JSON con formas primitivas (sin pickle), que al
+leerse dibuja exactamente lo mismo que el chart original.
+"""
+
+import io
+import json
+
+import pytest
+from reportlab.graphics import renderPDF
+from reportlab.pdfgen.canvas import Canvas
+
+from utils.chart_cache import ChartCache, decode_drawing, encode_drawing
+from utils.pdf_charts import BUILDERS, chart_inputs
+
+
+STYLE = {'brand_color': '#c0392b', 'width': 300, 'height': 150}
+CHARTS = {
+    'line': {'x_data': [f'2024-01-{day:02d}' for day in range(1, 31)], 'y_data': [float(day % 7) for day in range(30)]},
+    'pie': {'labels': ['A', 'B', 'C'], 'values': [5.0, 3.0, 2.0]}
+}
+
+
+def pdf_of(drawing) -> bytes:
+    buffer = io.BytesIO()
+    canvas = Canvas(buffer, invariant=1)
+    renderPDF.draw(drawing, canvas, 0, 0)
+    canvas.save()
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('kind', sorted(CHARTS))
+def test_json_round_trip_draws_the_same(kind):
+    drawing = BUILDERS[kind](chart_inputs(kind, CHARTS[kind]), STYLE)
+    restored = decode_drawing(json.loads(json.dumps(encode_drawing(drawing))))
+    
+    assert pdf_of(restored) == pdf_of(drawing)
+
+
+def test_disk_entry_is_reused_by_another_cache(tmp_path):
+    data = chart_inputs('pie', CHARTS['pie'])
+    first = ChartCache(str(tmp_path))
+    drawing = first.get_or_build('pie', data, STYLE, BUILDERS['pie'])
+    
+    second = ChartCache(str(tmp_path))
+    loaded = second.get_or_build('pie', data, STYLE, BUILDERS['pie'])
+    
+    assert second.stats()['builds'] == 0 and second.disk_hits == 1
+    assert pdf_of(loaded) == pdf_of(drawing)
+    assert [path.suffix for path in tmp_path.iterdir()] == ['.json']
+
+
+def test_unknown_shapes_are_rejected(tmp_path):
+    key = ChartCache.key_for('pie', {}, STYLE)
+    (tmp_path / f'{key}.json').write_text(json.dumps({'shape': 'os.system', 'attrs': {}}))
+    
+    assert ChartCache(str(tmp_path)).get(key) is None
+    with pytest.raises(ValueError):
+        decode_drawing({'shape': 'Widget', 'attrs': {}})
@@ -0,0 +1,46 @@
+"""
+Migración JSON -> SQLite con varios procesos arrancando a la vez.
+"""
+
+import json
+import multiprocessing
+
+from utils.client_storage import SQLiteClientStorage
+
+
+def migrate(db_path: str, json_path: str, barrier, results):
+    barrier.wait()
+    try:
+        storage = SQLiteClientStorage(db_path, migrate_from=json_path)
+        results.put(('ok', len(storage.all_clients())))
+        storage.close()
+    except Exception as e:
+        results.put(('error', repr(e)))
+
+
+def test_concurrent_migration_imports_once(tmp_path):
+    json_path = tmp_path / 'clients_data.json'
+    clients = [
+        {'id': i, 'name': f'Client {i}', 'email': f'client{i}@example.com', 'reports': [{'date': '2026-01-01'}]}
+        for i in range(1, 201)
+    ]
+    json_path.write_text(json.dumps(clients))
+    db_path = str(tmp_path / 'clients_data.db')
+    
+    processes = 4
+    barrier = multiprocessing.Barrier(processes)
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=migrate, args=(db_path, str(json_path), barrier, results))
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+    outcomes = [results.get(timeout=5) for _ in workers]
+    
+    assert outcomes == [('ok', 200)] * processes
+    storage = SQLiteClientStorage(db_path)
+    assert [client['id'] for client in storage.all_clients()] == list(range(1, 201))
+    assert storage.totals()['reports'] == 200
@@ -0,0 +1,82 @@
+"""
+Modo compacto del PDF: opciones de compresión de reportlab, sin reescribir
+el archivo (el texto del reporte sale tal cual).
+"""
+
+import base64
+import re
+import threading
+import zlib
+
+from reportlab import rl_config
+
+from utils.pdf_generator import PDFReportGenerator, _stream_encoding
+
+
+DATA = {
+    'metrics': {'total_revenue': {'label': 'Total Revenue', 'value': 12500.0, 'format': 'currency'}},
+    # Texto con forma de referencia PDF: no debe cambiar al compactar
+    'insights': ['Client 3 0 R Report']
+}
+
+
+def render(compact: bool) -> bytes:
+    return PDFReportGenerator('Acme', DATA, output_path=None, compact=compact).render()
+
+
+def page_text(pdf_bytes: bytes) -> bytes:
+    """Contenido descomprimido de todos los streams Flate (con o sin ASCII85 por fuera)."""
+    text = []
+    for dictionary, stream in re.findall(rb'<<(.*?)>>\s*stream\r?\n(.*?)endstream', pdf_bytes, re.S):
+        if b'/ASCII85Decode' in dictionary:
+            stream = base64.a85decode(stream.strip(), adobe=True)
+        if b'/FlateDecode' in dictionary:
+            text.append(zlib.decompress(stream))
+    return b'\n'.join(text)
+
+
+def test_compact_is_smaller_and_binary():
+    normal, compact = render(False), render(True)
+    
+    assert b'/ASCII85Decode' in normal
+    assert b'/ASCII85Decode' not in compact
+    assert len(compact) < len(normal)
+
+
+def test_compact_keeps_text():
+    compact = page_text(render(True))
+    
+    assert b' Client 3 0 R Report) Tj' in compact
+    assert page_text(render(False)).count(b'Tj') == compact.count(b'Tj')
+
+
+def test_compact_restores_rl_config():
+    previous = rl_config.useA85
+    render(True)
+    
+    assert rl_config.useA85 == previous
+
+
+def test_builds_in_the_same_mode_run_concurrently():
+    events = []
+    
+    def build(compact: bool):
+        with _stream_encoding(compact):
+            events.append(('compact' if compact else 'normal', rl_config.useA85))
+    
+    previous = rl_config.useA85
+    with _stream_encoding(False):
+        # Otro build normal entra sin esperar a que termine este
+        other = threading.Thread(target=build, args=(False,))
+        other.start()
+        other.join(timeout=5)
+        assert not other.is_alive()
+        # Uno compacto espera: no puede cambiar useA85 bajo un build normal
+        compact = threading.Thread(target=build, args=(True,))
+        compact.start()
+        compact.join(timeout=0.2)
+        assert compact.is_alive()
+    compact.join(timeout=5)
+    
+    assert events == [('normal', previous), ('compact', 0)]
+    assert rl_config.useA85 == previous
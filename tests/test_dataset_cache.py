@@ -0,0 +1,44 @@
+"""
+DatasetCache: el esquema se guarda con una versión y las entradas de otra
+versión (o a medio escribir) no se cargan.
+"""
+
+import json
+
+import pandas as pd
+
+from utils.dataset_cache import DATASET_CACHE_VERSION, DatasetCache
+
+
+DF = pd.DataFrame({'date': pd.date_range('2024-01-01', periods=3), 'revenue': [1.5, 2.0, 3.25],
+                   'category': ['A', 'B', 'A']})
+DETECTED = {'dates': ['date'], 'numeric': ['revenue'], 'categories': ['category']}
+
+
+def test_round_trip(tmp_path):
+    cache = DatasetCache(str(tmp_path))
+    assert cache.store('k', DF, DETECTED, name='sales.csv')
+    
+    df, detected = cache.load('k')
+    
+    pd.testing.assert_frame_equal(df, DF, check_dtype=False)
+    assert detected == DETECTED
+    assert json.loads((tmp_path / 'k.json').read_text())['version'] == DATASET_CACHE_VERSION
+
+
+def test_other_version_is_a_miss_and_is_removed(tmp_path):
+    cache = DatasetCache(str(tmp_path))
+    cache.store('k', DF, DETECTED)
+    schema = tmp_path / 'k.json'
+    schema.write_text(json.dumps({**json.loads(schema.read_text()), 'version': DATASET_CACHE_VERSION - 1}))
+    
+    assert cache.load('k') is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_missing_schema_is_a_miss(tmp_path):
+    cache = DatasetCache(str(tmp_path))
+    cache.store('k', DF, DETECTED)
+    (tmp_path / 'k.json').unlink()
+    
+    assert cache.load('k') is None
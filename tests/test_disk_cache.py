@@ -0,0 +1,48 @@
+"""
+DiskLRU: escrituras atómicas, tope de bytes con contador en memoria y
+expulsión del archivo menos usado (con sus compañeros).
+"""
+
+import os
+
+from utils import disk_cache
+from utils.disk_cache import DiskLRU
+
+
+def test_writes_under_budget_do_not_list_the_directory(tmp_path, monkeypatch):
+    cache = DiskLRU(str(tmp_path), '.bin', max_bytes=10_000)
+    calls = []
+    listdir = os.listdir
+    monkeypatch.setattr(disk_cache.os, 'listdir', lambda path: calls.append(path) or listdir(path))
+    
+    for i in range(20):
+        assert cache.write(f'k{i}', b'x' * 100)
+    
+    assert calls == []
+    assert cache.size_bytes() == 2_000
+
+
+def test_evicts_least_recently_used_with_companions(tmp_path):
+    cache = DiskLRU(str(tmp_path), '.bin', max_bytes=250, companions=('.json',))
+    for i, key in enumerate(('a', 'b')):
+        cache.write(key, b'x' * 100)
+        cache.write(key, '{}', suffix='.json')
+        os.utime(cache.path(key), (1_000 + i, 1_000 + i))
+    # Leer 'a' la vuelve la más reciente
+    assert cache.read('a') == b'x' * 100
+    
+    cache.write('c', b'x' * 100)
+    
+    assert sorted(os.listdir(tmp_path)) == ['a.bin', 'a.json', 'c.bin']
+
+
+def test_counts_what_other_processes_wrote(tmp_path):
+    other = DiskLRU(str(tmp_path), '.bin', max_bytes=250)
+    other.write('old', b'x' * 200)
+    os.utime(other.path('old'), (1_000, 1_000))
+    cache = DiskLRU(str(tmp_path), '.bin', max_bytes=250)
+    
+    cache.write('new', b'x' * 100)
+    
+    assert os.listdir(tmp_path) == ['new.bin']
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
@@ -0,0 +1,93 @@
+"""
+Modo incremental del PDF: cada sección se cachea por sus datos; al
+regenerar solo se renderizan las que cambiaron y el resto se reutiliza.
+"""
+
+import io
+
+import pytest
+from pypdf import PdfReader
+from reportlab import rl_config
+
+from utils.page_cache import PageCache
+from utils.pdf_generator import PDFReportGenerator
+
+
+DATA = {
+    'metrics': {
+        'total_revenue': {'label': 'Total Revenue', 'value': 12500.0, 'format': 'currency'},
+        'orders': {'label': 'Orders', 'value': 320, 'format': 'number'}
+    },
+    'charts': {
+        'line_chart': {
+            'title': 'Revenue Over Time',
+            'x_data': [f'2024-01-{day:02d}' for day in range(1, 15)],
+            'y_data': [float(100 + day * 10) for day in range(14)]
+        }
+    },
+    'insights': ['Revenue grew 12% week over week', 'Top category: Electronics']
+}
+
+
+@pytest.fixture
+def invariant():
+    """PDFs deterministas (sin fecha de creación ni IDs aleatorios) para comparar bytes."""
+    previous = rl_config.invariant
+    rl_config.invariant = 1
+    yield
+    rl_config.invariant = previous
+
+
+def render(data, cache=None):
+    generator = PDFReportGenerator('Acme', data, output_path=None, incremental=cache is not None, page_cache=cache)
+    return generator, generator.render()
+
+
+def test_unchanged_report_is_reused(invariant):
+    cache = PageCache(cache_dir=None)
+    first, first_bytes = render(DATA, cache)
+    second, second_bytes = render(DATA, cache)
+    
+    assert first.rendered_sections == ['page_1', 'page_2', 'page_3', 'page_4']
+    assert second.rendered_sections == []
+    assert second.reused_sections == first.rendered_sections
+    assert second_bytes == first_bytes
+
+
+def page_texts(pdf_bytes):
+    return [page.extract_text() for page in PdfReader(io.BytesIO(pdf_bytes)).pages]
+
+
+def test_changed_insight_renders_only_page_1(invariant):
+    cache = PageCache(cache_dir=None)
+    render(DATA, cache)
+    edited = {**DATA, 'insights': DATA['insights'][:-1] + ['Top category: Books']}
+    generator, incremental_bytes = render(edited, cache)
+    _, full_bytes = render(edited)
+    
+    assert generator.rendered_sections == ['page_1']
+    assert generator.reused_sections == ['page_2', 'page_3', 'page_4']
+    # Mismo contenido que un render completo, página por página
+    assert page_texts(incremental_bytes) == page_texts(full_bytes)
+    assert 'Top category: Books' in page_texts(incremental_bytes)[0]
+
+
+def test_other_client_reuses_pages_without_client_data(invariant):
+    cache = PageCache(cache_dir=None)
+    render(DATA, cache)
+    generator = PDFReportGenerator('Globex', DATA, output_path=None, page_cache=cache)
+    pages = page_texts(generator.render())
+    
+    assert generator.rendered_sections == ['page_1', 'page_4']
+    assert generator.reused_sections == ['page_2', 'page_3']
+    assert 'Globex' in pages[0] and 'Acme' not in ''.join(pages)
+
+
+def test_disk_cache_survives_new_process_cache(invariant, tmp_path):
+    _, stored = render(DATA, PageCache(cache_dir=str(tmp_path)))
+    cache = PageCache(cache_dir=str(tmp_path))
+    generator, loaded = render(DATA, cache)
+    
+    assert loaded == stored
+    assert cache.disk_hits == 4
+    assert generator.rendered_sections == []
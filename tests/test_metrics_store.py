@@ -0,0 +1,77 @@
+"""
+MetricsStore: guardar un reporte agrega un bloque al log del cliente sin
+reescribir su serie; el log se fusiona con la base al pasar el tope.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+from utils import metrics_store
+from utils.file_lock import file_stamp
+from utils.metrics_store import MetricsStore
+
+
+def make_reports(count: int, start: datetime = datetime(2026, 1, 5)) -> list:
+    return [
+        {'date': (start + timedelta(weeks=w)).isoformat(),
+         'metrics': {'total_revenue': {'value': 100.0 + w}, 'growth': {'value': w / 10}}}
+        for w in range(count)
+    ]
+
+
+def test_append_does_not_rewrite_the_base_file(tmp_path):
+    store = MetricsStore(str(tmp_path))
+    reports = make_reports(12)
+    store.rebuild(1, reports[:10])
+    base = file_stamp(store._path(1))
+    
+    for report in reports[10:]:
+        store.append(1, report['date'], report['metrics'])
+    
+    assert file_stamp(store._path(1)) == base
+    # Otro proceso ve la serie completa: base + log
+    series = MetricsStore(str(tmp_path)).series(1, 'total_revenue')
+    assert series.tolist() == [100.0 + w for w in range(12)]
+
+
+def test_log_is_merged_into_a_new_generation(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics_store, 'DELTA_MAX_BYTES', 2_000)
+    store = MetricsStore(str(tmp_path))
+    reports = make_reports(30)
+    
+    for report in reversed(reports):
+        store.append(3, report['date'], report['metrics'])
+    
+    deltas = [name for name in os.listdir(tmp_path) if name.endswith('.delta')]
+    assert os.path.exists(store._path(3)) and len(deltas) == 1
+    assert store._read_base(3)[1] >= 2
+    frame = MetricsStore(str(tmp_path)).frame(3)
+    assert frame.index.is_monotonic_increasing
+    assert frame['total_revenue'].tolist() == [100.0 + w for w in range(30)]
+
+
+def test_cut_write_is_ignored_and_dropped_on_next_append(tmp_path):
+    store = MetricsStore(str(tmp_path))
+    reports = make_reports(3)
+    for report in reports[:2]:
+        store.append(5, report['date'], report['metrics'])
+    with open(store._delta_path(5, 0), 'ab') as f:
+        f.write(b'\x40\x00\x00\x00partial')
+    
+    assert len(MetricsStore(str(tmp_path)).series(5, 'growth')) == 2
+    
+    store.append(5, reports[2]['date'], reports[2]['metrics'])
+    assert MetricsStore(str(tmp_path)).series(5, 'growth').tolist() == [0.0, 0.1, 0.2]
+
+
+def test_delete_removes_base_and_log(tmp_path):
+    store = MetricsStore(str(tmp_path))
+    reports = make_reports(4)
+    store.rebuild(7, reports[:3])
+    store.append(7, reports[3]['date'], reports[3]['metrics'])
+    assert store.client_ids() == [7]
+    
+    store.delete(7)
+    
+    assert store.client_ids() == []
+    assert store.series(7, 'total_revenue').empty
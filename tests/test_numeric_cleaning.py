@@ -0,0 +1,88 @@
+"""
+clean_numeric: pasada sobre los bytes de Arrow para texto ASCII, regex para
+el resto, separadores de cada locale, negativos y conteo de valores perdidos.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from utils.numeric_cleaning import _strip_ascii, clean_numeric
+
+
+def test_ascii_bytes_are_stripped_without_regex(monkeypatch):
+    def no_regex(*args, **kwargs):
+        raise AssertionError("regex fallback used for ASCII input")
+    
+    monkeypatch.setattr(pd.Series, 'str', property(no_regex))
+    series = pd.Series(['$1,234.50', '12%', ' 7 ', None, '-$0.25'])
+    
+    numbers, report = clean_numeric(series, decimal='.')
+    
+    assert numbers.tolist()[:3] == [1234.5, 12.0, 7.0]
+    assert np.isnan(numbers.iloc[3]) and numbers.iloc[4] == -0.25
+    assert report['coerced'] == 0
+
+
+def test_strip_respects_array_offset_and_nulls():
+    arr = pa.array(['x', '1,000', None, '$2.5']).slice(1)
+    
+    cleaned = _strip_ascii(arr, '.')
+    
+    assert cleaned.to_pylist() == ['1000', None, '2.5']
+
+
+def test_non_ascii_symbols_fall_back_to_regex():
+    series = pd.Series(['€1.234,56', '€-7,5', '£3,00'])
+    
+    assert _strip_ascii(pa.array(series), ',') is None
+    numbers, report = clean_numeric(series)
+    
+    assert report['decimal'] == ','
+    assert numbers.tolist() == [1234.56, -7.5, 3.0]
+
+
+def test_ascii_and_regex_paths_strip_the_same_whitespace():
+    values = ['1 000', '2\t500', '3\r', '\n4\n', '5\x0b', '6\x0c', '7\x1f']
+    
+    ascii_numbers, _ = clean_numeric(pd.Series(values), decimal='.')
+    # Un valor no ASCII manda toda la columna por el camino regex
+    regex_numbers, _ = clean_numeric(pd.Series(values + ['8\u00a0000']), decimal='.')
+    
+    assert _strip_ascii(pa.array(values), '.') is not None
+    assert ascii_numbers.tolist() == [1000, 2500, 3, 4, 5, 6, 7]
+    assert regex_numbers.tolist() == [1000, 2500, 3, 4, 5, 6, 7, 8000]
+
+
+def test_comma_decimal_with_dot_thousands():
+    numbers, report = clean_numeric(pd.Series(['1.234,56', '-12,5%', '1.000.000,00']))
+    
+    assert report['decimal'] == ','
+    assert numbers.tolist() == [1234.56, -12.5, 1_000_000.0]
+
+
+def test_coerced_counts_only_non_null_failures():
+    series = pd.Series(['10', 'n/a', None, '20', 'abc'])
+    
+    numbers, report = clean_numeric(series, decimal='.')
+    
+    assert report['coerced'] == 2
+    assert numbers.isna().tolist() == [False, True, True, False, True]
+
+
+def test_low_cardinality_path_matches_full_parse():
+    series = pd.Series(['$1,000', '$2,500', None, '$1,000', 'bad'] * 20)
+    
+    factorized, factorized_report = clean_numeric(series, decimal='.', distinct_ratio=0.1)
+    full, full_report = clean_numeric(series, decimal='.')
+    
+    pd.testing.assert_series_equal(factorized, full)
+    assert factorized_report['coerced'] == full_report['coerced'] == 20
+
+
+def test_downcast_keeps_cents():
+    integers, report = clean_numeric(pd.Series(['1', '2', '$100']), decimal='.')
+    cents, cents_report = clean_numeric(pd.Series(['1.10', '2.25']), decimal='.')
+    
+    assert report['dtype'] == 'int8' and integers.tolist() == [1, 2, 100]
+    assert cents_report['dtype'] == 'float64' and cents.tolist() == [1.10, 2.25]
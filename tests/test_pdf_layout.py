@@ -0,0 +1,56 @@
+"""
+Cada sección del reporte ocupa una sola página: 4 páginas sin anexo, con
+los datos de examples/ y con muchas métricas, insights y breakdowns.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from utils.data_analyzer import DataAnalyzer
+from utils.pdf_generator import PDFReportGenerator
+from utils.pdf_profiler import PDFProfiler
+
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples')
+SECTIONS = ['page_1', 'page_2', 'page_3', 'page_4']
+
+
+def page_sections(data) -> list:
+    generator = PDFReportGenerator('Example Client', data, output_path=None, profiler=PDFProfiler(memory=False))
+    generator.render()
+    return [page['section'] for page in generator.profile['pages']]
+
+
+@pytest.mark.parametrize('example', ['ecommerce', 'retail', 'saas'])
+def test_examples_have_one_page_per_section(example):
+    analyzer = DataAnalyzer(pd.read_csv(os.path.join(EXAMPLES, f'{example}_example.csv')))
+    data = {
+        'metrics': analyzer.get_key_metrics(),
+        'charts': analyzer.get_chart_data(),
+        'insights': analyzer.get_insights(),
+        'growth_horizons': analyzer.get_growth_horizons(),
+        'breakdowns': analyzer.get_breakdowns()
+    }
+    
+    assert page_sections(data) == SECTIONS
+
+
+def test_long_sections_shrink_to_one_page():
+    data = {
+        'metrics': {f'metric_{i}': {'label': f'Metric {i}', 'value': i * 1000.0} for i in range(20)},
+        'insights': [f'Insight number {i} with some explanation of what changed' for i in range(15)],
+        'charts': {
+            'line_chart': {'title': 'Revenue Over Time', 'x_data': [f'2024-01-{d:02d}' for d in range(1, 29)],
+                           'y_data': [float(d) for d in range(28)]},
+            'pie_chart': {'labels': [f'Category {i}' for i in range(8)], 'values': [float(i + 1) for i in range(8)]}
+        },
+        'breakdowns': [
+            {'title': f'revenue by dim_{i}', 'dimensions': [f'dim_{i}'], 'measure': 'revenue',
+             'labels': [f'Value {j}' for j in range(10)], 'values': [float(j) for j in range(10)]}
+            for i in range(5)
+        ]
+    }
+    
+    assert page_sections(data) == SECTIONS
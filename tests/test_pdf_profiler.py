@@ -0,0 +1,38 @@
+"""
+PDFProfiler: tracemalloc solo está encendido mientras dura un render, aunque
+el render falle.
+"""
+
+import tracemalloc
+
+import pytest
+
+from utils.pdf_generator import PDFReportGenerator
+from utils.pdf_profiler import PDFProfiler
+
+
+DATA = {'metrics': {'total_revenue': {'label': 'Total Revenue', 'value': 12500.0, 'format': 'currency'}}}
+
+
+def test_tracing_runs_only_during_render():
+    generator = PDFReportGenerator('Acme', DATA, output_path=None, profiler=PDFProfiler())
+    assert not tracemalloc.is_tracing()
+    
+    generator.render()
+    
+    assert not tracemalloc.is_tracing()
+    assert [stage['stage'] for stage in generator.profile['stages']][0] == 'setup'
+    assert generator.profile['peak_mb'] is not None
+
+
+def test_failed_render_stops_tracing():
+    profiler = PDFProfiler()
+    # Una métrica sin valor rompe la página 1 a mitad del render
+    generator = PDFReportGenerator('Acme', {'metrics': {'broken': {'label': 'Broken'}}},
+                                   output_path=None, profiler=profiler)
+    
+    with pytest.raises(KeyError):
+        generator.render()
+    
+    assert not tracemalloc.is_tracing()
+    assert not profiler.active and profiler.result is None
@@ -0,0 +1,42 @@
+"""
+RetentionPolicy: de lo viejo queda el último reporte de cada período; los
+reportes sin fecha legible se conservan siempre.
+"""
+
+from datetime import datetime
+
+from utils.report_log import RetentionPolicy
+
+
+NOW = datetime(2026, 6, 1)
+
+
+def report(date, name: str) -> dict:
+    return {'date': date, 'name': name}
+
+
+def test_downsample_keeps_the_last_report_of_each_week():
+    policy = RetentionPolicy(downsample_after_days=30)
+    reports = [
+        report('2026-01-05T09:00:00', 'lunes'),
+        report('2026-01-09T09:00:00', 'viernes'),
+        report('2026-01-12T09:00:00', 'otra semana'),
+        report('2026-05-30T09:00:00', 'reciente')
+    ]
+    
+    kept = policy.apply(reports, now=NOW)
+    
+    assert [r['name'] for r in kept] == ['viernes', 'otra semana', 'reciente']
+
+
+def test_dateless_report_is_not_replaced_by_the_next_one():
+    policy = RetentionPolicy(downsample_after_days=30)
+    reports = [
+        report('2026-01-05T09:00:00', 'lunes'),
+        report(None, 'sin fecha'),
+        report('2026-01-07T09:00:00', 'miércoles')
+    ]
+    
+    kept = policy.apply(reports, now=NOW)
+    
+    assert [r['name'] for r in kept] == ['lunes', 'sin fecha', 'miércoles']
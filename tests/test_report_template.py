@@ -0,0 +1,31 @@
+"""
+Plantillas compiladas por color de marca: una por color, con tope LRU y
+el tema por defecto para colores inválidos.
+"""
+
+from utils import report_template
+from utils.report_template import DEFAULT_BRAND_COLOR, get_report_template
+
+
+def test_same_color_reuses_the_compiled_template():
+    report_template._templates.clear()
+    
+    assert get_report_template('#C0392B') is get_report_template('#c0392b')
+
+
+def test_templates_are_bounded_by_least_recent_use():
+    report_template._templates.clear()
+    first = get_report_template('#000000')
+    for i in range(1, report_template.MAX_TEMPLATES + 5):
+        get_report_template(f'#{i:06x}')
+    
+    assert len(report_template._templates) == report_template.MAX_TEMPLATES
+    assert get_report_template('#000000') is not first
+
+
+def test_invalid_color_falls_back_to_the_default_theme():
+    report_template._templates.clear()
+    
+    template = get_report_template('not-a-color')
+    
+    assert template.brand_color == DEFAULT_BRAND_COLOR
@@ -0,0 +1,48 @@
+"""
+ResultCache: cada sesión recibe su propia copia de los resultados
+compartidos, así modificar uno no cambia lo que ven las demás.
+"""
+
+import os
+
+import pandas as pd
+
+from utils.data_analyzer import DataAnalyzer
+from utils.result_cache import ResultCache
+
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples')
+
+
+def test_mutating_a_result_does_not_change_the_cached_value():
+    cache = ResultCache()
+    first = cache.get_or_compute('key', lambda: {'totals': pd.DataFrame({'x': [1, 2]}), 'labels': ['a']})
+    first['labels'].append('b')
+    first['totals'].loc[0, 'x'] = 100
+    
+    second = cache.get_or_compute('key', lambda: None)
+    
+    assert second['labels'] == ['a']
+    assert second['totals']['x'].tolist() == [1, 2]
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_copy_values_false_shares_the_stored_object():
+    cache = ResultCache(copy_values=False)
+    value = b'pdf'
+    cache.set('key', value)
+    
+    assert cache.get('key') is value
+    assert 'key' in cache and len(cache) == 1
+
+
+def test_two_analyzers_on_the_same_data_do_not_share_metrics():
+    df = pd.read_csv(os.path.join(EXAMPLES, 'retail_example.csv'))
+    cache = ResultCache()
+    first = DataAnalyzer(df, cache=cache).get_key_metrics()
+    first.clear()
+    
+    second = DataAnalyzer(df, cache=cache).get_key_metrics()
+    
+    assert second
+    assert cache.hits >= 1
@@ -0,0 +1,50 @@
+"""
+DistinctCounter: exacto hasta `exact_limit`, HyperLogLog después, y merge
+entre contadores en cualquiera de los dos modos.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.sketches import DistinctCounter
+
+
+def values(start: int, stop: int) -> pd.Series:
+    return pd.Series([f'customer-{i}' for i in range(start, stop)])
+
+
+def test_exact_up_to_the_limit():
+    counter = DistinctCounter(exact_limit=1_000)
+    counter.add(values(0, 600)).add(values(400, 1_000)).add(pd.Series([None, np.nan]))
+    
+    assert counter.is_exact
+    assert counter.count() == 1_000
+
+
+def test_switches_to_hll_just_past_the_limit():
+    counter = DistinctCounter(exact_limit=1_000)
+    counter.add(values(0, 1_001))
+    
+    assert not counter.is_exact
+    # Cerca del umbral rige linear counting: error muy por debajo del 1%
+    assert abs(counter.count() - 1_001) <= 10
+
+
+def test_hll_error_within_bounds():
+    counter = DistinctCounter(exact_limit=1_000)
+    for start in range(0, 200_000, 50_000):
+        counter.add(values(start, start + 50_000))
+    
+    # Error estándar con precision 14: 1.04 / sqrt(2^14) ~ 0.8%; 3 sigmas
+    assert abs(counter.count() - 200_000) / 200_000 < 0.025
+
+
+def test_merge_exact_and_hll_counters():
+    exact = DistinctCounter(exact_limit=5_000).add(values(0, 3_000))
+    other = DistinctCounter(exact_limit=5_000).add(values(2_000, 4_000))
+    assert exact.merge(other).is_exact and exact.count() == 4_000
+    
+    approx = DistinctCounter(exact_limit=5_000).add(values(0, 20_000))
+    approx.merge(DistinctCounter(exact_limit=5_000).add(values(10_000, 30_000)))
+    assert not approx.is_exact
+    assert abs(approx.count() - 30_000) / 30_000 < 0.025
@@ -0,0 +1,86 @@
+"""
+StreamingAnalyzer: los totales por fecha se agrupan por día, así la memoria
+no crece con la cantidad de timestamps distintos del archivo.
+"""
+
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.data_analyzer import DataAnalyzer
+from utils.result_cache import ResultCache
+from utils.streaming_analyzer import PartialAggregates, StreamingAnalyzer, resolve_data_path
+
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples')
+
+
+def make_csv(rows: int, freq: str) -> str:
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        'date': pd.date_range('2026-03-01', periods=rows, freq=freq),
+        'revenue': rng.integers(1, 100, rows).astype(float),
+        'category': [f'Category {i % 4}' for i in range(rows)]
+    }).to_csv(index=False)
+
+
+def test_timestamps_are_grouped_by_day():
+    # Un registro por minuto durante 3 días, leído en chunks chicos
+    csv = make_csv(3 * 24 * 60, 'min')
+    
+    analyzer = StreamingAnalyzer(io.StringIO(csv), chunksize=1_000, cache=ResultCache())
+    
+    by_day = analyzer.aggregates.result('date', 'revenue')
+    assert len(by_day) == 3
+    assert list(by_day.index) == list(pd.date_range('2026-03-01', periods=3, freq='D'))
+    assert by_day.sum() == pd.read_csv(io.StringIO(csv))['revenue'].sum()
+
+
+def test_daily_data_matches_the_in_memory_analyzer():
+    csv = make_csv(400, 'D')
+    
+    streaming = StreamingAnalyzer(io.StringIO(csv), chunksize=64, cache=ResultCache())
+    in_memory = DataAnalyzer(pd.read_csv(io.StringIO(csv)), cache=ResultCache())
+    
+    assert streaming.get_key_metrics() == in_memory.get_key_metrics()
+    assert streaming.get_growth_horizons() == in_memory.get_growth_horizons()
+
+
+def test_merge_keeps_day_buckets():
+    frame = pd.DataFrame({
+        'date': pd.to_datetime(['2026-03-01 08:00', '2026-03-01 17:30', '2026-03-02 09:15']),
+        'revenue': [10.0, 5.0, 1.0]
+    })
+    requests = [('date', 'revenue', 'sum')]
+    first = PartialAggregates(requests, date_columns=['date']).update(frame.iloc[:2])
+    second = PartialAggregates(requests, date_columns=['date']).update(frame.iloc[2:])
+    
+    merged = first.merge(second).result('date', 'revenue')
+    
+    assert merged.tolist() == [15.0, 1.0]
+
+
+def test_breakdowns_use_the_distinct_ratio_of_the_whole_file():
+    path = os.path.join(EXAMPLES, 'retail_example.csv')
+    # Con 4 filas por chunk, en el primero casi todos los valores son distintos
+    streaming = StreamingAnalyzer(path, chunksize=4, cache=ResultCache())
+    in_memory = DataAnalyzer(pd.read_csv(path), cache=ResultCache())
+    
+    breakdowns = streaming.get_breakdowns()
+    assert breakdowns
+    assert breakdowns == in_memory.get_breakdowns()
+
+
+def test_data_path_is_confined_to_the_data_directory(tmp_path):
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    (data_dir / 'ventas.csv').write_text('a\n1\n')
+    (tmp_path / 'secreto.csv').write_text('a\n1\n')
+    os.symlink(tmp_path / 'secreto.csv', data_dir / 'enlace.csv')
+    
+    assert resolve_data_path(str(data_dir), 'ventas.csv') == os.path.realpath(data_dir / 'ventas.csv')
+    for name in ['../secreto.csv', str(tmp_path / 'secreto.csv'), 'enlace.csv', 'no_existe.csv', '.', '']:
+        assert resolve_data_path(str(data_dir), name) is None
+    assert resolve_data_path('', 'ventas.csv') is None
@@ -1,8 +1,9 @@
 """Utils package for AutoReport."""
 
 from .data_analyzer import DataAnalyzer
+from .streaming_analyzer import StreamingAnalyzer
 from .pdf_generator import PDFReportGenerator
 from .client_manager import ClientManager, EmailSender
 
-__all__ = ['DataAnalyzer', 'PDFReportGenerator', 'ClientManager', 'EmailSender']
+__all__ = ['DataAnalyzer', 'StreamingAnalyzer', 'PDFReportGenerator', 'ClientManager', 'EmailSender']
 
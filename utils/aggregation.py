@@ -0,0 +1,90 @@
+"""
+Planificador de agregaciones compartidas para DataAnalyzer.
+Reúne todas las agrupaciones que necesitan métricas, charts e insights
+y ejecuta cada groupby distinto una sola vez, sin copiar el DataFrame.
+"""
+
+import pandas as pd
+from typing import Dict, Optional, Set, Tuple, Any
+
+
+class AggregationPlan:
+    """Colecciona agregaciones y las ejecuta con un solo groupby por clave."""
+    
+    SUPPORTED = ('sum', 'count', 'mean', 'min', 'max', 'nunique')
+    
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._requests: Dict[Optional[str], Dict[str, Set[str]]] = {}
+        self._numeric_cache: Dict[str, pd.Series] = {}
+        self._results: Dict[Tuple[Optional[str], str, str], Any] = {}
+        self.executed = False
+    
+    def add(self, by: Optional[str], value: str, how: str = 'sum') -> 'AggregationPlan':
+        """Registra una agregación. Con `by=None` se calcula un total escalar."""
+        if how not in self.SUPPORTED:
+            raise ValueError(f"Unsupported aggregation: {how}")
+        
+        self._requests.setdefault(by, {}).setdefault(value, set()).add(how)
+        self.executed = False
+        return self
+    
+    def numeric(self, col: str) -> pd.Series:
+        """Devuelve la columna como numérica, convirtiéndola una sola vez."""
+        if col not in self._numeric_cache:
+            series = self.df[col]
+            if not pd.api.types.is_numeric_dtype(series):
+                series = pd.to_numeric(series, errors='coerce')
+            self._numeric_cache[col] = series
+        return self._numeric_cache[col]
+    
+    def execute(self) -> 'AggregationPlan':
+        """Ejecuta todas las agregaciones pendientes."""
+        for by, values in self._requests.items():
+            if by is None:
+                for value, hows in values.items():
+                    for how in hows:
+                        key = (None, value, how)
+                        if key not in self._results:
+                            series = self.df[value] if how == 'nunique' else self.numeric(value)
+                            self._results[key] = getattr(series, how)()
+                continue
+            
+            pending = {
+                value: [how for how in hows if (by, value, how) not in self._results]
+                for value, hows in values.items()
+            }
+            pending = {value: hows for value, hows in pending.items() if hows}
+            if not pending:
+                continue
+            
+            # Un único GroupBy por clave: la factorización de `by` se comparte
+            # entre todas las columnas y funciones que se agregan sobre ella.
+            key = self.df[by]
+            numeric_values = [value for value, hows in pending.items()
+                              if any(how != 'nunique' for how in hows)]
+            grouped = None
+            if numeric_values:
+                frame = pd.DataFrame({value: self.numeric(value) for value in numeric_values}, copy=False)
+                grouped = frame.groupby(key, sort=True)
+            
+            for value, hows in pending.items():
+                for how in hows:
+                    if how == 'nunique':
+                        result = self.df[value].groupby(key, sort=True).nunique()
+                    else:
+                        result = getattr(grouped[value], how)()
+                    self._results[(by, value, how)] = result
+        
+        self.executed = True
+        return self
+    
+    def result(self, by: Optional[str], value: str, how: str = 'sum') -> Any:
+        """Obtiene el resultado de una agregación registrada."""
+        if not self.executed:
+            self.execute()
+        return self._results[(by, value, how)]
+    
+    def top(self, by: str, value: str, n: int = 10, how: str = 'sum') -> pd.Series:
+        """Top-n grupos por valor descendente."""
+        return self.result(by, value, how).sort_values(ascending=False, kind='stable').head(n)
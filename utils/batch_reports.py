@@ -0,0 +1,165 @@
+"""
+Generación de PDFs en lote sobre un pool de procesos ya calentado.
+Cada worker importa reportlab y compila la plantilla por defecto al arrancar,
+así los reportes del lote solo pagan el render. Devuelve un resultado por
+trabajo, con el error si falló, sin cortar el resto del lote.
+"""
+
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def _warm_worker():
+    """Inicializador de cada worker: imports, fuentes y plantilla por defecto."""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from .report_template import get_report_template
+    
+    get_report_template()
+    # Carga las métricas de las fuentes estándar que usa el reporte
+    for font in ('Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique'):
+        stringWidth('AutoReport', font, 10)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _render(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Genera un reporte dentro del worker; nunca lanza excepciones."""
+    from .pdf_generator import PDFReportGenerator
+    from .pdf_profiler import PDFProfiler
+    
+    start = time.perf_counter()
+    result = {
+        'client_name': job.get('client_name'),
+        'output_path': job.get('output_path'),
+        'ok': False,
+        'error': None,
+        'seconds': 0.0,
+        'bytes': None,
+        'worker': os.getpid()
+    }
+    try:
+        generator = PDFReportGenerator(
+            client_name=job['client_name'],
+            data=job['data'],
+            output_path=job['output_path'],
+            brand_color=job.get('brand_color'),
+            compact=job.get('compact', False),
+            incremental=job.get('incremental', False),
+            # Sin tracemalloc: en el lote interesa el tiempo por etapa
+            profiler=PDFProfiler(memory=False, log=True) if job.get('profile') else None
+        )
+        if job.get('output_path'):
+            result['output_path'] = generator.generate()
+        else:
+            # Sin ruta: el PDF vuelve en memoria al proceso principal
+            result['pdf_bytes'] = generator.render()
+        result['bytes'] = generator.output_size
+        result['profile'] = generator.profile
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+        result['traceback'] = traceback.format_exc()
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+class BatchReportGenerator:
+    """Pool de workers para generar muchos reportes (cliente, datos) en paralelo.
+
+    Cada trabajo es un dict con `client_name`, `data`, `output_path` y,
+    opcionalmente, `brand_color`, `compact` e `incremental` (los mismos argumentos
+    de PDFReportGenerator) y `profile` (tiempos por etapa en `result['profile']`).
+    Con `output_path=None` el resultado trae el PDF en `pdf_bytes`.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, warm: bool = True):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if warm:
+            self.warm_up()
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_warm_worker)
+        return self._executor
+    
+    def warm_up(self) -> List[int]:
+        """Arranca todos los workers (cada uno corre el inicializador). Devuelve sus PIDs."""
+        executor = self._get_executor()
+        futures = [executor.submit(_ping) for _ in range(self.max_workers)]
+        return sorted({future.result() for future in futures})
+    
+    def generate(self, jobs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Genera todos los reportes. Los resultados mantienen el orden de `jobs`."""
+        jobs = list(jobs)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        broken = False
+        
+        try:
+            executor = self._get_executor()
+            futures = {executor.submit(_render, job): index for index, job in enumerate(jobs)}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    # Un worker murió (ej. sin memoria): fallan sus trabajos, no el lote
+                    results[index] = self._failed(jobs[index], e)
+                    broken = broken or isinstance(e, BrokenProcessPool)
+        except BrokenProcessPool as e:
+            print(f"Error in report worker pool: {e}")
+            broken = True
+        
+        if broken:
+            # Un pool roto no acepta más trabajos: el próximo lote crea uno nuevo
+            self.close()
+        
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = self._failed(jobs[index], RuntimeError("Worker pool stopped"))
+        return results
+    
+    @staticmethod
+    def _failed(job: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        return {
+            'client_name': job.get('client_name'),
+            'output_path': job.get('output_path'),
+            'ok': False,
+            'error': f"{type(error).__name__}: {error}",
+            'seconds': 0.0,
+            'bytes': None,
+            'worker': None
+        }
+    
+    def close(self):
+        """Detiene los workers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+    
+    def __enter__(self) -> 'BatchReportGenerator':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+_shared_batch: Optional[BatchReportGenerator] = None
+_shared_lock = threading.Lock()
+
+
+def get_batch_generator(max_workers: Optional[int] = None) -> BatchReportGenerator:
+    """Devuelve el pool del proceso (se crea y calienta al primer uso)."""
+    global _shared_batch
+    # Sin lock, dos sesiones que lo piden a la vez levantan dos pools de procesos
+    with _shared_lock:
+        if _shared_batch is None:
+            _shared_batch = BatchReportGenerator(max_workers=max_workers)
+        return _shared_batch
@@ -0,0 +1,183 @@
+"""
+Caché de charts del PDF direccionada por contenido.
+Cada Drawing se indexa por el hash de su tipo, datos y estilo: los reportes
+con los mismos datos (reruns, reportes regenerados, clientes con el mismo
+dataset) reutilizan el chart ya construido. Vive en memoria (LRU) y en disco,
+así los workers del lote comparten lo que construyó cualquiera de ellos.
+
+En disco cada chart es un JSON con sus formas primitivas (líneas, textos,
+porciones...): al leerlo solo se instancian clases de una lista cerrada de
+reportlab.graphics.shapes, nunca código arbitrario como con pickle.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from reportlab.graphics import shapes
+from reportlab.graphics.shapes import Drawing
+from reportlab.lib.colors import Color
+
+from .disk_cache import DiskLRU
+from .result_cache import ResultCache
+
+
+# Subir al cambiar cómo se dibujan los charts: invalida lo cacheado en disco
+CHART_CACHE_VERSION = 3
+
+# Formas que puede tener un chart ya aplanado (ver pdf_charts._flatten)
+SHAPES = {
+    cls.__name__: cls
+    for cls in (shapes.Drawing, shapes.Group, shapes.Line, shapes.PolyLine, shapes.Polygon, shapes.Rect,
+                shapes.Circle, shapes.Ellipse, shapes.Wedge, shapes.String, shapes.Path)
+}
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Color):
+        return {'color': list(value.rgba())}
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(item) for item in value]
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return Color(*value['color'])
+    if isinstance(value, list):
+        return [_decode_value(item) for item in value]
+    return value
+
+
+def encode_drawing(node) -> Dict[str, Any]:
+    """Árbol de formas como dict serializable a JSON (falla con formas fuera de SHAPES)."""
+    name = type(node).__name__
+    if SHAPES.get(name) is not type(node):
+        raise TypeError(f"Shape {name} cannot be cached")
+    attrs = {
+        key: _encode_value(value) for key, value in vars(node).items()
+        if not key.startswith('_') and key != 'contents'
+    }
+    encoded = {'shape': name, 'attrs': attrs}
+    if isinstance(node, shapes.Group):
+        encoded['contents'] = [encode_drawing(child) for child in node.contents]
+    return encoded
+
+
+def decode_drawing(encoded: Dict[str, Any]):
+    """Inversa de encode_drawing: solo instancia clases de SHAPES."""
+    cls = SHAPES.get(encoded['shape'])
+    if cls is None:
+        raise ValueError(f"Unknown shape {encoded['shape']!r}")
+    node = cls.__new__(cls)
+    for key, value in encoded['attrs'].items():
+        # Los transform son tuplas en reportlab
+        node.__dict__[key] = tuple(value) if key == 'transform' else _decode_value(value)
+    if 'contents' in encoded:
+        node.__dict__['contents'] = [decode_drawing(child) for child in encoded['contents']]
+    return node
+
+
+class ChartCache:
+    """Drawings ya construidos, en memoria y en disco, con expulsión LRU."""
+    
+    def __init__(self, cache_dir: Optional[str] = ".autoreport_cache/charts", max_entries: int = 256,
+                 max_bytes: int = 256 * 1024 ** 2):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # get() ya devuelve una copia del Drawing
+        self._memory = ResultCache(max_entries=max_entries, copy_values=False)
+        self._disk = DiskLRU(cache_dir, '.json', max_bytes) if cache_dir else None
+        self.disk_hits = 0
+        self.builds = 0
+    
+    @staticmethod
+    def key_for(kind: str, data: Dict[str, Any], style: Dict[str, Any]) -> str:
+        """Hash estable del chart: tipo + datos + estilo."""
+        payload = json.dumps({
+            'version': CHART_CACHE_VERSION,
+            'kind': kind,
+            'data': data,
+            'style': style
+        }, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[Drawing]:
+        """Devuelve una copia del chart cacheado, o None."""
+        drawing = self._memory.get(key)
+        if drawing is None and self._disk:
+            drawing = self._load(key)
+            if drawing is not None:
+                self.disk_hits += 1
+                self._memory.set(key, drawing)
+        # Copia liviana: cada reporte hace wrap/draw sobre su propia instancia
+        return copy.copy(drawing) if drawing is not None else None
+    
+    def _load(self, key: str) -> Optional[Drawing]:
+        data = self._disk.read(key)
+        if data is None:
+            return None
+        try:
+            return decode_drawing(json.loads(data))
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Error loading cached chart {key}: {e}")
+            return None
+    
+    def store(self, key: str, drawing: Drawing) -> bool:
+        """Guarda el chart en memoria y en disco. Devuelve False si no se pudo persistir."""
+        self._memory.set(key, drawing)
+        if not self._disk:
+            return True
+        try:
+            encoded = json.dumps(encode_drawing(drawing), separators=(',', ':'))
+        except (TypeError, ValueError) as e:
+            print(f"Error caching chart: {e}")
+            return False
+        # Escritura atómica: varios workers pueden guardar el mismo chart a la vez
+        return self._disk.write(key, encoded)
+    
+    def get_or_build(self, kind: str, data: Dict[str, Any], style: Dict[str, Any],
+                     build: Callable[[Dict[str, Any], Dict[str, Any]], Drawing]) -> Drawing:
+        """Devuelve el chart cacheado o lo construye con `build(data, style)` y lo guarda."""
+        key = self.key_for(kind, data, style)
+        drawing = self.get(key)
+        if drawing is None:
+            drawing = build(data, style)
+            self.builds += 1
+            self.store(key, drawing)
+            drawing = copy.copy(drawing)
+        return drawing
+    
+    def size_bytes(self) -> int:
+        """Tamaño total de los charts cacheados en disco."""
+        return self._disk.size_bytes() if self._disk else 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Aciertos en memoria y en disco, y charts construidos."""
+        return {
+            'memory_hits': self._memory.hits,
+            'disk_hits': self.disk_hits,
+            'builds': self.builds,
+            'entries': len(self._memory)
+        }
+    
+    def clear(self):
+        """Vacía la caché en memoria (los archivos en disco se expulsan solos)."""
+        self._memory.clear()
+        self.disk_hits = 0
+        self.builds = 0
+
+
+_shared_cache: Optional[ChartCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_chart_cache() -> ChartCache:
+    """Devuelve la caché de charts del proceso (se crea al primer uso)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ChartCache()
+        return _shared_cache
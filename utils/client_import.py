@@ -0,0 +1,103 @@
+"""
+Importación y exportación masiva de clientes (CSV/Excel).
+La validación y el deduplicado por email se hacen en una sola pasada
+vectorizada sobre el DataFrame; el alta de todos los clientes válidos es
+una única escritura en el backend (ver ClientStorage.insert_many).
+"""
+
+import io
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_BRAND_COLOR = '#1f77b4'
+
+# Nombres de columna aceptados (en minúsculas, sin espacios alrededor)
+COLUMN_ALIASES = {
+    'name': ('name', 'nombre', 'client', 'cliente', 'contact', 'contacto'),
+    'email': ('email', 'e-mail', 'mail', 'correo'),
+    'company': ('company', 'empresa', 'organization', 'organización'),
+    'brand_color': ('brand_color', 'color', 'brand color', 'color de marca')
+}
+
+EXPORT_COLUMNS = ['id', 'name', 'email', 'company', 'brand_color', 'created_at', 'report_count', 'last_report_at']
+
+EMAIL_PATTERN = r'^[^@\s]+@[^@\s]+\.[^@\s]+$'
+COLOR_PATTERN = r'^#[0-9a-fA-F]{6}$'
+
+
+def read_clients_file(data: bytes, filename: str) -> pd.DataFrame:
+    """Lee un CSV o Excel de clientes, todo como texto (no convierte emails ni colores)."""
+    if filename.lower().endswith('.csv'):
+        return pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False)
+    return pd.read_excel(io.BytesIO(data), dtype=str, keep_default_na=False)
+
+
+def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    lookup = {alias: field for field, aliases in COLUMN_ALIASES.items() for alias in aliases}
+    renamed = {}
+    for column in df.columns:
+        field = lookup.get(str(column).strip().lower())
+        if field and field not in renamed.values():
+            renamed[column] = field
+    if 'email' not in renamed.values():
+        raise ValueError("Clients file needs an email column (email, mail o correo)")
+    return df[list(renamed)].rename(columns=renamed)
+
+
+def prepare_import(df: pd.DataFrame, existing_emails: Iterable[str] = ()) -> Dict[str, Any]:
+    """Valida y deduplica clientes a importar, sin tocar el backend.
+
+    Devuelve `clients` (dicts listos para `insert_many`), `invalid` (fila y
+    motivo) y `duplicates` (filas con un email repetido en el archivo o ya
+    existente). El email se compara sin mayúsculas.
+    """
+    df = _normalize_columns(df)
+    frame = pd.DataFrame(index=df.index)
+    for field in COLUMN_ALIASES:
+        values = df[field] if field in df else pd.Series('', index=df.index)
+        frame[field] = values.fillna('').astype(str).str.strip()
+    frame['email_key'] = frame['email'].str.lower()
+    # Sin nombre: la parte local del email
+    missing_name = frame['name'] == ''
+    frame.loc[missing_name, 'name'] = frame.loc[missing_name, 'email'].str.split('@').str[0]
+    frame.loc[~frame['brand_color'].str.match(COLOR_PATTERN), 'brand_color'] = DEFAULT_BRAND_COLOR
+    
+    reason = pd.Series('', index=frame.index, dtype=object)
+    reason[~frame['email'].str.match(EMAIL_PATTERN)] = 'invalid email'
+    reason[frame['email'] == ''] = 'missing email'
+    valid = reason == ''
+    existing = {email.lower() for email in existing_emails}
+    already = valid & frame['email_key'].isin(existing)
+    repeated = valid & ~already & frame['email_key'].duplicated(keep='first')
+    
+    keep = valid & ~already & ~repeated
+    created_at = datetime.now().isoformat()
+    clients = [
+        {**row, 'created_at': created_at}
+        for row in frame.loc[keep, list(COLUMN_ALIASES)].to_dict('records')
+    ]
+    # Número de fila de datos (desde 1, sin contar el encabezado), para reportar errores
+    rows = np.arange(1, len(frame) + 1)
+    skipped = (already | repeated).to_numpy()
+    return {
+        'clients': clients,
+        'invalid': [
+            {'row': int(row), 'email': email, 'reason': why}
+            for row, email, why in zip(rows[~valid.to_numpy()], frame['email'][~valid], reason[~valid])
+        ],
+        'duplicates': [
+            {'row': int(row), 'email': email, 'reason': str(why)}
+            for row, email, why in zip(rows[skipped], frame['email'][skipped],
+                                       np.where(already.to_numpy()[skipped], 'already exists', 'repeated in file'))
+        ]
+    }
+
+
+def clients_frame(clients: List[Dict]) -> pd.DataFrame:
+    """Clientes (de `list_clients`) como DataFrame con las columnas de exportación."""
+    return pd.DataFrame(clients).reindex(columns=EXPORT_COLUMNS)
+
@@ -1,45 +1,48 @@
 """
 Módulo para gestión de clientes y envío de emails.
-Incluye almacenamiento simple en JSON y envío de reportes por email.
+Los clientes se guardan en un backend enchufable (SQLite por defecto, ver
+client_storage) y los reportes se envían por email.
 """
 
-import json
 import os
+import threading
 from typing import List, Dict, Optional
-from datetime import datetime
-from sendgrid import SendGridAPIClient
+from datetime import datetime, timedelta
+import pandas as pd
 from sendgrid.helpers.mail import (Mail, Attachment, FileContent, 
                                    FileName, FileType, Disposition)
 import base64
 
+from .client_import import clients_frame, prepare_import
+from .client_storage import ClientStorage, open_client_storage
+from .email_dispatch import SENDGRID_HOST, EmailDispatcher, EmailTransport, SendGridTransport
+from .metrics_store import MetricsStore, metrics_dir_for
+from .report_log import RetentionPolicy
+
 
 class ClientManager:
     """Gestiona clientes y sus reportes."""
     
-    def __init__(self, data_file: str = "clients_data.json"):
+    def __init__(self, data_file: str = "clients_data.json", storage: Optional[ClientStorage] = None,
+                 retention: Optional[RetentionPolicy] = None, compact_every_hours: float = 24):
         self.data_file = data_file
-        self.clients = self._load_clients()
-    
-    def _load_clients(self) -> List[Dict]:
-        """Carga clientes desde archivo JSON."""
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return []
-        return []
+        # SQLite por defecto (importa el JSON existente); ver client_storage
+        self.storage = storage or open_client_storage(data_file)
+        # Retención del histórico (por defecto de las variables AUTOREPORT_HISTORY_*)
+        self.retention = retention or RetentionPolicy.from_env()
+        self.compact_every = timedelta(hours=compact_every_hours)
+        # Métricas de cada reporte en series columnares, para consultas históricas
+        self.metrics = MetricsStore(metrics_dir_for(data_file))
+        self.metrics.backfill(self._all_reports)
     
-    def _save_clients(self):
-        """Guarda clientes en archivo JSON."""
-        with open(self.data_file, 'w') as f:
-            json.dump(self.clients, f, indent=2)
+    @property
+    def clients(self) -> List[Dict]:
+        return self.storage.all_clients()
     
     def add_client(self, name: str, email: str, company: str = "", 
                    brand_color: str = "#1f77b4") -> Dict:
         """Añade un nuevo cliente."""
         client = {
-            'id': len(self.clients) + 1,
             'name': name,
             'email': email,
             'company': company,
@@ -48,92 +51,167 @@ class ClientManager:
             'reports': []
         }
         
-        self.clients.append(client)
-        self._save_clients()
+        return self.storage.insert(client)
+    
+    def import_clients(self, df: pd.DataFrame) -> Dict:
+        """Alta masiva desde un DataFrame (columnas name/email/company/brand_color o sus alias).
         
-        return client
+        Valida y deduplica por email (contra el archivo y los clientes
+        existentes) y guarda todos los válidos en una sola escritura.
+        Devuelve `imported` (clientes creados), `invalid` y `duplicates`.
+        """
+        existing = (client['email'] for client in self.storage.list_clients())
+        prepared = prepare_import(df, existing)
+        imported = self.storage.insert_many(prepared['clients']) if prepared['clients'] else []
+        return {'imported': imported, 'invalid': prepared['invalid'], 'duplicates': prepared['duplicates']}
+    
+    def export_clients(self) -> pd.DataFrame:
+        """Todos los clientes con sus contadores de reportes, listos para `to_csv`/`to_excel`."""
+        return clients_frame(self.storage.list_clients())
     
     def get_client(self, client_id: int) -> Optional[Dict]:
         """Obtiene un cliente por ID."""
-        for client in self.clients:
-            if client['id'] == client_id:
-                return client
-        return None
+        return self.storage.get(client_id)
     
     def get_client_by_email(self, email: str) -> Optional[Dict]:
         """Obtiene un cliente por email."""
-        for client in self.clients:
-            if client['email'].lower() == email.lower():
-                return client
-        return None
+        return self.storage.get_by_email(email)
     
     def update_client(self, client_id: int, **kwargs):
         """Actualiza información de un cliente."""
-        for i, client in enumerate(self.clients):
-            if client['id'] == client_id:
-                self.clients[i].update(kwargs)
-                self._save_clients()
-                return self.clients[i]
-        return None
+        return self.storage.update(client_id, kwargs)
     
     def delete_client(self, client_id: int) -> bool:
         """Elimina un cliente."""
-        self.clients = [c for c in self.clients if c['id'] != client_id]
-        self._save_clients()
-        return True
+        deleted = self.storage.delete(client_id)
+        if deleted:
+            self.metrics.delete(client_id)
+        return deleted
     
     def add_report_to_client(self, client_id: int, report_data: Dict):
         """Añade un reporte al historial del cliente."""
-        client = self.get_client(client_id)
-        if client:
-            report = {
-                'date': datetime.now().isoformat(),
-                'metrics': report_data.get('metrics', {}),
-                'pdf_path': report_data.get('pdf_path', '')
-            }
-            
-            for i, c in enumerate(self.clients):
-                if c['id'] == client_id:
-                    if 'reports' not in self.clients[i]:
-                        self.clients[i]['reports'] = []
-                    self.clients[i]['reports'].append(report)
-                    break
-            
-            self._save_clients()
-            return report
-        return None
+        report = {
+            'date': datetime.now().isoformat(),
+            'metrics': report_data.get('metrics', {}),
+            'pdf_path': report_data.get('pdf_path', '')
+        }
+        saved = self.storage.add_report(client_id, report)
+        if saved:
+            self.metrics.append(client_id, report['date'], report['metrics'])
+            self._maybe_compact_history()
+        return saved
+    
+    def _maybe_compact_history(self):
+        """Compacta el histórico si hay retención y pasó `compact_every` desde la última vez."""
+        if not self.retention.active:
+            return
+        last = self.storage.history_compacted_at()
+        if last is None or datetime.now() - last >= self.compact_every:
+            self.compact_history()
+    
+    def compact_history(self) -> int:
+        """Aplica la retención al histórico de todos los clientes. Devuelve cuántos reportes quitó."""
+        try:
+            removed = self.storage.compact_history(self.retention)
+        except Exception as e:
+            print(f"Error compacting report history: {e}")
+            return 0
+        if removed:
+            # Las series reflejan lo que quedó en el histórico
+            for client_id, reports in self._all_reports():
+                self.metrics.rebuild(client_id, reports)
+        return removed
+    
+    def _all_reports(self):
+        for client in self.storage.list_clients():
+            yield client['id'], (self.storage.reports(client['id']) if client.get('report_count') else [])
     
     def get_client_reports(self, client_id: int) -> List[Dict]:
         """Obtiene historial de reportes de un cliente."""
-        client = self.get_client(client_id)
-        if client:
-            return client.get('reports', [])
-        return []
+        return self.storage.reports(client_id)
     
     def get_all_clients(self) -> List[Dict]:
         """Obtiene todos los clientes."""
-        return self.clients
+        return self.storage.all_clients()
+    
+    def list_clients(self) -> List[Dict]:
+        """Todos los clientes sin su histórico, con `report_count` y `last_report_at`."""
+        return self.storage.list_clients()
+    
+    def get_client_stats(self, client_id: int) -> Dict:
+        """Reportes enviados a un cliente (`report_count`) y fecha del último (`last_report_at`)."""
+        return self.storage.report_stats(client_id)
+    
+    def get_report_totals(self) -> Dict:
+        """Totales: `clients`, `reports` enviados y `last_report_at`."""
+        return self.storage.totals()
+    
+    def get_client_reports_page(self, client_id: int, page: int = 1, per_page: int = 5) -> Dict:
+        """Una página del histórico de un cliente, del reporte más nuevo al más viejo."""
+        page = max(int(page), 1)
+        per_page = max(int(per_page), 1)
+        total = self.storage.report_stats(client_id)['report_count']
+        return {
+            'reports': self.storage.report_page(client_id, (page - 1) * per_page, per_page),
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'pages': -(-total // per_page)
+        }
+    
+    def get_metric_series(self, client_id: int, metric: str, last: Optional[int] = None,
+                          since: Optional[datetime] = None) -> pd.Series:
+        """Una métrica de un cliente por fecha de reporte (ej. `total_revenue` de los últimos 52)."""
+        return self.metrics.series(client_id, metric, last=last, since=since)
+    
+    def get_metrics_history(self, metrics: Optional[List[str]] = None, since: Optional[datetime] = None,
+                            until: Optional[datetime] = None) -> pd.DataFrame:
+        """Métricas de todos los clientes en [since, until): una fila por reporte, con `client_id` y `date`."""
+        return self.metrics.snapshot(metrics, since=since, until=until)
+    
+    def get_latest_metrics(self, metrics: Optional[List[str]] = None, since: Optional[datetime] = None) -> pd.DataFrame:
+        """Último reporte de cada cliente desde `since`, indexado por `client_id` (ej. growth de la semana)."""
+        return self.metrics.latest(metrics, since=since)
+
+
+_shared_managers: Dict[str, ClientManager] = {}
+_shared_lock = threading.Lock()
+
+
+def get_client_manager(data_file: str = "clients_data.json") -> ClientManager:
+    """ClientManager compartido por todas las sesiones del proceso (uno por `data_file`).
+    
+    Los backends son seguros entre hilos y procesos: las sesiones ven al
+    instante lo que escribe cualquier otra, del mismo proceso o de otro.
+    """
+    with _shared_lock:
+        if data_file not in _shared_managers:
+            _shared_managers[data_file] = ClientManager(data_file)
+        return _shared_managers[data_file]
 
 
 class EmailSender:
-    """Envía emails con reportes adjuntos."""
+    """Envía emails con reportes adjuntos.
+    
+    Por defecto usa SendGrid (SENDGRID_API_KEY; SENDGRID_API_HOST para apuntar
+    a otro servidor con la misma API, ej. un mock local). `transport` permite
+    enchufar otro (ver email_dispatch.EmailTransport).
+    """
     
-    def __init__(self, api_key: Optional[str] = None, from_email: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, from_email: Optional[str] = None,
+                 transport: Optional[EmailTransport] = None):
         self.api_key = api_key or os.getenv('SENDGRID_API_KEY')
         self.from_email = from_email or os.getenv('SENDGRID_FROM_EMAIL', 'reports@autoreport.io')
         
-        if self.api_key:
-            self.sg = SendGridAPIClient(self.api_key)
-        else:
-            self.sg = None
+        if transport is None and self.api_key:
+            transport = SendGridTransport(self.api_key, host=os.getenv('SENDGRID_API_HOST', SENDGRID_HOST))
+        self.transport = transport
+        self.sg = transport.client if isinstance(transport, SendGridTransport) else None
     
-    def send_report(self, to_email: str, client_name: str, 
-                   pdf_path: str, subject: Optional[str] = None) -> bool:
-        """Envía reporte por email con PDF adjunto."""
-        
-        if not self.sg:
-            print("⚠️  SendGrid API key not configured. Email not sent.")
-            return False
+    def _build_message(self, to_email: str, client_name: str,
+                       pdf_path: Optional[str] = None, subject: Optional[str] = None,
+                       pdf_bytes: Optional[bytes] = None, filename: Optional[str] = None) -> Dict:
+        """Body de la API v3 de SendGrid para un reporte, con el PDF adjunto."""
         
         # Subject
         if not subject:
@@ -151,27 +229,67 @@ class EmailSender:
         )
         
         # Adjuntar PDF
-        if os.path.exists(pdf_path):
+        if pdf_bytes is None and pdf_path and os.path.exists(pdf_path):
             with open(pdf_path, 'rb') as f:
-                data = f.read()
-            
-            encoded_file = base64.b64encode(data).decode()
+                pdf_bytes = f.read()
+        
+        if pdf_bytes is not None:
+            encoded_file = base64.b64encode(pdf_bytes).decode()
             
             attached_file = Attachment(
                 FileContent(encoded_file),
-                FileName(f'report_{datetime.now().strftime("%Y%m%d")}.pdf'),
+                FileName(filename or f'report_{datetime.now().strftime("%Y%m%d")}.pdf'),
                 FileType('application/pdf'),
                 Disposition('attachment')
             )
             message.attachment = attached_file
         
-        try:
-            response = self.sg.send(message)
-            print(f"✅ Email sent! Status code: {response.status_code}")
-            return True
-        except Exception as e:
-            print(f"❌ Error sending email: {e}")
+        return message.get()
+    
+    def send_report(self, to_email: str, client_name: str, 
+                   pdf_path: Optional[str] = None, subject: Optional[str] = None,
+                   pdf_bytes: Optional[bytes] = None, filename: Optional[str] = None) -> bool:
+        """Envía reporte por email con PDF adjunto.
+        
+        El PDF puede venir ya en memoria (`pdf_bytes`, ej. de PDFReportGenerator.render)
+        o leerse de `pdf_path`. Errores transitorios (429, 5xx, red) se reintentan.
+        """
+        
+        if not self.transport:
+            print("⚠️  SendGrid API key not configured. Email not sent.")
             return False
+        
+        message = self._build_message(to_email, client_name, pdf_path, subject, pdf_bytes, filename)
+        result = EmailDispatcher(self.transport, max_workers=1, rate_per_second=None).send(message)
+        if result['ok']:
+            print(f"✅ Email sent! Status code: {result['status']}")
+        else:
+            print(f"❌ Error sending email: {result['error']}")
+        return result['ok']
+    
+    def send_bulk(self, jobs: List[Dict], max_workers: int = 8, rate_per_second: Optional[float] = 10.0,
+                  max_retries: int = 4) -> List[Dict]:
+        """Envía muchos reportes en paralelo, con límite de tasa y reintentos.
+        
+        Cada trabajo tiene los argumentos de `send_report` (`to_email`,
+        `client_name`, `pdf_path` o `pdf_bytes`, `subject`, `filename`).
+        Devuelve un resultado por trabajo, en el mismo orden: `to_email`, `ok`,
+        `status` (último código HTTP), `attempts`, `error` y `seconds`.
+        """
+        jobs = list(jobs)
+        if not self.transport:
+            print("⚠️  SendGrid API key not configured. Emails not sent.")
+            results = [{'ok': False, 'status': None, 'attempts': 0, 'error': 'Email not configured', 'seconds': 0.0}
+                       for _ in jobs]
+        else:
+            dispatcher = EmailDispatcher(self.transport, max_workers=max_workers,
+                                         rate_per_second=rate_per_second, max_retries=max_retries)
+            # El mensaje (con el PDF en base64) se arma en el hilo que lo envía
+            results = dispatcher.dispatch(jobs, build=lambda job: self._build_message(**job))
+        
+        sent = sum(1 for result in results if result['ok'])
+        print(f"📧 Bulk send: {sent}/{len(jobs)} emails sent")
+        return [{'to_email': job.get('to_email'), **result} for job, result in zip(jobs, results)]
     
     def _create_email_html(self, client_name: str) -> str:
         """Crea el contenido HTML del email."""
@@ -273,7 +391,7 @@ class EmailSender:
     def send_test_email(self, to_email: str) -> bool:
         """Envía un email de prueba."""
         
-        if not self.sg:
+        if not self.transport:
             print("⚠️  SendGrid API key not configured.")
             return False
         
@@ -284,11 +402,9 @@ class EmailSender:
             html_content='<p>This is a test email. Your SendGrid configuration is working correctly! ✅</p>'
         )
         
-        try:
-            response = self.sg.send(message)
-            print(f"✅ Test email sent! Status code: {response.status_code}")
-            return True
-        except Exception as e:
-            print(f"❌ Error sending test email: {e}")
-            return False
-
+        result = EmailDispatcher(self.transport, max_workers=1, rate_per_second=None).send(message.get())
+        if result['ok']:
+            print(f"✅ Test email sent! Status code: {result['status']}")
+        else:
+            print(f"❌ Error sending test email: {result['error']}")
+        return result['ok']
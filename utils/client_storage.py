@@ -0,0 +1,583 @@
+"""
+Backends de almacenamiento de clientes e histórico de reportes para ClientManager.
+- JSONClientStorage: los clientes en el archivo JSON de siempre y el histórico
+  en un log append-only por cliente (ver report_log).
+- SQLiteClientStorage: SQLite embebido con índices por id y email, y una
+  transacción por fila escrita. Importa una sola vez el `clients_data.json`
+  existente.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .file_lock import FileLock, atomic_write, file_stamp
+from .report_log import ReportLog, RetentionPolicy
+
+
+# Columnas fijas de un cliente; el resto de sus campos va en `extra` (JSON)
+CLIENT_FIELDS = ('name', 'email', 'company', 'brand_color', 'created_at')
+
+
+def history_dir_for(data_file: str) -> str:
+    """Carpeta del log de reportes de un JSON de clientes (`clients_data_history/`)."""
+    return os.path.splitext(data_file)[0] + '_history'
+
+
+class ClientStorage:
+    """Interfaz de un backend de clientes. Los clientes son dicts con `id` y `reports`."""
+    
+    def all_clients(self) -> List[Dict]:
+        raise NotImplementedError
+    
+    def get(self, client_id: int) -> Optional[Dict]:
+        raise NotImplementedError
+    
+    def get_by_email(self, email: str) -> Optional[Dict]:
+        raise NotImplementedError
+    
+    def insert(self, client: Dict) -> Dict:
+        """Guarda un cliente nuevo y lo devuelve con su `id` asignado."""
+        raise NotImplementedError
+    
+    def insert_many(self, clients: List[Dict]) -> List[Dict]:
+        """Guarda varios clientes nuevos en una sola escritura; los devuelve con sus `id`."""
+        return [self.insert(client) for client in clients]
+    
+    def update(self, client_id: int, fields: Dict) -> Optional[Dict]:
+        raise NotImplementedError
+    
+    def delete(self, client_id: int) -> bool:
+        raise NotImplementedError
+    
+    def add_report(self, client_id: int, report: Dict) -> Optional[Dict]:
+        raise NotImplementedError
+    
+    def reports(self, client_id: int) -> List[Dict]:
+        raise NotImplementedError
+    
+    def list_clients(self) -> List[Dict]:
+        """Clientes sin histórico, con sus contadores `report_count` y `last_report_at`."""
+        raise NotImplementedError
+    
+    def report_stats(self, client_id: int) -> Dict:
+        """Contadores de un cliente: `report_count` y `last_report_at`."""
+        raise NotImplementedError
+    
+    def totals(self) -> Dict:
+        """Contadores globales: `clients`, `reports` y `last_report_at`."""
+        raise NotImplementedError
+    
+    def report_page(self, client_id: int, offset: int, limit: int) -> List[Dict]:
+        """Reportes del cliente del más nuevo al más viejo, salteando `offset`."""
+        raise NotImplementedError
+    
+    def compact_history(self, policy: RetentionPolicy, now: Optional[datetime] = None) -> int:
+        """Aplica `policy` al histórico de todos los clientes. Devuelve cuántos reportes quitó."""
+        raise NotImplementedError
+    
+    def history_compacted_at(self) -> Optional[datetime]:
+        """Fecha de la última compactación del histórico (None si nunca)."""
+        raise NotImplementedError
+    
+    def close(self):
+        pass
+
+
+class JSONClientStorage(ClientStorage):
+    """Clientes en un archivo JSON y su histórico en un ReportLog al lado.
+
+    Guardar un reporte agrega una línea al log del cliente, sin reescribir el
+    JSON, y el histórico se lee recién cuando se pide. Un JSON anterior, con
+    los reportes adentro de cada cliente, se pasa al log la primera vez que se abre.
+    
+    Seguro entre procesos: las escrituras toman un lock sobre `<data_file>.lock`,
+    releen el JSON si otro proceso lo cambió y lo reemplazan de forma atómica.
+    Las lecturas solo hacen un stat para ver si hay que recargar.
+    """
+    
+    def __init__(self, data_file: str = "clients_data.json", history_dir: Optional[str] = None):
+        self.data_file = data_file
+        self.history = ReportLog(history_dir or history_dir_for(data_file))
+        self._lock = FileLock(data_file + '.lock')
+        self._stamp = None
+        self.clients: List[Dict] = []
+        self._by_id: Dict[int, Dict] = {}
+        with self._lock:
+            self._refresh()
+    
+    def _refresh(self):
+        """Recarga el JSON si cambió desde la última lectura (lo escribió otro proceso)."""
+        stamp = file_stamp(self.data_file)
+        if stamp == self._stamp:
+            return
+        self.clients = self._load()
+        self._by_id = {client['id']: client for client in self.clients}
+        self._stamp = file_stamp(self.data_file)
+    
+    def _load(self) -> List[Dict]:
+        if not os.path.exists(self.data_file):
+            return []
+        try:
+            with open(self.data_file, 'r') as f:
+                clients = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading clients from {self.data_file}: {e}")
+            return []
+        
+        # Formato anterior: el histórico adentro de cada cliente
+        inline = [client for client in clients if 'reports' in client]
+        if inline:
+            with self._lock:
+                for client in inline:
+                    # Reemplaza el segmento entero: repetir la migración no duplica reportes
+                    self.history.write(client['id'], client.pop('reports') or [])
+                self.clients = clients
+                self._save()
+        return clients
+    
+    def _save(self):
+        atomic_write(self.data_file, json.dumps(self.clients, indent=2))
+        self._stamp = file_stamp(self.data_file)
+    
+    def _read(self):
+        # Sin lock si nada cambió: el JSON solo se reemplaza entero (rename atómico)
+        if file_stamp(self.data_file) != self._stamp:
+            with self._lock:
+                self._refresh()
+    
+    def _with_reports(self, client: Optional[Dict]) -> Optional[Dict]:
+        if client is None:
+            return None
+        return {**client, 'reports': self.history.read(client['id'])}
+    
+    def all_clients(self) -> List[Dict]:
+        self._read()
+        return [self._with_reports(client) for client in self.clients]
+    
+    def get(self, client_id: int) -> Optional[Dict]:
+        self._read()
+        return self._with_reports(self._by_id.get(client_id))
+    
+    def get_by_email(self, email: str) -> Optional[Dict]:
+        self._read()
+        email = email.lower()
+        for client in self.clients:
+            if client['email'].lower() == email:
+                return self._with_reports(client)
+        return None
+    
+    def insert(self, client: Dict) -> Dict:
+        client = {k: v for k, v in client.items() if k != 'reports'}
+        with self._lock:
+            self._refresh()
+            client['id'] = max(self._by_id, default=0) + 1
+            self.clients.append(client)
+            self._by_id[client['id']] = client
+            self._save()
+        return {**client, 'reports': []}
+    
+    def insert_many(self, clients: List[Dict]) -> List[Dict]:
+        clients = [{k: v for k, v in client.items() if k != 'reports'} for client in clients]
+        with self._lock:
+            # Ids a partir del máximo actual, bajo el lock: otro proceso no puede tomar los mismos
+            self._refresh()
+            next_id = max(self._by_id, default=0) + 1
+            for offset, client in enumerate(clients):
+                client['id'] = next_id + offset
+                self._by_id[client['id']] = client
+            self.clients.extend(clients)
+            self._save()
+        return [{**client, 'reports': []} for client in clients]
+    
+    def update(self, client_id: int, fields: Dict) -> Optional[Dict]:
+        with self._lock:
+            self._refresh()
+            client = self._by_id.get(client_id)
+            if client is None:
+                return None
+            client.update({k: v for k, v in fields.items() if k != 'reports'})
+            self._save()
+        return self._with_reports(client)
+    
+    def delete(self, client_id: int) -> bool:
+        with self._lock:
+            self._refresh()
+            self.clients = [c for c in self.clients if c['id'] != client_id]
+            self._by_id.pop(client_id, None)
+            self._save()
+            self.history.delete(client_id)
+        return True
+    
+    def add_report(self, client_id: int, report: Dict) -> Optional[Dict]:
+        self._read()
+        if client_id not in self._by_id:
+            return None
+        self.history.append(client_id, report)
+        return report
+    
+    def reports(self, client_id: int) -> List[Dict]:
+        return self.history.read(client_id)
+    
+    def list_clients(self) -> List[Dict]:
+        self._read()
+        return [{**client, **self.history.stats(client['id'])} for client in self.clients]
+    
+    def report_stats(self, client_id: int) -> Dict:
+        return self.history.stats(client_id)
+    
+    def totals(self) -> Dict:
+        clients = self.list_clients()
+        dates = [client['last_report_at'] for client in clients if client['last_report_at']]
+        return {
+            'clients': len(clients),
+            'reports': sum(client['report_count'] for client in clients),
+            'last_report_at': max(dates, default=None)
+        }
+    
+    def report_page(self, client_id: int, offset: int, limit: int) -> List[Dict]:
+        return self.history.tail(client_id, offset, limit)
+    
+    def compact_history(self, policy: RetentionPolicy, now: Optional[datetime] = None) -> int:
+        return self.history.compact(policy, now)
+    
+    def history_compacted_at(self) -> Optional[datetime]:
+        return self.history.compacted_at()
+
+
+class SQLiteClientStorage(ClientStorage):
+    """Clientes y reportes en SQLite, con índices por id y email (sin distinguir mayúsculas).
+
+    Si `migrate_from` apunta a un JSON de JSONClientStorage y la base todavía
+    no lo importó, lo importa en una transacción (el JSON queda intacto como backup).
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS clients (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL,
+            email_key TEXT NOT NULL,
+            company TEXT,
+            brand_color TEXT,
+            created_at TEXT,
+            extra TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE INDEX IF NOT EXISTS idx_clients_email ON clients (email_key);
+        CREATE TABLE IF NOT EXISTS reports (
+            id INTEGER PRIMARY KEY,
+            client_id INTEGER NOT NULL REFERENCES clients (id) ON DELETE CASCADE,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_reports_client ON reports (client_id, id);
+        CREATE TABLE IF NOT EXISTS report_stats (
+            client_id INTEGER PRIMARY KEY REFERENCES clients (id) ON DELETE CASCADE,
+            report_count INTEGER NOT NULL,
+            last_report_at TEXT
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+    
+    def __init__(self, db_path: str = "clients_data.db", migrate_from: Optional[str] = None):
+        self.db_path = db_path
+        # Streamlit corre cada sesión en su hilo: una conexión compartida con lock
+        self._lock = threading.RLock()
+        # Otro proceso puede estar escribiendo: espera el lock de SQLite en vez de fallar
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        # Lecturas completas cacheadas hasta que alguien escriba (este proceso u otro)
+        self._cache: Dict[str, Any] = {}
+        self._cache_version = None
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            if db_path != ':memory:':
+                self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript(self.SCHEMA)
+            # Bases anteriores a report_stats: se calculan una vez
+            if (self._conn.execute("SELECT 1 FROM reports LIMIT 1").fetchone()
+                    and not self._conn.execute("SELECT 1 FROM report_stats LIMIT 1").fetchone()):
+                with self._transaction():
+                    self._recount([row[0] for row in self._conn.execute("SELECT DISTINCT client_id FROM reports")])
+        if migrate_from:
+            self.migrate_json(migrate_from)
+    
+    @staticmethod
+    def _row_values(client: Dict) -> Dict[str, Any]:
+        extra = {k: v for k, v in client.items() if k not in CLIENT_FIELDS and k not in ('id', 'reports')}
+        values = {field: client.get(field) for field in CLIENT_FIELDS}
+        values['name'] = values['name'] or ''
+        values['email'] = values['email'] or ''
+        values['email_key'] = values['email'].lower()
+        values['extra'] = json.dumps(extra)
+        return values
+    
+    @staticmethod
+    def _client(row: sqlite3.Row, reports: Optional[List[Dict]]) -> Dict:
+        client = {'id': row['id']}
+        client.update({field: row[field] for field in CLIENT_FIELDS if row[field] is not None})
+        client.update(json.loads(row['extra']))
+        if reports is not None:
+            client['reports'] = reports
+        return client
+    
+    def _fetch(self, where: str, params: tuple) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT * FROM clients WHERE {where} ORDER BY id LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            return self._client(row, self.reports(row['id']))
+    
+    @contextmanager
+    def _transaction(self, immediate: bool = False):
+        """Transacción de escritura; invalida las lecturas cacheadas.
+
+        Con `immediate` toma el lock de escritura de la base desde el inicio
+        (BEGIN IMMEDIATE): lo que se lea adentro no cambia hasta el commit,
+        aunque otro proceso quiera escribir.
+        """
+        with self._lock, self._conn:
+            if immediate:
+                self._conn.execute("BEGIN IMMEDIATE")
+            yield
+            self._cache = {}
+    
+    def _cached(self, name: str, compute):
+        """Resultado de `compute()` cacheado hasta la próxima escritura."""
+        with self._lock:
+            # data_version cambia cuando otra conexión (otro proceso) hace commit
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._cache_version:
+                self._cache = {}
+                self._cache_version = version
+            if name not in self._cache:
+                self._cache[name] = compute()
+            return self._cache[name]
+    
+    def _recount(self, client_ids: List[int]):
+        """Recalcula report_stats de esos clientes desde la tabla reports (dentro de una transacción)."""
+        for client_id in client_ids:
+            count = self._conn.execute("SELECT COUNT(*) FROM reports WHERE client_id = ?", (client_id,)).fetchone()[0]
+            last = self._conn.execute(
+                "SELECT data FROM reports WHERE client_id = ? ORDER BY id DESC LIMIT 1", (client_id,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO report_stats (client_id, report_count, last_report_at) VALUES (?, ?, ?)",
+                (client_id, count, json.loads(last[0]).get('date') if last else None)
+            )
+    
+    def all_clients(self) -> List[Dict]:
+        def compute():
+            rows = self._conn.execute("SELECT * FROM clients ORDER BY id").fetchall()
+            reports: Dict[int, List[Dict]] = {}
+            for client_id, data in self._conn.execute("SELECT client_id, data FROM reports ORDER BY id"):
+                reports.setdefault(client_id, []).append(json.loads(data))
+            return [self._client(row, reports.get(row['id'], [])) for row in rows]
+        
+        return self._cached('all_clients', compute)
+    
+    def list_clients(self) -> List[Dict]:
+        def compute():
+            rows = self._conn.execute(
+                "SELECT clients.*, COALESCE(s.report_count, 0) AS report_count, s.last_report_at "
+                "FROM clients LEFT JOIN report_stats s ON s.client_id = clients.id ORDER BY clients.id"
+            ).fetchall()
+            return [
+                {**self._client(row, None), 'report_count': row['report_count'], 'last_report_at': row['last_report_at']}
+                for row in rows
+            ]
+        
+        return self._cached('list_clients', compute)
+    
+    def report_stats(self, client_id: int) -> Dict:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT report_count, last_report_at FROM report_stats WHERE client_id = ?", (client_id,)
+            ).fetchone()
+        if row is None:
+            return {'report_count': 0, 'last_report_at': None}
+        return {'report_count': row['report_count'], 'last_report_at': row['last_report_at']}
+    
+    def totals(self) -> Dict:
+        with self._lock:
+            clients = self._conn.execute("SELECT COUNT(*) FROM clients").fetchone()[0]
+            reports, last = self._conn.execute(
+                "SELECT COALESCE(SUM(report_count), 0), MAX(last_report_at) FROM report_stats"
+            ).fetchone()
+        return {'clients': clients, 'reports': reports, 'last_report_at': last}
+    
+    def report_page(self, client_id: int, offset: int, limit: int) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM reports WHERE client_id = ? ORDER BY id DESC LIMIT ? OFFSET ?",
+                (client_id, limit, offset)
+            ).fetchall()
+        return [json.loads(data) for data, in rows]
+    
+    def get(self, client_id: int) -> Optional[Dict]:
+        return self._fetch("id = ?", (client_id,))
+    
+    def get_by_email(self, email: str) -> Optional[Dict]:
+        return self._fetch("email_key = ?", (email.lower(),))
+    
+    def _insert_row(self, client: Dict) -> Dict:
+        values = self._row_values(client)
+        columns = ', '.join(values)
+        placeholders = ', '.join('?' * len(values))
+        cursor = self._conn.execute(f"INSERT INTO clients ({columns}) VALUES ({placeholders})",
+                                    tuple(values.values()))
+        return {**client, 'id': cursor.lastrowid, 'reports': []}
+    
+    def insert(self, client: Dict) -> Dict:
+        with self._transaction():
+            return self._insert_row(client)
+    
+    def insert_many(self, clients: List[Dict]) -> List[Dict]:
+        # Una transacción (un commit) para todos; SQLite asigna los ids
+        with self._transaction():
+            return [self._insert_row(client) for client in clients]
+    
+    def update(self, client_id: int, fields: Dict) -> Optional[Dict]:
+        with self._transaction():
+            client = self.get(client_id)
+            if client is None:
+                return None
+            client.update(fields)
+            values = self._row_values(client)
+            assignments = ', '.join(f"{column} = ?" for column in values)
+            self._conn.execute(f"UPDATE clients SET {assignments} WHERE id = ?", (*values.values(), client_id))
+        return client
+    
+    def delete(self, client_id: int) -> bool:
+        with self._transaction():
+            self._conn.execute("DELETE FROM clients WHERE id = ?", (client_id,))
+        return True
+    
+    def add_report(self, client_id: int, report: Dict) -> Optional[Dict]:
+        with self._transaction():
+            if self._conn.execute("SELECT 1 FROM clients WHERE id = ?", (client_id,)).fetchone() is None:
+                return None
+            self._conn.execute("INSERT INTO reports (client_id, data) VALUES (?, ?)",
+                               (client_id, json.dumps(report)))
+            # Contadores en la misma transacción que el reporte
+            self._conn.execute(
+                "INSERT INTO report_stats (client_id, report_count, last_report_at) VALUES (?, 1, ?) "
+                "ON CONFLICT (client_id) DO UPDATE SET report_count = report_count + 1, "
+                "last_report_at = excluded.last_report_at",
+                (client_id, report.get('date'))
+            )
+        return report
+    
+    def reports(self, client_id: int) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM reports WHERE client_id = ? ORDER BY id", (client_id,)
+            ).fetchall()
+        return [json.loads(data) for data, in rows]
+    
+    def compact_history(self, policy: RetentionPolicy, now: Optional[datetime] = None) -> int:
+        removed = 0
+        with self._lock:
+            client_ids = [row[0] for row in self._conn.execute("SELECT DISTINCT client_id FROM reports")]
+            for client_id in client_ids:
+                rows = self._conn.execute(
+                    "SELECT id, data FROM reports WHERE client_id = ? ORDER BY id", (client_id,)
+                ).fetchall()
+                reports = [json.loads(data) for _, data in rows]
+                kept = {id(report) for report in policy.apply(reports, now)}
+                dropped = [(row_id,) for (row_id, _), report in zip(rows, reports) if id(report) not in kept]
+                if dropped:
+                    with self._transaction():
+                        self._conn.executemany("DELETE FROM reports WHERE id = ?", dropped)
+                        self._recount([client_id])
+                    removed += len(dropped)
+            with self._transaction():
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('history_compacted_at', ?)",
+                                   ((now or datetime.now()).isoformat(),))
+        return removed
+    
+    def history_compacted_at(self) -> Optional[datetime]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'history_compacted_at'").fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+    
+    def migrate_json(self, json_path: str) -> int:
+        """Importa los clientes de un JSON de JSONClientStorage. Devuelve cuántos importó."""
+        if not os.path.exists(json_path):
+            return 0
+        if self._migrated():
+            return 0
+        
+        # Lectura directa: el JSON queda intacto como backup
+        try:
+            with open(json_path, 'r') as f:
+                clients = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading clients from {json_path}: {e}")
+            return 0
+        history = ReportLog(history_dir_for(json_path)) if os.path.isdir(history_dir_for(json_path)) else None
+        
+        # Varios procesos pueden arrancar a la vez: se vuelve a verificar con el lock de escritura tomado
+        with self._transaction(immediate=True):
+            if self._migrated():
+                return 0
+            for client in clients:
+                values = self._row_values(client)
+                # Los ids del JSON se conservan; si alguno se repite, el duplicado recibe uno nuevo
+                taken = self._conn.execute("SELECT 1 FROM clients WHERE id = ?", (client.get('id'),)).fetchone()
+                if client.get('id') is not None and not taken:
+                    values = {'id': client['id'], **values}
+                elif client.get('id') is not None:
+                    print(f"Warning: duplicate client id {client['id']} in {json_path}, assigning a new one")
+                columns = ', '.join(values)
+                placeholders = ', '.join('?' * len(values))
+                cursor = self._conn.execute(f"INSERT INTO clients ({columns}) VALUES ({placeholders})",
+                                            tuple(values.values()))
+                self._conn.executemany(
+                    "INSERT INTO reports (client_id, data) VALUES (?, ?)",
+                    [(cursor.lastrowid, json.dumps(report)) for report in self._json_reports(client, history)]
+                )
+                self._recount([cursor.lastrowid])
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_from', ?)",
+                               (os.path.abspath(json_path),))
+        print(f"Migrated {len(clients)} clients from {json_path} to {self.db_path}")
+        return len(clients)
+    
+    def _migrated(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from'").fetchone() is not None
+    
+    @staticmethod
+    def _json_reports(client: Dict, history: Optional[ReportLog]) -> List[Dict]:
+        """Histórico de un cliente del JSON: adentro del cliente o en su log (JSONClientStorage)."""
+        if 'reports' in client:
+            return client['reports'] or []
+        return history.read(client['id']) if history and client.get('id') is not None else []
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_client_storage(data_file: str = "clients_data.json", backend: Optional[str] = None) -> ClientStorage:
+    """Backend según `backend` o AUTOREPORT_CLIENT_STORAGE ('sqlite' por defecto, o 'json').
+
+    Con SQLite la base va junto a `data_file` (mismo nombre, extensión .db) y
+    el JSON existente se importa la primera vez.
+    """
+    backend = (backend or os.getenv('AUTOREPORT_CLIENT_STORAGE', 'sqlite')).lower()
+    if backend == 'json':
+        return JSONClientStorage(data_file)
+    if backend != 'sqlite':
+        raise ValueError(f"Unknown client storage backend: {backend}")
+    
+    root, ext = os.path.splitext(data_file)
+    if ext == '.db':
+        return SQLiteClientStorage(data_file)
+    return SQLiteClientStorage(root + '.db', migrate_from=data_file)
@@ -0,0 +1,132 @@
+"""
+Perfilado de columnas a partir de una muestra acotada.
+Calcula ratio de nulos, cardinalidad, tasas de parseo y min/max por columna
+y decide el tipo de cada una con un puntaje de confianza.
+"""
+
+import warnings
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .numeric_cleaning import numeric_parse_rate
+
+
+DATE_KEYWORDS = ['date', 'time', 'day', 'month', 'year', 'fecha']
+
+
+def parse_dates(series: pd.Series) -> pd.Series:
+    """Convierte a fechas; los valores que no parsean quedan como NaT."""
+    with warnings.catch_warnings():
+        # "Could not infer format": esperado en columnas que no son fechas
+        warnings.simplefilter('ignore', UserWarning)
+        try:
+            return pd.to_datetime(series, errors='coerce')
+        except (TypeError, ValueError, OverflowError):
+            return pd.Series(pd.NaT, index=series.index)
+
+
+class ColumnProfiler:
+    """Construye perfiles de columnas sobre una muestra de filas compartida."""
+    
+    # Tasa mínima de parseo para aceptar una conversión
+    NUMERIC_THRESHOLD = 0.95
+    DATE_THRESHOLD = 0.9
+    # Sin palabra clave en el nombre, una fecha tiene que parsear casi siempre
+    UNNAMED_DATE_THRESHOLD = 0.99
+    DATE_PROBE_SIZE = 20
+    
+    def __init__(self, df: pd.DataFrame, sample_size: int = 10000, seed: int = 0):
+        self.df = df
+        self.sample_size = sample_size
+        if len(df) > sample_size:
+            # Las mismas filas para todas las columnas; ordenadas para leer en bloque
+            rng = np.random.default_rng(seed)
+            self.positions: Optional[np.ndarray] = np.sort(rng.choice(len(df), sample_size, replace=False))
+        else:
+            self.positions = None
+    
+    def sample(self, col: str) -> pd.Series:
+        """Muestra de la columna (la columna entera si es pequeña)."""
+        series = self.df[col]
+        return series if self.positions is None else series.iloc[self.positions]
+    
+    def profile(self, col: str) -> Dict[str, Any]:
+        """Perfil de una columna en una pasada sobre la muestra."""
+        sample = self.sample(col)
+        non_null = sample.dropna()
+        size = len(sample)
+        
+        profile = {
+            'dtype': str(self.df[col].dtype),
+            'rows': len(self.df),
+            'sample_size': size,
+            'null_ratio': float(1 - len(non_null) / size) if size else 1.0,
+            'cardinality': int(non_null.nunique()),
+            'distinct_ratio': 0.0,
+            'numeric_rate': 0.0,
+            'date_rate': 0.0,
+            'min': None,
+            'max': None
+        }
+        if len(non_null) == 0:
+            return profile
+        profile['distinct_ratio'] = profile['cardinality'] / len(non_null)
+        
+        if pd.api.types.is_datetime64_any_dtype(non_null):
+            profile['date_rate'] = 1.0
+            profile['min'], profile['max'] = non_null.min(), non_null.max()
+        elif pd.api.types.is_numeric_dtype(non_null):
+            profile['numeric_rate'] = 1.0
+            profile['min'], profile['max'] = non_null.min(), non_null.max()
+        elif pd.api.types.is_string_dtype(non_null) or pd.api.types.is_object_dtype(non_null):
+            profile['numeric_rate'], profile['decimal'], numeric = numeric_parse_rate(non_null)
+            
+            # Parsear fechas solo si el nombre lo sugiere o si no son números;
+            # sin palabra clave, una sonda pequeña descarta rápido los textos libres
+            dates = None
+            if self._has_date_keyword(col):
+                dates = parse_dates(non_null)
+            elif profile['numeric_rate'] < 0.5:
+                probe = parse_dates(non_null.head(self.DATE_PROBE_SIZE))
+                if probe.notna().mean() >= self.UNNAMED_DATE_THRESHOLD:
+                    dates = parse_dates(non_null)
+                else:
+                    profile['date_rate'] = float(probe.notna().mean())
+            if dates is not None:
+                profile['date_rate'] = float(dates.notna().mean())
+            
+            if profile['numeric_rate'] >= profile['date_rate'] and profile['numeric_rate'] > 0:
+                profile['min'], profile['max'] = numeric.min(), numeric.max()
+            elif dates is not None and profile['date_rate'] > 0:
+                profile['min'], profile['max'] = dates.min(), dates.max()
+        
+        return profile
+    
+    def decide(self, col: str, profile: Dict[str, Any]) -> Tuple[str, float]:
+        """Decide el tipo ('date', 'numeric', 'category', 'other') con su confianza."""
+        dtype = self.df[col].dtype
+        
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return 'date', 1.0
+        if pd.api.types.is_numeric_dtype(dtype):
+            return 'numeric', 1.0
+        if not (pd.api.types.is_string_dtype(dtype) or pd.api.types.is_object_dtype(dtype)):
+            return 'other', 1.0
+        
+        numeric_rate = profile['numeric_rate']
+        date_rate = profile['date_rate']
+        
+        if self._has_date_keyword(col) and date_rate >= self.DATE_THRESHOLD:
+            return 'date', date_rate
+        if numeric_rate >= self.NUMERIC_THRESHOLD:
+            return 'numeric', numeric_rate
+        if date_rate >= self.UNNAMED_DATE_THRESHOLD:
+            return 'date', date_rate
+        return 'category', 1.0 - max(numeric_rate, date_rate)
+    
+    @staticmethod
+    def _has_date_keyword(col: str) -> bool:
+        col_lower = str(col).lower()
+        return any(date_keyword in col_lower for date_keyword in DATE_KEYWORDS)
@@ -0,0 +1,172 @@
+"""
+Cubo de métricas multi-dimensión para DataAnalyzer.
+Un único groupby al grano más fino (todas las dimensiones a la vez) y luego
+rollups sobre esas celdas, que son muchas menos que las filas, para cada
+dimensión y cada par de dimensiones.
+"""
+
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+ROWS = '__rows'
+
+
+class MetricCube:
+    """Sumas y conteos por celda (combinación de dimensiones), con rollups materializados."""
+    
+    AGGREGATIONS = ('sum', 'count', 'mean', 'rows')
+    
+    def __init__(self, cells: pd.DataFrame, dimensions: List[str], measures: List[str],
+                 levels: Dict[str, pd.Index], rows: int = 0):
+        # `cells`: un código entero por dimensión (len(levels[dim]) = valor nulo),
+        # la suma y el conteo no nulo de cada medida y las filas de la celda
+        self.cells = cells
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.levels = levels
+        self.rows = rows
+        self._rollups: Dict[Tuple[str, ...], pd.DataFrame] = {}
+    
+    @classmethod
+    def build(cls, df: pd.DataFrame, dimensions: List[str], measures: List[str],
+              max_order: int = 2) -> 'MetricCube':
+        """Construye el cubo con un solo groupby y materializa los rollups hasta `max_order`."""
+        frame = {}
+        levels = {}
+        for dim in dimensions:
+            codes, uniques = pd.factorize(df[dim], sort=True)
+            # Los nulos van a una celda propia que se descarta al hacer slice
+            codes[codes < 0] = len(uniques)
+            frame[dim] = codes.astype(np.min_scalar_type(len(uniques)))
+            levels[dim] = pd.Index(uniques, name=dim)
+        
+        for measure in measures:
+            values = df[measure]
+            if not pd.api.types.is_numeric_dtype(values):
+                values = pd.to_numeric(values, errors='coerce')
+            frame[measure] = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        cube = cls(_aggregate_cells(pd.DataFrame(frame), dimensions, measures),
+                   dimensions, measures, levels, rows=len(df))
+        return cube.materialize(max_order)
+    
+    def views(self, max_order: int = 2) -> List[Tuple[str, ...]]:
+        """Combinaciones de dimensiones disponibles (simples y pares por defecto)."""
+        return [
+            dims
+            for order in range(1, min(max_order, len(self.dimensions)) + 1)
+            for dims in combinations(self.dimensions, order)
+        ]
+    
+    def materialize(self, max_order: int = 2) -> 'MetricCube':
+        """Calcula de antemano los rollups de todas las vistas."""
+        for dims in self.views(max_order):
+            self._rollup(dims)
+        return self
+    
+    def _rollup(self, dims: Tuple[str, ...]) -> pd.DataFrame:
+        if dims not in self._rollups:
+            cells = self.cells
+            valid = np.ones(len(cells), dtype=bool)
+            for dim in dims:
+                valid &= cells[dim].to_numpy() < len(self.levels[dim])
+            
+            value_cols = [col for col in cells.columns if col not in self.dimensions]
+            rollup = cells.loc[valid].groupby(list(dims), sort=True)[value_cols].sum()
+            
+            # Códigos -> etiquetas
+            if len(dims) == 1:
+                rollup.index = self.levels[dims[0]][rollup.index.to_numpy()]
+            else:
+                rollup.index = pd.MultiIndex.from_arrays(
+                    [self.levels[dim][rollup.index.get_level_values(dim).to_numpy()] for dim in dims]
+                )
+            self._rollups[dims] = rollup
+        return self._rollups[dims]
+    
+    def slice(self, dims, measure: Optional[str] = None, how: str = 'sum') -> pd.Series:
+        """Una métrica agregada por una o más dimensiones.
+
+        `how`: 'sum', 'count' (valores no nulos), 'mean' o 'rows' (filas).
+        """
+        if isinstance(dims, str):
+            dims = (dims,)
+        dims = tuple(dims)
+        if how not in self.AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation: {how}")
+        if how != 'rows' and measure not in self.measures:
+            raise KeyError(f"Unknown measure: {measure}")
+        
+        rollup = self._rollup(dims)
+        if how == 'rows':
+            result = rollup[ROWS]
+        elif how == 'count':
+            result = rollup[_count_col(measure)]
+        elif how == 'mean':
+            result = rollup[measure] / rollup[_count_col(measure)].where(rollup[_count_col(measure)] > 0)
+        else:
+            result = rollup[measure]
+        return result.rename(measure if how != 'rows' else ROWS)
+    
+    def top(self, dims, measure: str, n: int = 10, how: str = 'sum') -> pd.Series:
+        """Top-n celdas de una vista por valor descendente."""
+        return self.slice(dims, measure, how).sort_values(ascending=False, kind='stable').head(n)
+    
+    def merge(self, other: 'MetricCube') -> 'MetricCube':
+        """Combina otro cubo (mismas dimensiones y medidas), ej. el de otro chunk."""
+        if other.dimensions != self.dimensions or other.measures != self.measures:
+            raise ValueError("Cubes with different dimensions or measures cannot be merged")
+        
+        parts = []
+        levels = {}
+        for dim in self.dimensions:
+            levels[dim] = self.levels[dim].union(other.levels[dim])
+        
+        for cube in (self, other):
+            cells = cube.cells.copy()
+            for dim in self.dimensions:
+                # Recodifica al nuevo conjunto de etiquetas (el nulo pasa al final)
+                mapping = np.append(levels[dim].get_indexer(cube.levels[dim]), len(levels[dim]))
+                cells[dim] = mapping[cells[dim].to_numpy().astype(np.int64)]
+            parts.append(cells)
+        
+        combined = pd.concat(parts, ignore_index=True)
+        if self.dimensions:
+            combined = combined.groupby(self.dimensions, sort=False).sum().reset_index()
+        else:
+            combined = combined.sum().to_frame().T
+        
+        self.cells = combined
+        self.levels = levels
+        self.rows += other.rows
+        self._rollups = {}
+        return self
+    
+    @property
+    def nbytes(self) -> int:
+        """Memoria de las celdas y los rollups materializados."""
+        return int(self.cells.memory_usage(deep=True).sum() + sum(
+            rollup.memory_usage(deep=True).sum() for rollup in self._rollups.values()
+        ))
+
+
+def _count_col(measure: str) -> str:
+    return f"{measure}__count"
+
+
+def _aggregate_cells(frame: pd.DataFrame, dimensions: List[str], measures: List[str]) -> pd.DataFrame:
+    """El único groupby sobre las filas: suma y conteo de cada medida por celda."""
+    counts = frame[measures].notna()
+    counts.columns = [_count_col(measure) for measure in measures]
+    values = pd.concat([frame, counts], axis=1)
+    values[ROWS] = 1
+    
+    if not dimensions:
+        return values.sum().to_frame().T
+    
+    value_cols = [col for col in values.columns if col not in dimensions]
+    return values.groupby(dimensions, sort=False)[value_cols].sum().reset_index()
@@ -3,139 +3,319 @@ Módulo para análisis automático de datos de cualquier empresa.
 Detecta tipos de columnas y genera métricas inteligentes.
 """
 
+import io
+import re
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+
+from .aggregation import AggregationPlan
+from .dataset_cache import DatasetCache, get_dataset_cache
+from .downsampling import downsample_series
+from .column_profiler import ColumnProfiler, parse_dates
+from .cube import MetricCube
+from .numeric_cleaning import clean_numeric
+from .period_comparison import PeriodComparator
+from .result_cache import ResultCache, dataframe_fingerprint, get_shared_cache
 
 
 class DataAnalyzer:
     """Analiza CSVs automáticamente y detecta tipos de datos."""
     
-    def __init__(self, df: pd.DataFrame):
+    # Dimensiones del cubo: categorías con pocos valores distintos (no IDs ni nombres libres)
+    MAX_CUBE_CARDINALITY = 1000
+    # Vistas del cubo que van al PDF: pocas y de dimensiones legibles (el resto queda en la UI)
+    MAX_REPORT_BREAKDOWNS = 3
+    MAX_BREAKDOWN_CARDINALITY = 50
+    # Columnas con casi un valor por fila, o con nombre de identificador, no se desglosan en el PDF
+    MAX_BREAKDOWN_DISTINCT_RATIO = 0.5
+    ID_COLUMN_PATTERN = re.compile(r'(^|[_\s-])(id|uuid|guid|sku|code|codigo|email|e-?mail|phone)$|^id[_\s-]', re.I)
+    
+    def __init__(self, df: pd.DataFrame, cache: Optional[ResultCache] = None, sample_size: int = 10000,
+                 detected_columns: Optional[Dict[str, Any]] = None, fingerprint: Optional[str] = None,
+                 chart_points: int = 2000):
         self.df = df
-        self.detected_columns = self._detect_columns()
+        self.sample_size = sample_size
+        # Presupuesto de puntos del line chart (LTTB); 0 o None = resolución completa
+        self.chart_points = chart_points
+        # Un esquema ya detectado (ej. desde DatasetCache) evita repetir la detección
+        self.detected_columns = detected_columns if detected_columns is not None else self._detect_columns()
+        self.cache = cache if cache is not None else get_shared_cache()
+        self._plan: Optional[AggregationPlan] = None
+        self._comparator: Optional[PeriodComparator] = None
+        self._fingerprint: Optional[str] = fingerprint
+        self._results: Dict[str, Any] = {}
+    
+    @classmethod
+    def from_upload(cls, data: bytes, filename: str, dataset_cache: Optional[DatasetCache] = None,
+                    cache: Optional[ResultCache] = None) -> 'DataAnalyzer':
+        """Crea un analyzer desde un archivo subido, usando la caché columnar si existe."""
+        dataset_cache = dataset_cache if dataset_cache is not None else get_dataset_cache()
+        key = dataset_cache.key_for(data)
+        # El hash del archivo identifica contenido y esquema: no hace falta hashear el DataFrame
+        fingerprint = f"file:{key}"
+        
+        cached = dataset_cache.load(key)
+        if cached is not None:
+            df, detected_columns = cached
+            return cls(df, cache=cache, detected_columns=detected_columns, fingerprint=fingerprint)
+        
+        if filename.endswith('.csv'):
+            df = pd.read_csv(io.BytesIO(data))
+        else:
+            df = pd.read_excel(io.BytesIO(data))
+        
+        analyzer = cls(df, cache=cache, fingerprint=fingerprint)
+        dataset_cache.store(key, analyzer.df, analyzer.detected_columns, name=filename)
+        return analyzer
     
     def _detect_columns(self) -> Dict[str, Any]:
-        """Detecta automáticamente tipo de dato y genera métricas."""
+        """Detecta tipos a partir de perfiles de una muestra y convierte al final."""
         results = {
             'numeric': [],
             'dates': [],
             'categories': [],
             'metrics': {},
-            'column_info': {}
+            'column_info': {},
+            'profiles': {},
+            'confidence': {},
+            'conversions': {},
+            'cleaning': {}
         }
         
+        profiler = ColumnProfiler(self.df, sample_size=self.sample_size)
+        conversions = results['conversions']
+        
         for col in self.df.columns:
-            col_lower = col.lower()
+            profile = profiler.profile(col)
+            kind, confidence = profiler.decide(col, profile)
+            results['profiles'][col] = profile
+            results['confidence'][col] = confidence
             
-            # Detecta fechas
-            if pd.api.types.is_datetime64_any_dtype(self.df[col]):
+            # Fechas
+            if kind == 'date':
                 results['dates'].append(col)
                 results['column_info'][col] = 'date'
-            elif any(date_keyword in col_lower for date_keyword in ['date', 'time', 'day', 'month', 'year', 'fecha']):
-                try:
-                    self.df[col] = pd.to_datetime(self.df[col])
-                    results['dates'].append(col)
-                    results['column_info'][col] = 'date'
-                except:
-                    pass
+                if not pd.api.types.is_datetime64_any_dtype(self.df[col]):
+                    conversions[col] = 'date'
             
-            # Detecta numéricos
-            if pd.api.types.is_numeric_dtype(self.df[col]):
+            # Numéricos (incluye strings numéricos como "$1,200")
+            elif kind == 'numeric':
                 results['numeric'].append(col)
-                
-                # ¿Es dinero?
-                if any(keyword in col_lower for keyword in ['revenue', 'price', 'cost', 'sales', 'total', 'amount', 'ingreso', 'venta', 'precio']):
-                    results['metrics'][col] = 'currency'
-                    results['column_info'][col] = 'currency'
-                
-                # ¿Es porcentaje?
-                elif any(keyword in col_lower for keyword in ['rate', 'percent', '%', 'pct', 'ratio', 'tasa', 'porcentaje']):
-                    results['metrics'][col] = 'percentage'
-                    results['column_info'][col] = 'percentage'
-                
-                # ¿Es cantidad?
-                elif any(keyword in col_lower for keyword in ['quantity', 'count', 'orders', 'units', 'cantidad', 'pedidos']):
-                    results['metrics'][col] = 'count'
-                    results['column_info'][col] = 'count'
-                
-                # Default: número
-                else:
-                    results['metrics'][col] = 'number'
-                    results['column_info'][col] = 'number'
+                metric_type = self._metric_type(col)
+                results['metrics'][col] = metric_type
+                results['column_info'][col] = metric_type
+                if not pd.api.types.is_numeric_dtype(self.df[col]):
+                    conversions[col] = 'numeric'
             
-            # Check if it's a numeric string that needs conversion
-            elif self._is_numeric_string(col):
-                try:
-                    # Convert to numeric, coercing errors to NaN
-                    self.df[col] = pd.to_numeric(
-                        self.df[col].astype(str).str.replace(',', '').str.replace('$', '').str.replace('%', ''),
-                        errors='coerce'
-                    )
-                    results['numeric'].append(col)
-                    
-                    # ¿Es dinero?
-                    if any(keyword in col_lower for keyword in ['revenue', 'price', 'cost', 'sales', 'total', 'amount', 'ingreso', 'venta', 'precio']):
-                        results['metrics'][col] = 'currency'
-                        results['column_info'][col] = 'currency'
-                    
-                    # ¿Es porcentaje?
-                    elif any(keyword in col_lower for keyword in ['rate', 'percent', '%', 'pct', 'ratio', 'tasa', 'porcentaje']):
-                        results['metrics'][col] = 'percentage'
-                        results['column_info'][col] = 'percentage'
-                    
-                    # ¿Es cantidad?
-                    elif any(keyword in col_lower for keyword in ['quantity', 'count', 'orders', 'units', 'cantidad', 'pedidos']):
-                        results['metrics'][col] = 'count'
-                        results['column_info'][col] = 'count'
-                    
-                    # Default: número
-                    else:
-                        results['metrics'][col] = 'number'
-                        results['column_info'][col] = 'number'
-                except:
-                    # If conversion fails, treat as category
-                    results['categories'].append(col)
-                    results['column_info'][col] = 'category'
-            
-            # Detecta categorías
-            elif pd.api.types.is_string_dtype(self.df[col]) or pd.api.types.is_object_dtype(self.df[col]):
-                if col not in results['dates']:  # No es fecha
-                    results['categories'].append(col)
-                    results['column_info'][col] = 'category'
+            # Categorías
+            elif kind == 'category':
+                results['categories'].append(col)
+                results['column_info'][col] = 'category'
+        
+        # Una sola conversión por columna aceptada, sobre la columna completa
+        results['cleaning'] = self._apply_conversions(self.df, results)
         
         return results
     
-    def _is_numeric_string(self, col: str) -> bool:
-        """Detecta si una columna de strings contiene números."""
-        try:
-            sample = self.df[col].dropna().head(10)
-            if len(sample) == 0:
-                return False
-            
-            # Intenta convertir a numérico
-            pd.to_numeric(sample.astype(str).str.replace(',', '').str.replace('$', '').str.replace('%', ''))
-            return True
-        except:
-            return False
+    @staticmethod
+    def _apply_conversions(df: pd.DataFrame, detected: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Convierte in-place las columnas aceptadas; devuelve el reporte de limpieza numérica."""
+        reports = {}
+        for col, kind in detected['conversions'].items():
+            if kind == 'date':
+                df[col] = parse_dates(df[col])
+            else:
+                profile = detected['profiles'][col]
+                df[col], reports[col] = clean_numeric(
+                    df[col],
+                    decimal=profile.get('decimal'),
+                    distinct_ratio=profile['distinct_ratio']
+                )
+        return reports
     
-    def get_key_metrics(self) -> Dict[str, Any]:
-        """Genera métricas clave automáticamente."""
-        metrics = {}
+    @staticmethod
+    def _metric_type(col: str) -> str:
+        """Clasifica una columna numérica según su nombre."""
+        col_lower = col.lower()
         
-        # Encuentra columnas principales
+        # ¿Es dinero?
+        if any(keyword in col_lower for keyword in ['revenue', 'price', 'cost', 'sales', 'total', 'amount', 'ingreso', 'venta', 'precio']):
+            return 'currency'
+        
+        # ¿Es porcentaje?
+        if any(keyword in col_lower for keyword in ['rate', 'percent', '%', 'pct', 'ratio', 'tasa', 'porcentaje']):
+            return 'percentage'
+        
+        # ¿Es cantidad?
+        if any(keyword in col_lower for keyword in ['quantity', 'count', 'orders', 'units', 'cantidad', 'pedidos']):
+            return 'count'
+        
+        # Default: número
+        return 'number'
+    
+    @property
+    def fingerprint(self) -> Optional[str]:
+        """Fingerprint del contenido + esquema detectado (se calcula una vez)."""
+        if self._fingerprint is None:
+            schema = {key: self.detected_columns[key] for key in ('numeric', 'dates', 'categories', 'metrics')}
+            self._fingerprint = dataframe_fingerprint(self.df, schema)
+        return self._fingerprint
+    
+    def _cached(self, name: str, compute):
+        """Memoiza un resultado en la instancia y en la caché compartida."""
+        if name not in self._results:
+            fingerprint = self.fingerprint
+            if fingerprint is None:
+                self._results[name] = compute()
+            else:
+                self._results[name] = self.cache.get_or_compute((fingerprint, name), compute)
+        return self._results[name]
+    
+    def _main_columns(self) -> Dict[str, Optional[str]]:
+        """Columnas principales que usan métricas, charts e insights."""
         revenue_cols = [col for col in self.detected_columns['numeric'] 
                        if self.detected_columns['metrics'].get(col) == 'currency']
         count_cols = [col for col in self.detected_columns['numeric'] 
                      if self.detected_columns['metrics'].get(col) == 'count']
-        date_cols = self.detected_columns['dates']
+        customer_cols = [col for col in self.detected_columns['categories'] 
+                        if any(keyword in col.lower() for keyword in ['customer', 'client', 'user', 'cliente', 'usuario'])]
+        
+        return {
+            'revenue': revenue_cols[0] if revenue_cols else None,
+            'count': count_cols[0] if count_cols else None,
+            'date': self.detected_columns['dates'][0] if self.detected_columns['dates'] else None,
+            'category': self.detected_columns['categories'][0] if self.detected_columns['categories'] else None,
+            'customer': customer_cols[0] if customer_cols else None
+        }
+    
+    def _plan_requests(self) -> List[Tuple[Optional[str], str, str]]:
+        """Agregaciones (by, value, how) que necesitan métricas, charts e insights."""
+        main = self._main_columns()
+        requests = []
+        
+        if main['revenue']:
+            requests.append((None, main['revenue'], 'sum'))
+            if main['date']:
+                # Compartido por line chart y growth
+                requests.append((main['date'], main['revenue'], 'sum'))
+            if main['category']:
+                # Compartido por pie chart, bar chart e insights
+                requests.append((main['category'], main['revenue'], 'sum'))
+        if main['count']:
+            requests.append((None, main['count'], 'sum'))
+        if main['customer']:
+            requests.append((None, main['customer'], 'nunique'))
+        
+        return requests
+    
+    def _get_plan(self) -> AggregationPlan:
+        """Construye (una sola vez) el plan con todas las agregaciones necesarias."""
+        if self._plan is None:
+            plan = AggregationPlan(self.df)
+            for by, value, how in self._plan_requests():
+                plan.add(by, value, how)
+            self._plan = plan.execute()
+        return self._plan
+    
+    def record_count(self) -> int:
+        """Número total de registros analizados."""
+        return len(self.df)
+    
+    def _cube_columns(self) -> Tuple[List[str], List[str]]:
+        """Dimensiones y medidas del cubo: todas las categorías y métricas sumables."""
+        detected = self.detected_columns
+        profiles = detected.get('profiles', {})
+        
+        dimensions = [
+            col for col in detected['categories']
+            if profiles.get(col, {}).get('cardinality', 0) <= self.MAX_CUBE_CARDINALITY
+        ]
+        # Los porcentajes no se suman: quedan fuera del cubo
+        measures = [col for col in detected['numeric'] if detected['metrics'].get(col) != 'percentage']
+        return dimensions, measures
+    
+    def get_cube(self) -> Optional[MetricCube]:
+        """Cubo de métricas × dimensiones y sus pares (cacheado por contenido)."""
+        return self._cached('cube', self._compute_cube)
+    
+    def _compute_cube(self) -> Optional[MetricCube]:
+        """Construye el cubo con un solo groupby sobre las filas."""
+        dimensions, measures = self._cube_columns()
+        if not (dimensions and measures):
+            return None
+        
+        try:
+            return MetricCube.build(self.df, dimensions, measures)
+        except Exception as e:
+            print(f"Error building metric cube: {e}")
+            return None
+    
+    def _breakdown_dimensions(self, cube: MetricCube) -> List[str]:
+        """Dimensiones del cubo aptas para el PDF: pocas categorías y sin columnas tipo ID."""
+        profiles = self.detected_columns.get('profiles', {})
+        dimensions = []
+        for dim in cube.dimensions:
+            profile = profiles.get(dim, {})
+            if (self.ID_COLUMN_PATTERN.search(str(dim))
+                    or profile.get('distinct_ratio', 0) > self.MAX_BREAKDOWN_DISTINCT_RATIO
+                    or len(cube.levels[dim]) > self.MAX_BREAKDOWN_CARDINALITY):
+                continue
+            dimensions.append(dim)
+        return dimensions
+    
+    def get_breakdowns(self, top_n: int = 10, max_views: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Top-n de la métrica principal en las vistas del cubo más legibles, para el PDF.
+
+        Solo dimensiones de pocas categorías (sin IDs ni columnas casi únicas);
+        primero las simples y luego los pares, de menor a mayor cantidad de
+        celdas, hasta `max_views` (por defecto MAX_REPORT_BREAKDOWNS). El cubo
+        completo queda disponible en `get_cube()` para explorarlo en la UI.
+        """
+        cube = self.get_cube()
+        main = self._main_columns()
+        measure = main['revenue'] or (cube.measures[0] if cube else None)
+        if cube is None or measure not in cube.measures:
+            return []
+        max_views = self.MAX_REPORT_BREAKDOWNS if max_views is None else max_views
+        
+        dimensions = self._breakdown_dimensions(cube)
+        views = [
+            dims for dims in cube.views()
+            # La vista principal ya está en el pie/bar chart
+            if all(dim in dimensions for dim in dims) and dims != (main['category'],)
+        ]
+        views.sort(key=lambda dims: (len(dims), int(np.prod([len(cube.levels[dim]) for dim in dims]))))
+        
+        breakdowns = []
+        for dims in views[:max_views]:
+            top = cube.top(dims, measure, n=top_n)
+            labels = [' / '.join(map(str, label)) if isinstance(label, tuple) else str(label)
+                      for label in top.index]
+            breakdowns.append({
+                'title': f"{measure} by {' × '.join(dims)}",
+                'dimensions': list(dims),
+                'measure': measure,
+                'labels': labels,
+                'values': top.tolist()
+            })
+        return breakdowns
+    
+    def get_key_metrics(self) -> Dict[str, Any]:
+        """Genera métricas clave automáticamente (cacheadas por contenido)."""
+        return self._cached('metrics', self._compute_key_metrics)
+    
+    def _compute_key_metrics(self) -> Dict[str, Any]:
+        """Calcula las métricas clave."""
+        metrics = {}
+        
+        main = self._main_columns()
+        plan = self._get_plan()
         
         # Revenue total
-        if revenue_cols:
-            main_revenue = revenue_cols[0]
+        if main['revenue']:
             try:
-                # Ensure column is numeric and handle NaN values
-                revenue_sum = pd.to_numeric(self.df[main_revenue], errors='coerce').sum()
+                revenue_sum = plan.result(None, main['revenue'])
                 metrics['total_revenue'] = {
                     'value': float(revenue_sum),
                     'label': 'Total Revenue',
@@ -143,27 +323,22 @@ class DataAnalyzer:
                 }
                 
                 # AOV (Average Order Value)
-                if count_cols:
-                    order_col = count_cols[0]
-                    try:
-                        total_orders = pd.to_numeric(self.df[order_col], errors='coerce').sum()
-                        if total_orders > 0:
-                            metrics['aov'] = {
-                                'value': float(revenue_sum / total_orders),
-                                'label': 'Average Order Value',
-                                'format': 'currency'
-                            }
-                    except:
-                        pass
+                if main['count']:
+                    total_orders = plan.result(None, main['count'])
+                    if total_orders > 0:
+                        metrics['aov'] = {
+                            'value': float(revenue_sum / total_orders),
+                            'label': 'Average Order Value',
+                            'format': 'currency'
+                        }
             except Exception as e:
                 print(f"Error calculating revenue metrics: {e}")
         
         # Total de órdenes/cantidad
-        if count_cols:
-            main_count = count_cols[0]
+        if main['count']:
+            main_count = main['count']
             try:
-                # Ensure column is numeric and handle NaN values
-                count_sum = pd.to_numeric(self.df[main_count], errors='coerce').sum()
+                count_sum = plan.result(None, main_count)
                 metrics['total_orders'] = {
                     'value': int(count_sum),
                     'label': f'Total {main_count.title()}',
@@ -174,47 +349,30 @@ class DataAnalyzer:
         
         # Total de registros
         metrics['total_records'] = {
-            'value': len(self.df),
+            'value': self.record_count(),
             'label': 'Total Records',
             'format': 'number'
         }
         
         # Clientes únicos (si hay columna de cliente)
-        customer_cols = [col for col in self.detected_columns['categories'] 
-                        if any(keyword in col.lower() for keyword in ['customer', 'client', 'user', 'cliente', 'usuario'])]
-        if customer_cols:
+        if main['customer']:
             try:
                 metrics['unique_customers'] = {
-                    'value': int(self.df[customer_cols[0]].nunique()),
+                    'value': int(plan.result(None, main['customer'], 'nunique')),
                     'label': 'Unique Customers',
                     'format': 'number'
                 }
-            except:
-                pass
+            except Exception as e:
+                print(f"Error calculating unique customers: {e}")
         
-        # Growth (si hay fechas)
-        if date_cols and revenue_cols:
-            date_col = date_cols[0]
-            revenue_col = revenue_cols[0]
-            
+        # Growth (si hay fechas): últimos 7 días vs 7 días anteriores
+        comparator = self.get_period_comparator()
+        if comparator is not None:
             try:
-                df_sorted = self.df.copy()
-                df_sorted[date_col] = pd.to_datetime(df_sorted[date_col])
-                df_sorted[revenue_col] = pd.to_numeric(df_sorted[revenue_col], errors='coerce')
-                df_sorted = df_sorted.sort_values(date_col)
-                
-                # Últimos 7 días vs 7 días anteriores
-                latest_date = df_sorted[date_col].max()
-                week_ago = latest_date - pd.Timedelta(days=7)
-                two_weeks_ago = latest_date - pd.Timedelta(days=14)
-                
-                current_week = df_sorted[df_sorted[date_col] >= week_ago][revenue_col].sum()
-                previous_week = df_sorted[(df_sorted[date_col] >= two_weeks_ago) & (df_sorted[date_col] < week_ago)][revenue_col].sum()
-                
-                if previous_week > 0:
-                    growth = ((current_week - previous_week) / previous_week) * 100
+                week = comparator.trailing(pd.Timedelta(days=7))
+                if week['growth'] is not None:
                     metrics['growth'] = {
-                        'value': float(growth),
+                        'value': float(week['growth']),
                         'label': 'Growth vs Last Week',
                         'format': 'percentage'
                     }
@@ -223,88 +381,166 @@ class DataAnalyzer:
         
         return metrics
     
-    def get_chart_data(self) -> Dict[str, Any]:
-        """Genera datos para charts automáticamente."""
+    def get_period_comparator(self) -> Optional[PeriodComparator]:
+        """Comparador de períodos sobre el revenue diario (se construye una vez)."""
+        main = self._main_columns()
+        if not (main['date'] and main['revenue']):
+            return None
+        
+        if self._comparator is None:
+            # Reutiliza los totales por fecha del line chart
+            self._comparator = PeriodComparator(self._get_plan().result(main['date'], main['revenue']))
+        return self._comparator
+    
+    def get_growth_horizons(self) -> Dict[str, Any]:
+        """Crecimiento WoW, MoM, QoQ y YoY (cacheado por contenido)."""
+        return self._cached('growth_horizons', self._compute_growth_horizons)
+    
+    def _compute_growth_horizons(self) -> Dict[str, Any]:
+        """Calcula el crecimiento para todos los horizontes con datos suficientes."""
+        comparator = self.get_period_comparator()
+        if comparator is None:
+            return {}
+        
+        try:
+            return comparator.horizons()
+        except Exception as e:
+            print(f"Error calculating growth horizons: {e}")
+            return {}
+    
+    def get_chart_data(self, full_resolution: bool = False) -> Dict[str, Any]:
+        """Genera datos para charts automáticamente (cacheados por contenido).
+        
+        El line chart se reduce a `chart_points` puntos salvo con `full_resolution`.
+        """
+        max_points = None if full_resolution else self.chart_points
+        return self._cached(f'charts:{max_points or "full"}', lambda: self._compute_chart_data(max_points))
+    
+    def get_time_series(self, start=None, end=None, max_points: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Revenue por fecha en [start, end] para vistas con zoom.
+        
+        Con `max_points=None` se usa el presupuesto del analyzer: al acotar el
+        rango, el mismo presupuesto cubre menos fechas y se gana resolución.
+        """
+        main = self._main_columns()
+        if not (main['date'] and main['revenue']):
+            return None
+        
+        daily = self._get_plan().result(main['date'], main['revenue'])
+        if start is not None or end is not None:
+            dates = pd.to_datetime(daily.index)
+            mask = np.ones(len(daily), dtype=bool)
+            if start is not None:
+                mask &= dates >= pd.Timestamp(start)
+            if end is not None:
+                mask &= dates <= pd.Timestamp(end)
+            daily = daily[mask]
+        
+        return self._line_chart(daily, max_points if max_points is not None else self.chart_points)
+    
+    def _line_chart(self, daily: pd.Series, max_points: Optional[int]) -> Dict[str, Any]:
+        """Arma el line chart a partir de los totales por fecha."""
+        main = self._main_columns()
+        points = downsample_series(daily, max_points)
+        
+        return {
+            'title': f"{main['revenue']} Over Time",
+            'x_data': points.index.astype(str).tolist(),
+            'y_data': points.tolist(),
+            'x_label': main['date'],
+            'y_label': main['revenue'],
+            'total_points': int(len(daily)),
+            'downsampled': len(points) < len(daily)
+        }
+    
+    def _compute_chart_data(self, max_points: Optional[int] = None) -> Dict[str, Any]:
+        """Calcula los datos de los charts."""
         charts = {
             'line_chart': None,
             'pie_chart': None,
             'bar_chart': None
         }
         
-        date_cols = self.detected_columns['dates']
-        revenue_cols = [col for col in self.detected_columns['numeric'] 
-                       if self.detected_columns['metrics'].get(col) == 'currency']
-        category_cols = self.detected_columns['categories']
+        main = self._main_columns()
+        plan = self._get_plan()
+        revenue_col = main['revenue']
         
         # Line Chart: Fecha + Revenue
-        if date_cols and revenue_cols:
-            date_col = date_cols[0]
-            revenue_col = revenue_cols[0]
+        if main['date'] and revenue_col:
+            date_col = main['date']
             
             try:
-                # Ensure revenue column is numeric
-                df_copy = self.df.copy()
-                df_copy[revenue_col] = pd.to_numeric(df_copy[revenue_col], errors='coerce')
-                
-                df_grouped = df_copy.groupby(date_col)[revenue_col].sum().reset_index()
-                df_grouped = df_grouped.sort_values(date_col)
-                
-                charts['line_chart'] = {
-                    'title': f'{revenue_col} Over Time',
-                    'x_data': df_grouped[date_col].astype(str).tolist(),
-                    'y_data': df_grouped[revenue_col].tolist(),
-                    'x_label': date_col,
-                    'y_label': revenue_col
-                }
+                daily = plan.result(date_col, revenue_col)
+                charts['line_chart'] = self._line_chart(daily, max_points)
             except Exception as e:
                 print(f"Error creating line chart: {e}")
         
-        # Pie Chart: Categoría + Revenue
-        if category_cols and revenue_cols:
-            category_col = category_cols[0]
-            revenue_col = revenue_cols[0]
+        # Pie Chart y Bar Chart: comparten el mismo groupby Categoría + Revenue
+        if main['category'] and revenue_col:
+            category_col = main['category']
             
             try:
-                # Ensure revenue column is numeric
-                df_copy = self.df.copy()
-                df_copy[revenue_col] = pd.to_numeric(df_copy[revenue_col], errors='coerce')
-                
-                df_grouped = df_copy.groupby(category_col)[revenue_col].sum().reset_index()
-                df_grouped = df_grouped.sort_values(revenue_col, ascending=False).head(10)
+                top_categories = plan.top(category_col, revenue_col, n=10)
+                labels = top_categories.index.tolist()
+                values = top_categories.tolist()
                 
                 charts['pie_chart'] = {
                     'title': f'{revenue_col} by {category_col}',
-                    'labels': df_grouped[category_col].tolist(),
-                    'values': df_grouped[revenue_col].tolist()
+                    'labels': labels,
+                    'values': values
                 }
-            except Exception as e:
-                print(f"Error creating pie chart: {e}")
-        
-        # Bar Chart: Top 10 categorías
-        if category_cols and revenue_cols:
-            category_col = category_cols[0]
-            revenue_col = revenue_cols[0]
-            
-            try:
-                # Ensure revenue column is numeric
-                df_copy = self.df.copy()
-                df_copy[revenue_col] = pd.to_numeric(df_copy[revenue_col], errors='coerce')
-                
-                df_grouped = df_copy.groupby(category_col)[revenue_col].sum().reset_index()
-                df_grouped = df_grouped.sort_values(revenue_col, ascending=False).head(10)
                 
+                # Bar Chart: Top 10 categorías
                 charts['bar_chart'] = {
                     'title': f'Top 10 {category_col}',
-                    'x_data': df_grouped[category_col].tolist(),
-                    'y_data': df_grouped[revenue_col].tolist()
+                    'x_data': list(labels),
+                    'y_data': list(values)
                 }
             except Exception as e:
-                print(f"Error creating bar chart: {e}")
+                print(f"Error creating category charts: {e}")
         
         return charts
     
+    def get_appendix_tables(self) -> List[Dict[str, Any]]:
+        """Serie diaria completa y todas las categorías, para el anexo del PDF (cacheado)."""
+        return self._cached('appendix', self._compute_appendix_tables)
+    
+    def _compute_appendix_tables(self) -> List[Dict[str, Any]]:
+        """Tablas completas en columnas (listas), sin recortar a top-n ni a los últimos días."""
+        main = self._main_columns()
+        revenue_col = main['revenue']
+        if not revenue_col:
+            return []
+        
+        plan = self._get_plan()
+        tables = []
+        # Fechas en orden cronológico; categorías de mayor a menor
+        for by, by_value in ((main['date'], False), (main['category'], True)):
+            if not by:
+                continue
+            try:
+                series = plan.result(by, revenue_col).dropna()
+                if by_value:
+                    series = series.sort_values(ascending=False, kind='stable')
+                total = series.sum()
+                share = series / total * 100 if total else series * 0
+                tables.append({
+                    'title': f'{revenue_col} by {by}',
+                    'columns': [by, revenue_col, '% of Total'],
+                    'formats': ['text', 'currency', 'percentage'],
+                    'data': [series.index.astype(str).tolist(), series.tolist(), share.tolist()]
+                })
+            except Exception as e:
+                print(f"Error creating appendix table for {by}: {e}")
+        
+        return tables
+    
     def get_insights(self) -> List[str]:
-        """Genera insights automáticos."""
+        """Genera insights automáticos (cacheados por contenido)."""
+        return self._cached('insights', self._compute_insights)
+    
+    def _compute_insights(self) -> List[str]:
+        """Calcula los insights a partir de métricas y charts."""
         insights = []
         
         metrics = self.get_key_metrics()
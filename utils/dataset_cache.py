@@ -0,0 +1,134 @@
+"""
+Caché en disco de datasets subidos, en formato columnar (Arrow IPC).
+Cada archivo se convierte una sola vez, indexado por el hash de su contenido
+y junto con el esquema detectado; las cargas siguientes leen el Arrow con
+memory-map en lugar de volver a parsear el CSV/XLSX.
+
+No es zero-copy de punta a punta: la tabla Arrow apunta al mmap, pero
+`to_pandas()` copia las columnas numéricas y de fechas a bloques de numpy.
+Solo las de texto (StringDtype respaldado por Arrow) siguen leyendo del
+mmap. Lo que se ahorra siempre es el parseo y la detección de tipos.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .disk_cache import DiskLRU
+
+
+# Subir al cambiar el formato del esquema o del Arrow: las entradas viejas se descartan
+DATASET_CACHE_VERSION = 2
+
+
+def _json_default(value: Any) -> Any:
+    """Serializa escalares de numpy/pandas que aparecen en los perfiles."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+class DatasetCache:
+    """Datasets tipados en disco, con tope de tamaño y expulsión LRU."""
+    
+    def __init__(self, cache_dir: str = ".autoreport_cache/datasets", max_bytes: int = 2 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # Cada dataset: `<key>.arrow` (cuenta en el tope) y su esquema `<key>.json`
+        self._disk = DiskLRU(cache_dir, '.arrow', max_bytes, companions=('.json',))
+    
+    @staticmethod
+    def key_for(data: bytes) -> str:
+        """Hash del contenido del archivo subido."""
+        return hashlib.sha256(data).hexdigest()
+    
+    def _data_path(self, key: str) -> str:
+        return self._disk.path(key)
+    
+    def _schema_path(self, key: str) -> str:
+        return self._disk.path(key, '.json')
+    
+    def load(self, key: str) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """Carga un dataset cacheado y su esquema, o None (también si es de otra versión).
+
+        El Arrow se lee con memory-map; en el DataFrame los números y fechas son
+        copias, y los textos pueden seguir apuntando al archivo mapeado.
+        """
+        data_path = self._data_path(key)
+        schema_path = self._schema_path(key)
+        if not (os.path.exists(data_path) and os.path.exists(schema_path)):
+            return None
+        
+        try:
+            with open(schema_path, 'r') as f:
+                meta = json.load(f)
+            if meta.get('version') != DATASET_CACHE_VERSION:
+                # Formato viejo: se vuelve a convertir desde el archivo subido
+                self._disk.remove(key)
+                return None
+            with pa.memory_map(data_path, 'r') as source:
+                table = pa.ipc.open_file(source).read_all()
+            df = table.to_pandas()
+        except (OSError, ValueError, pa.ArrowException) as e:
+            print(f"Error loading cached dataset {key}: {e}")
+            return None
+        
+        self._disk.touch(key)
+        return df, meta['detected_columns']
+    
+    def store(self, key: str, df: pd.DataFrame, detected_columns: Dict[str, Any], name: str = "") -> bool:
+        """Guarda el dataset ya tipado y su esquema. Devuelve False si no se puede."""
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            print(f"Dataset not cacheable: {e}")
+            return False
+        
+        # Escritura atómica: archivo temporal + rename
+        try:
+            with self._disk.open_write(key) as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        except (OSError, pa.ArrowException) as e:
+            print(f"Error caching dataset: {e}")
+            return False
+        
+        meta = {
+            'version': DATASET_CACHE_VERSION,
+            'name': name,
+            'rows': len(df),
+            'created_at': datetime.now().isoformat(),
+            'detected_columns': detected_columns
+        }
+        # El esquema también se escribe atómicamente: un lector nunca ve un JSON a medias
+        if not self._disk.write(key, json.dumps(meta, default=_json_default), suffix='.json'):
+            return False
+        
+        self._disk.evict()
+        return True
+    
+    def size_bytes(self) -> int:
+        """Tamaño total de los datasets cacheados."""
+        return self._disk.size_bytes()
+
+
+_shared_cache: Optional[DatasetCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_dataset_cache() -> DatasetCache:
+    """Devuelve la caché de datasets del proceso (se crea al primer uso)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = DatasetCache()
+        return _shared_cache
@@ -0,0 +1,129 @@
+"""
+Directorio de caché en disco con tope de bytes y expulsión LRU, compartido
+por las cachés de datasets, charts y reportes. Las escrituras son atómicas
+(ver file_lock.atomic_open) y el tamaño ocupado se lleva en memoria: el
+directorio solo se recorre al abrirlo y cuando hay que expulsar.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Union
+
+from .file_lock import atomic_open
+
+
+class DiskLRU:
+    """Archivos `<key><suffix>` en `directory`, expulsados por último uso (mtime).
+
+    - `companions`: sufijos de archivos chicos que acompañan a cada entrada
+      (ej. el esquema de un dataset); se borran con ella y no cuentan en el tope.
+    - Varios procesos pueden compartir el directorio. Cada uno suma lo que
+      escribe; al pasarse de `max_bytes` vuelve a medir el directorio real
+      (incluye lo que escribieron los demás) y borra lo menos usado.
+    """
+    
+    def __init__(self, directory: str, suffix: str, max_bytes: int, companions: Sequence[str] = ()):
+        self.directory = directory
+        self.suffix = suffix
+        self.max_bytes = max_bytes
+        self.companions = tuple(companions)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._total = self._scan_total()
+    
+    def path(self, key: str, suffix: Optional[str] = None) -> str:
+        return os.path.join(self.directory, f"{key}{suffix or self.suffix}")
+    
+    def _entries(self) -> Dict[str, os.stat_result]:
+        """Entradas en disco (clave -> stat), sin las que otro proceso borró mientras tanto."""
+        entries = {}
+        for filename in os.listdir(self.directory):
+            if filename.endswith(self.suffix):
+                try:
+                    entries[filename[:-len(self.suffix)]] = os.stat(os.path.join(self.directory, filename))
+                except OSError:
+                    continue
+        return entries
+    
+    def _scan_total(self) -> int:
+        return sum(stat.st_size for stat in self._entries().values())
+    
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+    
+    def touch(self, key: str):
+        """Marca de uso para la expulsión LRU (la comparten todos los procesos)."""
+        now = datetime.now().timestamp()
+        try:
+            os.utime(self.path(key), (now, now))
+        except OSError:
+            pass
+    
+    def read(self, key: str) -> Optional[bytes]:
+        """Contenido de la entrada (y la marca como usada), o None si no está."""
+        try:
+            with open(self.path(key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        self.touch(key)
+        return data
+    
+    @contextmanager
+    def open_write(self, key: str, mode: str = 'wb', suffix: Optional[str] = None):
+        """Escritura atómica de la entrada (o de un archivo compañero con `suffix`)."""
+        path = self.path(key, suffix)
+        try:
+            previous = os.path.getsize(path)
+        except OSError:
+            previous = 0
+        with atomic_open(path, mode) as f:
+            yield f
+        if suffix is None or suffix == self.suffix:
+            with self._lock:
+                self._total += os.path.getsize(path) - previous
+    
+    def write(self, key: str, data: Union[str, bytes], suffix: Optional[str] = None) -> bool:
+        """Escribe la entrada completa y expulsa si hace falta. Devuelve False si no se pudo."""
+        try:
+            with self.open_write(key, 'wb' if isinstance(data, bytes) else 'w', suffix) as f:
+                f.write(data)
+        except OSError as e:
+            print(f"Error writing cache entry {key}: {e}")
+            return False
+        self.evict()
+        return True
+    
+    def remove(self, key: str):
+        """Borra la entrada y sus compañeros."""
+        size = 0
+        for suffix in (self.suffix,) + self.companions:
+            path = self.path(key, suffix)
+            try:
+                if suffix == self.suffix:
+                    size = os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._total = max(0, self._total - size)
+    
+    def evict(self):
+        """Si el tamaño llevado en memoria pasa `max_bytes`, borra lo menos usado del disco."""
+        if self._total <= self.max_bytes:
+            return
+        entries = self._entries()
+        total = sum(stat.st_size for stat in entries.values())
+        for key, stat in sorted(entries.items(), key=lambda item: item[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            self.remove(key)
+            total -= stat.st_size
+        with self._lock:
+            self._total = total
+    
+    def size_bytes(self) -> int:
+        """Tamaño total de las entradas en disco (medido, no el contador)."""
+        return self._scan_total()
@@ -0,0 +1,79 @@
+"""
+Reducción de series temporales para charts (Largest-Triangle-Three-Buckets).
+Conserva la forma visual de la línea con un presupuesto fijo de puntos, en
+lugar de mandar un punto por fecha al navegador.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Posiciones de los puntos que elige LTTB (siempre incluye el primero y el último).
+
+    `x` debe estar ordenado. Si hay `threshold` puntos o menos, devuelve todos.
+    """
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        return np.array([0, n - 1])[:max(threshold, 0)]
+    
+    # Relativo al primer punto: con timestamps en ns las sumas no pierden precisión
+    x = np.asarray(x, dtype=np.float64) - float(x[0])
+    y = np.asarray(y, dtype=np.float64)
+    
+    # Buckets intermedios (sin el primer ni el último punto)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    # Promedio de cada bucket con sumas acumuladas: O(1) por bucket
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Punto "C": promedio del bucket siguiente (o el último punto)
+        if bucket + 2 < len(edges):
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+            count = next_end - next_start
+            avg_x = (cum_x[next_end] - cum_x[next_start]) / count
+            avg_y = (cum_y[next_end] - cum_y[next_start]) / count
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        
+        # Área del triángulo (A = punto anterior, B = candidato, C = promedio)
+        ax, ay = x[previous], y[previous]
+        areas = np.abs((ax - avg_x) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y - ay))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    
+    return selected
+
+
+def downsample_series(series: pd.Series, max_points: Optional[int], keep_tail: int = 7) -> pd.Series:
+    """Reduce una serie indexada por fecha a `max_points` puntos como máximo.
+
+    Los últimos `keep_tail` puntos se conservan siempre a resolución completa
+    (las tablas de "últimos días" del PDF los leen tal cual).
+    """
+    series = series.dropna()
+    if not max_points or len(series) <= max_points:
+        return series
+    
+    keep_tail = min(max(keep_tail, 0), max_points - 3) if max_points > 3 else 0
+    head = series.iloc[:len(series) - keep_tail] if keep_tail else series
+    
+    if isinstance(head.index, pd.DatetimeIndex):
+        x = head.index.asi8.astype(np.float64)
+    else:
+        x = np.arange(len(head), dtype=np.float64)
+    positions = lttb_indices(x, head.to_numpy(dtype=np.float64), max_points - keep_tail)
+    
+    if keep_tail:
+        return pd.concat([head.iloc[positions], series.iloc[-keep_tail:]])
+    return head.iloc[positions]
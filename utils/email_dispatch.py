@@ -0,0 +1,176 @@
+"""
+Envío masivo de emails: concurrencia acotada (pool de hilos), límite de
+tasa con token bucket y reintentos con backoff ante 429, 5xx y errores de
+red. El transporte es enchufable: SendGrid (o cualquier servidor que
+hable su API v3, ej. un mock local para pruebas de carga) o uno propio.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from python_http_client.exceptions import HTTPError
+from sendgrid import SendGridAPIClient
+
+
+# Respuestas que vale la pena reintentar: límite de tasa y errores del servidor
+RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+SENDGRID_HOST = 'https://api.sendgrid.com'
+
+
+class TokenBucket:
+    """Límite de tasa: `rate` envíos por segundo, con ráfagas de hasta `burst`. Seguro entre hilos."""
+    
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive: {rate}")
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self):
+        """Espera hasta que haya un token y lo consume."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+    
+    def pause(self, seconds: float):
+        """Frena a todos los que esperan por `seconds` (ej. el Retry-After de un 429)."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+
+class EmailTransport:
+    """Interfaz de transporte: envía un mensaje (body de la API v3 de SendGrid).
+
+    Devuelve `(status, headers)`. Un error de red se lanza como OSError (se reintenta).
+    """
+    
+    def send(self, message: Dict[str, Any]) -> Tuple[int, Dict[str, str]]:
+        raise NotImplementedError
+
+
+class SendGridTransport(EmailTransport):
+    """SendGrid por HTTP. Con `host` apunta a otro servidor con la misma API (ej. un mock local)."""
+    
+    def __init__(self, api_key: str, host: str = SENDGRID_HOST, timeout: float = 30.0):
+        self.client = SendGridAPIClient(api_key, host=host)
+        # Sin timeout una conexión colgada bloquea el hilo para siempre
+        self.client.client.timeout = timeout
+    
+    def send(self, message: Dict[str, Any]) -> Tuple[int, Dict[str, str]]:
+        try:
+            response = self.client.send(message)
+        except HTTPError as e:
+            # 4xx/5xx: el dispatcher decide si reintentar según el código
+            return e.status_code, dict(e.headers or {})
+        return response.status_code, dict(response.headers or {})
+
+
+class EmailDispatcher:
+    """Envía muchos mensajes por un `transport` compartido.
+
+    - `max_workers` envíos en vuelo a la vez (pool de hilos: el trabajo es esperar la red).
+    - `rate_per_second` (None: sin límite) con un token bucket común a todos los hilos;
+      un 429 con Retry-After frena el bucket entero, no solo ese envío.
+    - Hasta `max_retries` reintentos ante 408/429/5xx o errores de red, con backoff
+      exponencial con jitter desde `backoff_seconds` (tope `max_backoff_seconds`).
+    """
+    
+    def __init__(self, transport: EmailTransport, max_workers: int = 8, rate_per_second: Optional[float] = 10.0,
+                 burst: Optional[int] = None, max_retries: int = 4, backoff_seconds: float = 0.5,
+                 max_backoff_seconds: float = 30.0):
+        self.transport = transport
+        self.max_workers = max(1, max_workers)
+        self.bucket = TokenBucket(rate_per_second, burst) if rate_per_second else None
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+    
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        delay = min(self.max_backoff_seconds, self.backoff_seconds * 2 ** (attempt - 1))
+        # Jitter: que los reintentos de todos los hilos no lleguen juntos
+        delay *= 0.5 + random.random() / 2
+        return max(delay, retry_after or 0)
+    
+    @staticmethod
+    def _retry_after(headers: Dict[str, str]) -> Optional[float]:
+        for key, value in headers.items():
+            if key.lower() == 'retry-after':
+                try:
+                    return float(value)
+                except ValueError:
+                    return None
+        return None
+    
+    def send(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Envía un mensaje con reintentos. Nunca lanza excepciones: el error queda en el resultado."""
+        start = time.perf_counter()
+        result = {'ok': False, 'status': None, 'attempts': 0, 'error': None, 'seconds': 0.0}
+        while True:
+            if self.bucket:
+                self.bucket.acquire()
+            result['attempts'] += 1
+            retry_after = None
+            try:
+                status, headers = self.transport.send(message)
+            except OSError as e:
+                # Conexión rechazada, timeout, DNS: transitorio
+                result['error'] = f"{type(e).__name__}: {e}"
+                retryable = True
+            except Exception as e:
+                result['status'], result['error'] = None, f"{type(e).__name__}: {e}"
+                break
+            else:
+                result['status'] = status
+                if 200 <= status < 300:
+                    result['ok'], result['error'] = True, None
+                    break
+                result['error'] = f"HTTP {status}"
+                retryable = status in RETRYABLE_STATUS
+                retry_after = self._retry_after(headers)
+                if status == 429 and retry_after and self.bucket:
+                    self.bucket.pause(retry_after)
+            
+            if not retryable or result['attempts'] > self.max_retries:
+                break
+            time.sleep(self._backoff(result['attempts'], retry_after))
+        result['seconds'] = time.perf_counter() - start
+        return result
+    
+    def dispatch(self, items: Iterable[Any], build: Optional[Callable[[Any], Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """Envía todos los mensajes; un resultado por mensaje, en el mismo orden.
+
+        Con `build`, cada item se convierte en mensaje dentro del hilo que lo
+        envía (ej. leer y codificar el PDF), así no se arman todos en memoria antes.
+        """
+        def run(item: Any) -> Dict[str, Any]:
+            if build is None:
+                return self.send(item)
+            try:
+                message = build(item)
+            except Exception as e:
+                return {'ok': False, 'status': None, 'attempts': 0, 'error': f"{type(e).__name__}: {e}", 'seconds': 0.0}
+            return self.send(message)
+        
+        items = list(items)
+        if self.max_workers == 1 or len(items) <= 1:
+            return [run(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(run, items))
@@ -0,0 +1,106 @@
+"""
+Locks entre procesos sobre un archivo `.lock` (flock en POSIX, msvcrt en
+Windows) y escritura atómica de archivos. Los usa el almacenamiento de
+clientes para que varios procesos del servidor compartan los mismos datos
+sin pisarse las escrituras; las cachés en disco (ver disk_cache) escriben
+con atomic_open.
+"""
+
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Lock exclusivo, reentrante dentro del proceso, sobre `path`.
+
+    Un flock se toma por proceso: los hilos del mismo proceso se ordenan con
+    un RLock y solo el primero en entrar toma el lock del archivo.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+    
+    def acquire(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            fd = None
+            try:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            except OSError:
+                if fd is not None:
+                    os.close(fd)
+                self._thread_lock.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+    
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            fd, self._fd = self._fd, None
+            try:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            finally:
+                os.close(fd)
+        self._thread_lock.release()
+    
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc):
+        self.release()
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = 'w'):
+    """Archivo temporal que reemplaza a `path` al cerrar sin errores (`mode` 'w' o 'wb').
+
+    Nadie lee un archivo a medias: hasta el rename, `path` conserva el contenido anterior.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write(path: str, data: Union[str, bytes]):
+    """Escribe `data` (texto o bytes) en `path` vía archivo temporal + rename."""
+    with atomic_open(path, 'wb' if isinstance(data, bytes) else 'w') as f:
+        f.write(data)
+
+
+def file_stamp(path: str):
+    """Huella barata de un archivo (mtime, tamaño, inodo) para detectar cambios; None si no existe."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
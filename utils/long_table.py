@@ -0,0 +1,100 @@
+"""
+Tablas largas para el anexo del PDF, armadas por bloques a medida que se paginan.
+Un Table de reportlab con 100k filas crea, mide y guarda todas sus celdas antes
+de partirse entre páginas. ChunkedTable guarda solo las columnas de datos y
+arma un LongTable por bloque (lo que entra en la página, hasta `chunk_rows`
+filas): la memoria queda acotada por bloque y el tiempo crece lineal.
+"""
+
+from typing import Any, Callable, Dict, Sequence
+
+from reportlab.platypus import Flowable, LongTable, TableStyle
+
+
+FORMATTERS: Dict[str, Callable[[Any], str]] = {
+    'text': str,
+    'currency': '${:,.2f}'.format,
+    'number': '{:,.0f}'.format,
+    'percentage': '{:.1f}%'.format
+}
+
+
+class ChunkedTable(Flowable):
+    """Tabla de filas de alto fijo que se parte en LongTables de a un bloque.
+
+    `data` son las columnas (listas o arrays de igual largo) y `formats` el
+    formato de cada una (claves de FORMATTERS). Las celdas se formatean
+    recién al armar cada bloque, con el encabezado repetido en cada página.
+    """
+    
+    def __init__(self, columns: Sequence[str], data: Sequence[Sequence[Any]], formats: Sequence[str],
+                 col_widths: Sequence[float], style: TableStyle, row_height: float = 12,
+                 font_size: float = 8, chunk_rows: int = 1000, start: int = 0):
+        super().__init__()
+        self.columns = list(columns)
+        self.data = data
+        self.formats = list(formats)
+        self.col_widths = list(col_widths)
+        self.style = style
+        self.row_height = row_height
+        self.font_size = font_size
+        self.chunk_rows = max(int(chunk_rows), 1)
+        self.start = start
+        self.rows = len(data[0]) if len(data) else 0
+        # Las celdas no se parten en líneas: el texto se recorta al ancho aproximado
+        self._max_chars = [max(int((width - 6) / (font_size * 0.55)), 4) for width in self.col_widths]
+    
+    @property
+    def remaining(self) -> int:
+        return max(self.rows - self.start, 0)
+    
+    def _cell(self, value: Any, column: int) -> str:
+        if value is None or value != value:
+            return ''
+        text = FORMATTERS[self.formats[column]](value)
+        limit = self._max_chars[column]
+        return text if len(text) <= limit else text[:limit - 1] + '…'
+    
+    def _chunk(self, start: int, stop: int) -> LongTable:
+        """LongTable con las filas [start, stop) más el encabezado."""
+        cells = [self.columns]
+        columns = [column[start:stop] for column in self.data]
+        for values in zip(*columns):
+            cells.append([self._cell(value, i) for i, value in enumerate(values)])
+        
+        table = LongTable(cells, colWidths=self.col_widths, rowHeights=self.row_height, repeatRows=1)
+        table.setStyle(self.style)
+        return table
+    
+    def _rest(self, start: int) -> 'ChunkedTable':
+        return ChunkedTable(self.columns, self.data, self.formats, self.col_widths, self.style,
+                            row_height=self.row_height, font_size=self.font_size,
+                            chunk_rows=self.chunk_rows, start=start)
+    
+    def wrap(self, availWidth, availHeight):
+        # Alto exacto sin armar celdas: cada bloque suma su encabezado
+        chunks = -(-self.remaining // self.chunk_rows)
+        self.width = sum(self.col_widths)
+        self.height = (self.remaining + chunks) * self.row_height
+        return self.width, self.height
+    
+    def split(self, availWidth, availHeight):
+        fit = int(availHeight // self.row_height) - 1
+        if fit <= 0:
+            # Ni el encabezado y una fila: sigue en la página siguiente
+            return []
+        
+        stop = self.start + min(fit, self.chunk_rows)
+        if stop >= self.rows:
+            return [self._chunk(self.start, self.rows)]
+        return [self._chunk(self.start, stop), self._rest(stop)]
+    
+    def draw(self):
+        # Solo se llega acá si lo que queda entra completo: un LongTable por bloque
+        y = self.height
+        for start in range(self.start, self.rows, self.chunk_rows):
+            table = self._chunk(start, min(start + self.chunk_rows, self.rows))
+            _, height = table.wrapOn(self.canv, self.width, y)
+            y -= height
+            table.drawOn(self.canv, 0, y)
+
@@ -0,0 +1,419 @@
+"""
+Series de tiempo de métricas por cliente, en formato columnar (Arrow IPC).
+Cada reporte guardado agrega una fila (fecha + una columna float por
+métrica) a la serie del cliente. Las consultas históricas ("total_revenue
+de los últimos 52 reportes", "growth de todos los clientes la última
+semana") son operaciones vectorizadas sobre columnas en vez de recorrer
+el JSON anidado de cada reporte.
+"""
+
+import os
+import struct
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .file_lock import FileLock, file_stamp
+
+
+DATE_COLUMN = 'date'
+
+# El log de reportes nuevos de un cliente se fusiona con su base al pasar este tamaño
+# (unos 100 reportes): acota lo que se relee en cada append y en cada lectura
+DELTA_MAX_BYTES = 64 * 1024
+
+# Cada bloque del log: largo y crc32 del stream Arrow que sigue
+FRAME_HEADER = struct.Struct('<II')
+
+GENERATION_KEY = b'generation'
+
+
+def metrics_dir_for(data_file: str) -> str:
+    """Carpeta de series de métricas de un archivo de clientes (`clients_data_metrics/`)."""
+    return os.path.splitext(data_file)[0] + '_metrics'
+
+
+def flatten_metrics(metrics: Dict[str, Any]) -> Dict[str, float]:
+    """Métricas numéricas de un reporte: `{'total_revenue': {'value': 10.0, ...}}` -> `{'total_revenue': 10.0}`."""
+    values = {}
+    for key, metric in (metrics or {}).items():
+        value = metric.get('value') if isinstance(metric, dict) else metric
+        if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+            values[key] = float(value)
+    return values
+
+
+def _timestamp(value: datetime) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(value).to_datetime64(), 'us')
+
+
+class MetricsStore:
+    """Series por cliente: un archivo Arrow base (`<client_id>.arrow`, ordenado por
+    fecha) más un log de los reportes agregados desde entonces (`<client_id>-<gen>.delta`).
+
+    Agregar un reporte suma un bloque al final del log (bajo lock entre
+    procesos), sin reescribir el histórico. Cuando el log pasa
+    `DELTA_MAX_BYTES` se fusiona con la base en un archivo nuevo con la
+    generación siguiente (`gen`, guardada en la metadata del esquema): quien
+    lea la base nueva ya no mira el log viejo. Las lecturas guardan en
+    memoria cada tabla (válida mientras base y log no cambien) y una tabla
+    combinada de todos los clientes, ordenada por (client_id, fecha), que se
+    rearma solo cuando cambia `.version`.
+    """
+    
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+        self._lock = FileLock(os.path.join(store_dir, '.lock'))
+        self._version = os.path.join(store_dir, '.version')
+        # client_id -> (huella de la base, generación, tabla base)
+        self._bases: Dict[int, Tuple[Any, int, Optional[pa.Table]]] = {}
+        # client_id -> ((huella de la base, huella del log), tabla completa)
+        self._tables: Dict[int, Tuple[Any, pa.Table]] = {}
+        # (huella de .version, tabla combinada con columna client_id)
+        self._combined: Optional[Tuple[Any, Optional[pa.Table]]] = None
+    
+    def _path(self, client_id: int) -> str:
+        return os.path.join(self.store_dir, f"{client_id}.arrow")
+    
+    def _delta_path(self, client_id: int, generation: int) -> str:
+        return os.path.join(self.store_dir, f"{client_id}-{generation}.delta")
+    
+    def _delta_paths(self, client_id: int) -> List[str]:
+        """Logs del cliente de cualquier generación (puede quedar uno viejo si un proceso murió al fusionar)."""
+        prefix = f"{client_id}-"
+        return [os.path.join(self.store_dir, name) for name in os.listdir(self.store_dir)
+                if name.startswith(prefix) and name.endswith('.delta')]
+    
+    def client_ids(self) -> List[int]:
+        ids = set()
+        for name in os.listdir(self.store_dir):
+            if name.endswith('.arrow'):
+                stem = name[:-len('.arrow')]
+            elif name.endswith('.delta'):
+                stem = name.split('-')[0]
+            else:
+                continue
+            if stem.isdigit():
+                ids.add(int(stem))
+        return sorted(ids)
+    
+    def _read_base(self, client_id: int) -> Tuple[Any, int, Optional[pa.Table]]:
+        """(huella, generación, tabla) del archivo base; generación 0 si todavía no hay base."""
+        path = self._path(client_id)
+        stamp = file_stamp(path)
+        if stamp is None:
+            self._bases.pop(client_id, None)
+            return None, 0, None
+        cached = self._bases.get(client_id)
+        if cached and cached[0] == stamp:
+            return cached
+        try:
+            # Lectura a memoria (no memory-map): en Windows un archivo mapeado no se puede reemplazar
+            with pa.OSFile(path, 'rb') as source:
+                table = pa.ipc.open_file(source).read_all()
+        except FileNotFoundError:
+            return None, 0, None
+        except (OSError, pa.ArrowException) as e:
+            print(f"Error reading metrics for client {client_id}: {e}")
+            return None, 0, None
+        generation = int((table.schema.metadata or {}).get(GENERATION_KEY, b'0'))
+        self._bases[client_id] = (stamp, generation, table)
+        return self._bases[client_id]
+    
+    @staticmethod
+    def _frames(data: bytes) -> Tuple[List[bytes], int]:
+        """Bloques completos de un log y hasta qué byte llegan (lo que sigue es una escritura cortada)."""
+        frames = []
+        offset = 0
+        while offset + FRAME_HEADER.size <= len(data):
+            length, checksum = FRAME_HEADER.unpack_from(data, offset)
+            body = data[offset + FRAME_HEADER.size:offset + FRAME_HEADER.size + length]
+            if len(body) < length or zlib.crc32(body) != checksum:
+                break
+            frames.append(body)
+            offset += FRAME_HEADER.size + length
+        return frames, offset
+    
+    def _read_delta(self, client_id: int, path: str) -> List[pa.Table]:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            print(f"Error reading metrics for client {client_id}: {e}")
+            return []
+        # Un bloque a medias es un append en curso de otro proceso: se verá en la próxima lectura
+        frames, _ = self._frames(data)
+        return [pa.ipc.open_stream(pa.py_buffer(frame)).read_all() for frame in frames]
+    
+    def _read(self, client_id: int) -> Optional[pa.Table]:
+        base_stamp, generation, base = self._read_base(client_id)
+        delta_path = self._delta_path(client_id, generation)
+        stamp = (base_stamp, file_stamp(delta_path))
+        cached = self._tables.get(client_id)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        
+        tables = [base] if base is not None else []
+        if stamp[1] is not None:
+            tables += self._read_delta(client_id, delta_path)
+        if not tables:
+            self._tables.pop(client_id, None)
+            return None
+        if len(tables) > 1:
+            table = self._sorted(pa.concat_tables(tables, promote_options='default')).combine_chunks()
+        else:
+            table = tables[0]
+        self._tables[client_id] = (stamp, table)
+        return table
+    
+    def _write(self, client_id: int, table: pa.Table):
+        """Reemplaza la base por `table` con la generación siguiente y borra los logs anteriores."""
+        _, generation, _ = self._read_base(client_id)
+        table = table.replace_schema_metadata({GENERATION_KEY: str(generation + 1).encode()})
+        tmp_path = self._path(client_id) + '.tmp'
+        try:
+            with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_path, self._path(client_id))
+        except (OSError, pa.ArrowException) as e:
+            print(f"Error writing metrics for client {client_id}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        for path in self._delta_paths(client_id):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._touch()
+    
+    def _touch(self):
+        # Avisa a todos los procesos que la tabla combinada quedó vieja. Se reemplaza
+        # el archivo (inodo nuevo): el mtime solo puede no cambiar entre dos escrituras seguidas
+        self._combined = None
+        tmp_path = self._version + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(str(time.time_ns()))
+        os.replace(tmp_path, self._version)
+    
+    @staticmethod
+    def _table(rows: Iterable[Dict[str, Any]]) -> pa.Table:
+        """Filas `{'date': ..., 'metrics': {...}}` -> tabla (fecha, una columna por métrica).
+
+        Se arma directo con pyarrow: para el reporte de cada append, pasar por
+        un DataFrame costaba más que escribirlo.
+        """
+        dates = []
+        columns: Dict[str, List[Optional[float]]] = {}
+        for row in rows:
+            try:
+                dates.append(datetime.fromisoformat(str(row['date'])))
+            except (KeyError, ValueError):
+                continue
+            for key, value in flatten_metrics(row.get('metrics')).items():
+                columns.setdefault(key, [None] * (len(dates) - 1)).append(value)
+            for values in columns.values():
+                if len(values) < len(dates):
+                    values.append(None)
+        arrays = {DATE_COLUMN: pa.array(dates, pa.timestamp('us'))}
+        arrays.update({key: pa.array(values, pa.float64()) for key, values in columns.items()})
+        return pa.table(arrays)
+    
+    @staticmethod
+    def _sorted(table: pa.Table) -> pa.Table:
+        dates = table.column(DATE_COLUMN).to_numpy()
+        if len(dates) > 1 and (dates[1:] < dates[:-1]).any():
+            return table.sort_by(DATE_COLUMN)
+        return table
+    
+    def append(self, client_id: int, date: str, metrics: Dict[str, Any]):
+        """Agrega las métricas de un reporte a la serie del cliente."""
+        self.extend(client_id, [{'date': date, 'metrics': metrics}])
+    
+    def extend(self, client_id: int, reports: List[Dict[str, Any]]):
+        """Agrega varios reportes (con `date` y `metrics`) a la serie del cliente."""
+        new = self._table(reports)
+        if new.num_rows == 0:
+            return
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, new.schema) as writer:
+            writer.write_table(new)
+        body = sink.getvalue().to_pybytes()
+        
+        with self._lock:
+            _, generation, _ = self._read_base(client_id)
+            try:
+                with open(self._delta_path(client_id, generation), 'a+b') as f:
+                    f.seek(0)
+                    data = f.read()
+                    _, valid = self._frames(data)
+                    if valid < len(data):
+                        # Un proceso murió a mitad de un append: sin recortar, lo que sigue no se leería
+                        print(f"Error reading metrics for client {client_id}: dropping {len(data) - valid} bytes of a cut write")
+                        f.truncate(valid)
+                    f.write(FRAME_HEADER.pack(len(body), zlib.crc32(body)) + body)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    size = valid + FRAME_HEADER.size + len(body)
+            except OSError as e:
+                print(f"Error writing metrics for client {client_id}: {e}")
+                return
+            if size > DELTA_MAX_BYTES:
+                self._write(client_id, self._read(client_id))
+            else:
+                self._touch()
+    
+    def rebuild(self, client_id: int, reports: List[Dict[str, Any]]):
+        """Reemplaza la serie del cliente por la de `reports` (ej. tras compactar el histórico)."""
+        with self._lock:
+            table = self._table(reports) if reports else None
+            if table is None or table.num_rows == 0:
+                self.delete(client_id)
+            else:
+                self._write(client_id, self._sorted(table))
+    
+    def delete(self, client_id: int):
+        with self._lock:
+            paths = [self._path(client_id)] + self._delta_paths(client_id)
+            removed = False
+            for path in paths:
+                try:
+                    os.remove(path)
+                    removed = True
+                except FileNotFoundError:
+                    pass
+            if removed:
+                self._bases.pop(client_id, None)
+                self._tables.pop(client_id, None)
+                self._touch()
+    
+    @property
+    def _marker(self) -> str:
+        return os.path.join(self.store_dir, '.backfilled')
+    
+    def backfill(self, load: Callable[[], Iterable[Tuple[int, List[Dict[str, Any]]]]]) -> int:
+        """Arma las series una única vez desde el histórico existente (`load` -> (client_id, reportes)).
+
+        Devuelve cuántos clientes cargó (0 si ya estaba hecho, por este u otro proceso).
+        """
+        if os.path.exists(self._marker):
+            return 0
+        with self._lock:
+            if os.path.exists(self._marker):
+                return 0
+            loaded = 0
+            for client_id, reports in load():
+                self.rebuild(client_id, reports)
+                loaded += 1
+            with open(self._marker, 'w') as f:
+                f.write(datetime.now().isoformat())
+            return loaded
+    
+    def frame(self, client_id: int, metrics: Optional[List[str]] = None, last: Optional[int] = None,
+              since: Optional[datetime] = None) -> pd.DataFrame:
+        """Serie del cliente como DataFrame indexado por fecha (los `last` reportes más nuevos, desde `since`)."""
+        table = self._read(client_id)
+        if table is None:
+            return pd.DataFrame(columns=metrics or [], index=pd.DatetimeIndex([], name=DATE_COLUMN), dtype='float64')
+        
+        dates = table.column(DATE_COLUMN).to_numpy()
+        start = self._start(dates, last, since)
+        columns = metrics if metrics is not None else [c for c in table.column_names if c != DATE_COLUMN]
+        data = {column: self._values(table, column, start) for column in columns}
+        return pd.DataFrame(data, index=pd.DatetimeIndex(dates[start:], name=DATE_COLUMN), columns=columns)
+    
+    def series(self, client_id: int, metric: str, last: Optional[int] = None,
+               since: Optional[datetime] = None) -> pd.Series:
+        """Una métrica del cliente en el tiempo; ej. `series(7, 'total_revenue', last=52).sum()`."""
+        table = self._read(client_id)
+        if table is None:
+            return pd.Series([], index=pd.DatetimeIndex([], name=DATE_COLUMN), dtype='float64', name=metric)
+        # Sin armar un DataFrame para una sola columna: es la mayor parte del costo de la consulta
+        dates = table.column(DATE_COLUMN).to_numpy()
+        start = self._start(dates, last, since)
+        return pd.Series(self._values(table, metric, start), index=pd.DatetimeIndex(dates[start:], name=DATE_COLUMN),
+                         name=metric)
+    
+    @staticmethod
+    def _start(dates: np.ndarray, last: Optional[int], since: Optional[datetime]) -> int:
+        """Primera fila de los `last` reportes más nuevos con fecha desde `since`."""
+        start = len(dates) - last if last is not None else 0
+        if since is not None:
+            # Fechas ordenadas: búsqueda binaria en vez de máscara
+            start = max(start, int(np.searchsorted(dates, _timestamp(since))))
+        return max(start, 0)
+    
+    @staticmethod
+    def _values(table: pa.Table, column: str, start: int) -> np.ndarray:
+        if column not in table.column_names:
+            return np.full(table.num_rows - start, np.nan)
+        return table.column(column).to_numpy()[start:]
+    
+    def _all(self) -> Optional[pa.Table]:
+        """Tabla de todos los clientes ordenada por (client_id, fecha); se rearma solo si algo cambió."""
+        stamp = file_stamp(self._version)
+        if self._combined is not None and self._combined[0] == stamp:
+            return self._combined[1]
+        
+        tables = []
+        for client_id in self.client_ids():
+            table = self._read(client_id)
+            if table is not None and table.num_rows:
+                tables.append(table.append_column('client_id', pa.array(np.full(table.num_rows, client_id, dtype=np.int64))))
+        combined = pa.concat_tables(tables, promote_options='default').combine_chunks() if tables else None
+        self._combined = (stamp, combined)
+        return combined
+    
+    def _select(self, metrics: Optional[List[str]], since: Optional[datetime],
+                until: Optional[datetime]) -> Tuple[Optional[pa.Table], List[str], np.ndarray]:
+        """Tabla combinada, columnas de métricas pedidas y máscara de filas en [since, until)."""
+        table = self._all()
+        if table is None:
+            return None, metrics or [], np.zeros(0, dtype=bool)
+        columns = metrics if metrics is not None else [c for c in table.column_names if c not in (DATE_COLUMN, 'client_id')]
+        dates = table.column(DATE_COLUMN).to_numpy()
+        mask = np.ones(len(dates), dtype=bool)
+        if since is not None:
+            mask &= dates >= _timestamp(since)
+        if until is not None:
+            mask &= dates < _timestamp(until)
+        return table, columns, mask
+    
+    @staticmethod
+    def _frame(table: pa.Table, columns: List[str], rows: np.ndarray) -> pd.DataFrame:
+        data = {
+            'client_id': table.column('client_id').to_numpy()[rows],
+            DATE_COLUMN: table.column(DATE_COLUMN).to_numpy()[rows]
+        }
+        for column in columns:
+            data[column] = (table.column(column).to_numpy(zero_copy_only=False)[rows] if column in table.column_names
+                            else np.full(len(rows), np.nan))
+        return pd.DataFrame(data, columns=['client_id', DATE_COLUMN] + columns)
+    
+    def snapshot(self, metrics: Optional[List[str]] = None, since: Optional[datetime] = None,
+                 until: Optional[datetime] = None) -> pd.DataFrame:
+        """Reportes de todos los clientes con fecha en [since, until): columnas `client_id`, `date` y métricas."""
+        table, columns, mask = self._select(metrics, since, until)
+        if table is None:
+            return pd.DataFrame(columns=['client_id', DATE_COLUMN] + columns)
+        return self._frame(table, columns, np.flatnonzero(mask))
+    
+    def latest(self, metrics: Optional[List[str]] = None, since: Optional[datetime] = None,
+               until: Optional[datetime] = None) -> pd.DataFrame:
+        """Último reporte de cada cliente en [since, until), indexado por client_id; ej. growth de la semana."""
+        table, columns, mask = self._select(metrics, since, until)
+        if table is None:
+            return pd.DataFrame(columns=['client_id', DATE_COLUMN] + columns).set_index('client_id')
+        rows = np.flatnonzero(mask)
+        # Filas ordenadas por (cliente, fecha): el último de cada cliente es donde cambia client_id
+        client_ids = table.column('client_id').to_numpy()[rows]
+        last = rows[np.append(client_ids[1:] != client_ids[:-1], True)] if len(rows) else rows
+        return self._frame(table, columns, last).set_index('client_id')
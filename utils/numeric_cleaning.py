@@ -0,0 +1,161 @@
+"""
+Limpieza vectorizada de strings numéricos ("$1,234.50", "12%", "1.234,56").
+Una sola pasada sobre los bytes de la columna, conversión nativa de Arrow
+y downcast al dtype más chico que no pierde información.
+"""
+
+import re
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+# Espacios explícitos (los de str.isspace, ej. \r, \v, \x1f, \u00a0): el \s de
+# la regex cambia según el motor (re de Python o RE2 con strings de Arrow)
+_SPACES = ''.join(chr(c) for c in range(0x3001) if chr(c).isspace())
+
+# Símbolos de moneda, porcentaje, espacios y el separador de miles de cada locale
+_STRIP_PATTERNS = {
+    '.': f'[$€£¥%{_SPACES},]',   # 1,234.56
+    ',': f'[$€£¥%{_SPACES}.]'    # 1.234,56
+}
+
+# Mismo conjunto en bytes ASCII, como tabla de "conservar" para indexar el buffer
+_KEEP_TABLES = {}
+for _decimal, _pattern in _STRIP_PATTERNS.items():
+    _KEEP_TABLES[_decimal] = np.ones(256, dtype=bool)
+    _KEEP_TABLES[_decimal][[b for b in range(0x80) if re.fullmatch(_pattern, chr(b))]] = False
+
+
+def detect_decimal_separator(sample: pd.Series) -> str:
+    """Infiere el separador decimal ('.' o ',') a partir de una muestra."""
+    text = sample.dropna().astype(str)
+    if len(text) == 0:
+        return '.'
+    
+    # Último separador seguido solo de dígitos (y símbolos) hasta el final
+    comma_decimal = text.str.contains(r',\d{1,2}\D*$', regex=True).sum()
+    dot_decimal = text.str.contains(r'\.\d+\D*$', regex=True).sum()
+    return ',' if comma_decimal > dot_decimal else '.'
+
+
+def _arrow_strings(series: pd.Series) -> Optional[pa.Array]:
+    """La columna como arreglo de strings Arrow, o None si no es texto puro."""
+    try:
+        arr = pa.array(series, from_pandas=True)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    if not (pa.types.is_string(arr.type) or pa.types.is_large_string(arr.type)):
+        return None
+    return arr
+
+
+def _strip_ascii(arr: pa.Array, decimal: str) -> Optional[pa.Array]:
+    """Quita símbolos y separadores en una sola pasada sobre el buffer de bytes.
+    
+    Devuelve None si hay caracteres no ASCII (ej. "€"), que van por el camino regex.
+    """
+    offset_type = np.int64 if pa.types.is_large_string(arr.type) else np.int32
+    _, offsets_buf, data_buf = arr.buffers()
+    offsets = np.frombuffer(offsets_buf, dtype=offset_type)[arr.offset:arr.offset + len(arr) + 1]
+    if data_buf is None or offsets[-1] == offsets[0]:
+        data = np.empty(0, dtype=np.uint8)
+    else:
+        data = np.frombuffer(data_buf, dtype=np.uint8)[offsets[0]:offsets[-1]]
+    if data.size and data.max() >= 0x80:
+        return None
+    
+    keep = _KEEP_TABLES[decimal][data]
+    # Cada offset retrocede tantos bytes como se quitaron antes de él
+    removed = np.flatnonzero(~keep)
+    relative = offsets - offsets[0]
+    new_offsets = (relative - np.searchsorted(removed, relative)).astype(offset_type)
+    new_data = data[keep]
+    if decimal == ',':
+        new_data[new_data == ord(',')] = ord('.')
+    
+    validity = pc.is_valid(arr).buffers()[1] if arr.null_count else None
+    return pa.Array.from_buffers(
+        arr.type, len(arr),
+        [validity, pa.py_buffer(new_offsets), pa.py_buffer(new_data)],
+        null_count=arr.null_count
+    )
+
+
+def _parse(series: pd.Series, decimal: str) -> pd.Series:
+    arr = _arrow_strings(series)
+    cleaned = _strip_ascii(arr, decimal) if arr is not None else None
+    
+    if cleaned is None:
+        # Camino general: texto mixto o símbolos no ASCII
+        text = series.astype(str).str.replace(_STRIP_PATTERNS[decimal], '', regex=True)
+        if decimal == ',':
+            text = text.str.replace(',', '.', regex=False)
+        return pd.to_numeric(text, errors='coerce')
+    
+    try:
+        # Cast nativo de Arrow; solo falla si hay valores no numéricos
+        values = pc.cast(cleaned, pa.float64()).to_numpy(zero_copy_only=False)
+    except pa.ArrowInvalid:
+        values = pd.to_numeric(cleaned.to_pandas(), errors='coerce').to_numpy(dtype=np.float64)
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def downcast_numeric(numbers: pd.Series) -> pd.Series:
+    """Reduce el dtype sin perder información.
+
+    Los enteros bajan al entero más chico que los contiene. Los decimales se
+    quedan en float64: en float32 los totales de moneda pierden centavos.
+    """
+    if len(numbers) == 0 or numbers.isna().any():
+        return numbers
+    
+    values = numbers.to_numpy()
+    if pd.api.types.is_float_dtype(values) and not np.all(np.mod(values, 1) == 0):
+        return numbers
+    return pd.to_numeric(numbers, downcast='integer')
+
+
+def clean_numeric(series: pd.Series, decimal: Optional[str] = None, distinct_ratio: float = 1.0,
+                  downcast: bool = True) -> Tuple[pd.Series, Dict[str, Any]]:
+    """Convierte una columna de strings numéricos.
+
+    Devuelve la serie convertida y un reporte con el separador usado, el dtype
+    final y cuántos valores no nulos no se pudieron convertir (quedan NaN).
+    """
+    if decimal is None:
+        decimal = detect_decimal_separator(series.head(1000))
+    
+    if distinct_ratio < 0.5:
+        # Pocos valores distintos: se limpian solo los únicos y se expanden
+        codes, uniques = pd.factorize(series)
+        converted = _parse(pd.Series(uniques), decimal).to_numpy()
+        if (codes >= 0).all():
+            values = converted[codes]
+        else:
+            values = np.where(codes >= 0, converted[codes], np.nan)
+        numbers = pd.Series(values, index=series.index, name=series.name)
+    else:
+        numbers = _parse(series, decimal)
+    
+    coerced = int((series.notna() & numbers.isna()).sum())
+    if downcast:
+        numbers = downcast_numeric(numbers)
+    
+    return numbers, {
+        'decimal': decimal,
+        'dtype': str(numbers.dtype),
+        'coerced': coerced
+    }
+
+
+def numeric_parse_rate(sample: pd.Series, decimal: Optional[str] = None) -> Tuple[float, str, pd.Series]:
+    """Fracción de la muestra (sin nulos) que parsea como número."""
+    numbers, report = clean_numeric(sample, decimal=decimal, downcast=False)
+    rate = float(numbers.notna().mean()) if len(numbers) else 0.0
+    return rate, report['decimal'], numbers
@@ -0,0 +1,77 @@
+"""
+Caché de secciones de reportes PDF ya renderizadas, indexadas por sus datos.
+Cada sección (página 1, 2, ... o anexo) se guarda como un PDF propio con el
+hash de todo lo que dibuja: al regenerar un reporte solo pasan por
+reportlab las secciones cuyos datos cambiaron; las demás se reutilizan y
+se unen (ver pdf_assembly).
+"""
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional
+
+from .disk_cache import DiskLRU
+from .result_cache import ResultCache
+
+
+# Subir al cambiar el layout de alguna página: invalida lo cacheado en disco
+PAGE_CACHE_VERSION = 4
+
+
+class PageCache:
+    """PDFs de secciones en memoria (LRU) y en disco, con expulsión LRU."""
+    
+    def __init__(self, cache_dir: Optional[str] = ".autoreport_cache/pages", max_entries: int = 256,
+                 max_bytes: int = 512 * 1024 ** 2):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # bytes: inmutables, no hace falta copiarlos
+        self._memory = ResultCache(max_entries=max_entries, copy_values=False)
+        self._disk = DiskLRU(cache_dir, '.pdf', max_bytes) if cache_dir else None
+        self.disk_hits = 0
+    
+    @staticmethod
+    def key_for(section: str, inputs: Dict[str, Any]) -> str:
+        """Hash estable de una sección: nombre + todo lo que se dibuja en ella."""
+        payload = json.dumps({
+            'version': PAGE_CACHE_VERSION,
+            'section': section,
+            'inputs': inputs
+        }, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """PDF cacheado, o None si no está."""
+        pdf_bytes = self._memory.get(key)
+        if pdf_bytes is None and self._disk:
+            pdf_bytes = self._disk.read(key)
+            if pdf_bytes is None:
+                return None
+            self.disk_hits += 1
+            self._memory.set(key, pdf_bytes)
+        return pdf_bytes
+    
+    def store(self, key: str, pdf_bytes: bytes) -> bool:
+        """Guarda el PDF en memoria y en disco. Devuelve False si no se pudo persistir."""
+        self._memory.set(key, pdf_bytes)
+        # Escritura atómica: varios workers pueden guardar el mismo reporte a la vez
+        return self._disk.write(key, pdf_bytes) if self._disk else True
+    
+    def clear(self):
+        """Vacía la caché en memoria (los archivos en disco se expulsan solos)."""
+        self._memory.clear()
+        self.disk_hits = 0
+
+
+_shared_cache: Optional[PageCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """Devuelve la caché de secciones del proceso (se crea al primer uso)."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = PageCache()
+        return _shared_cache
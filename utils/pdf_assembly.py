@@ -0,0 +1,28 @@
+"""
+Une los PDFs de cada sección del reporte en un solo documento (pypdf).
+Las secciones se renderizan por separado para poder cachearlas; acá se
+copian sus páginas tal cual, sin volver a pasar por reportlab.
+"""
+
+import io
+from typing import List
+
+from pypdf import PdfReader, PdfWriter
+
+
+def assemble_pdfs(parts: List[bytes]) -> bytes:
+    """Un PDF con las páginas de `parts` en orden, con la metadata de la primera parte.
+
+    Fuentes y estilos que se repiten entre partes se guardan una sola vez.
+    """
+    writer = PdfWriter()
+    for index, part in enumerate(parts):
+        reader = PdfReader(io.BytesIO(part))
+        writer.append(reader)
+        if index == 0 and reader.metadata:
+            writer.add_metadata(reader.metadata)
+    writer.compress_identical_objects()
+    
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
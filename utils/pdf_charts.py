@@ -0,0 +1,149 @@
+"""
+Charts vectoriales del PDF (línea y torta) con reportlab.graphics.
+Los datos se recortan a lo que el PDF puede mostrar antes de hashearlos, y
+cada chart se construye una sola vez por contenido a través de la ChartCache.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from reportlab.graphics.charts.linecharts import HorizontalLineChart
+from reportlab.graphics.charts.piecharts import Pie
+from reportlab.graphics.shapes import Drawing, Group, String, UserNode
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+
+from .chart_cache import ChartCache, get_chart_cache
+from .downsampling import lttb_indices
+
+
+# ~6" de ancho: más puntos que esto quedan a menos de 2pt entre sí
+PDF_CHART_POINTS = 240
+CHART_WIDTH = 6 * inch
+CHART_HEIGHT = 2.6 * inch
+MAX_LABELS = 6
+
+# Colores de las porciones después del color de marca
+PALETTE = ['#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
+
+
+def _flatten(node):
+    """Reemplaza los widgets por sus formas primitivas, sin textos vacíos.
+
+    Un Drawing con solo formas primitivas se puede guardar como JSON en la
+    ChartCache, y además se dibuja sin recalcular el layout. Las
+    etiquetas en blanco del eje X se descartan: cada una costaba un bloque
+    de texto vacío en el PDF.
+    """
+    while isinstance(node, UserNode):
+        node = node.provideNode()
+    if isinstance(node, String) and not node.text:
+        return None
+    if isinstance(node, Group):
+        contents = [_flatten(child) for child in node.contents]
+        node.contents = [child for child in contents if child is not None]
+        if not node.contents and not isinstance(node, Drawing):
+            return None
+    return node
+
+
+def _sparse_labels(labels: List[str], count: int = MAX_LABELS) -> List[str]:
+    """Deja solo ~`count` etiquetas del eje X (el resto en blanco)."""
+    step = max(1, int(np.ceil(len(labels) / count)))
+    return [label if i % step == 0 else '' for i, label in enumerate(labels)]
+
+
+def _new_drawing(style: Dict[str, Any]) -> Drawing:
+    return Drawing(style['width'], style['height'])
+
+
+def build_line_chart(data: Dict[str, Any], style: Dict[str, Any]) -> Drawing:
+    """Serie de revenue en el tiempo."""
+    drawing = _new_drawing(style)
+    chart = HorizontalLineChart()
+    chart.x = 50
+    chart.y = 30
+    chart.width = style['width'] - 70
+    chart.height = style['height'] - 45
+    chart.data = [data['y_data']]
+    chart.joinedLines = 1
+    chart.lines[0].strokeColor = colors.HexColor(style['brand_color'])
+    chart.lines[0].strokeWidth = 1.5
+    
+    chart.categoryAxis.categoryNames = _sparse_labels(data['x_data'])
+    chart.categoryAxis.labels.fontName = 'Helvetica'
+    chart.categoryAxis.labels.fontSize = 7
+    chart.categoryAxis.visibleTicks = 0
+    chart.valueAxis.labels.fontName = 'Helvetica'
+    chart.valueAxis.labels.fontSize = 7
+    chart.valueAxis.labelTextFormat = '{:,.0f}'.format
+    chart.valueAxis.visibleGrid = 1
+    chart.valueAxis.gridStrokeColor = colors.HexColor('#e0e0e0')
+    drawing.add(chart)
+    return _flatten(drawing)
+
+
+def build_pie_chart(data: Dict[str, Any], style: Dict[str, Any]) -> Drawing:
+    """Participación de cada categoría en el revenue."""
+    drawing = _new_drawing(style)
+    # Deja lugar a los costados para las etiquetas
+    size = min(style['width'] * 0.45, style['height'] - 40)
+    chart = Pie()
+    chart.x = (style['width'] - size) / 2
+    chart.y = (style['height'] - size) / 2
+    chart.width = size
+    chart.height = size
+    chart.data = data['values']
+    chart.labels = data['labels']
+    chart.sideLabels = 1
+    chart.simpleLabels = 0
+    chart.slices.fontName = 'Helvetica'
+    chart.slices.fontSize = 7
+    chart.slices.strokeColor = colors.white
+    chart.slices.strokeWidth = 0.5
+    palette = [style['brand_color']] + PALETTE
+    for i in range(len(data['values'])):
+        chart.slices[i].fillColor = colors.HexColor(palette[i % len(palette)])
+    drawing.add(chart)
+    return _flatten(drawing)
+
+
+BUILDERS = {
+    'line': build_line_chart,
+    'pie': build_pie_chart
+}
+
+
+def chart_inputs(kind: str, chart: Dict[str, Any], max_points: int = PDF_CHART_POINTS) -> Dict[str, Any]:
+    """Solo lo que el chart dibuja: la clave de caché no depende del resto del dict."""
+    if kind == 'line':
+        x_data = [str(x)[:10] for x in chart['x_data']]
+        y_data = [float(y) for y in chart['y_data']]
+        if len(y_data) > max_points:
+            positions = lttb_indices(np.arange(len(y_data), dtype=np.float64), np.array(y_data), max_points)
+            x_data = [x_data[i] for i in positions]
+            y_data = [y_data[i] for i in positions]
+        return {'x_data': x_data, 'y_data': y_data}
+    return {
+        'labels': [str(label) for label in chart['labels']],
+        'values': [float(value) for value in chart['values']]
+    }
+
+
+def chart_drawing(kind: str, chart: Optional[Dict[str, Any]], brand_color: str,
+                  width: float = CHART_WIDTH, height: float = CHART_HEIGHT,
+                  cache: Optional[ChartCache] = None) -> Optional[Drawing]:
+    """Drawing listo para el story del PDF (desde la caché si ya existe), o None."""
+    if not chart:
+        return None
+    style = {
+        'brand_color': brand_color,
+        'width': width,
+        'height': height
+    }
+    cache = cache or get_chart_cache()
+    try:
+        return cache.get_or_build(kind, chart_inputs(kind, chart), style, BUILDERS[kind])
+    except Exception as e:
+        print(f"Error creating {kind} chart: {e}")
+        return None
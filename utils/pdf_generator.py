@@ -5,107 +5,263 @@ Estructura: 4 páginas (Executive Summary, Performance, Trends, Action Items)
 
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image, KeepInFrame
 from reportlab.platypus.flowables import HRFlowable
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.charts.linecharts import HorizontalLineChart
-from reportlab.graphics.charts.piecharts import Pie
-from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab import rl_config
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
+import io
 import os
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from .data_analyzer import DataAnalyzer
+from .long_table import ChunkedTable
+from .pdf_charts import chart_drawing
+from .page_cache import PageCache, get_page_cache
+from .pdf_assembly import assemble_pdfs
+from .pdf_profiler import PDFProfiler
+from .report_template import DEFAULT_BRAND_COLOR, get_report_template
+
+
+# Charts de la página 2, cada uno junto a su tabla (tendencia, categorías)
+LINE_CHART_WIDTH = 4 * inch
+PIE_CHART_WIDTH = 2.4 * inch
+PAGE_2_CHART_HEIGHT = 1.9 * inch
+
+# rl_config es global al proceso: solo builds con la misma codificación corren a la vez
+_ENCODING = threading.Condition()
+_encoding_state = {'compact': None, 'active': 0, 'previous': None, 'waiting': {True: 0, False: 0}}
+
+
+@contextmanager
+def _stream_encoding(compact: bool):
+    """Streams en binario (sin ASCII85, ~25% menos bytes) durante el build si `compact`.
+
+    Los builds del mismo modo no se serializan entre sí; uno del otro modo
+    espera a que terminen (y los nuevos del modo activo le ceden el turno).
+    """
+    state = _encoding_state
+    with _ENCODING:
+        state['waiting'][compact] += 1
+        while state['active'] and (state['compact'] != compact or state['waiting'][not compact]):
+            _ENCODING.wait()
+        state['waiting'][compact] -= 1
+        if not state['active']:
+            state['compact'], state['previous'] = compact, rl_config.useA85
+            if compact:
+                rl_config.useA85 = 0
+        state['active'] += 1
+    try:
+        yield
+    finally:
+        with _ENCODING:
+            state['active'] -= 1
+            if not state['active']:
+                rl_config.useA85 = state['previous']
+                _ENCODING.notify_all()
+
+
+def _clip(text: str, width: float, size: int = 8, bold: bool = False) -> str:
+    """Recorta `text` (con '...') para que entre en una celda de `width` puntos."""
+    font = 'Helvetica-Bold' if bold else 'Helvetica'
+    # Padding horizontal de la celda (6pt por lado)
+    width -= 12
+    if stringWidth(text, font, size) <= width:
+        return text
+    while text and stringWidth(text + '...', font, size) > width:
+        text = text[:-1]
+    return text + '...'
 
 
 class PDFReportGenerator:
     """Genera reportes PDF profesionales de 4 páginas."""
     
-    def __init__(self, client_name: str, data: Dict[str, Any], output_path: str = "report.pdf"):
+    def __init__(self, client_name: str, data: Dict[str, Any], output_path: Optional[str] = "report.pdf",
+                 brand_color: Optional[str] = None, compact: bool = False, incremental: bool = False,
+                 page_cache: Optional[PageCache] = None, profiler: Optional[PDFProfiler] = None):
         self.client_name = client_name
         self.data = data
         self.output_path = output_path
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        # Una sola fecha para todo el reporte (y para las claves de la caché de páginas)
+        self.generated_at = datetime.now()
+        # Modo compacto: streams comprimidos y en binario (opciones de reportlab)
+        self.compact = compact
+        # Modo incremental: reutiliza las secciones ya renderizadas cuyos datos no cambiaron
+        self.incremental = incremental or page_cache is not None
+        self.page_cache = page_cache
+        self.reused_sections: List[str] = []
+        self.rendered_sections: List[str] = []
+        # Tamaño del último PDF generado
+        self.output_size: Optional[int] = None
+        # Instrumentación opcional por etapa y página (ver pdf_profiler); mide solo durante el render
+        self.profiler = profiler
+        self.profile: Optional[Dict[str, Any]] = None
+        
+        # Estilos y páginas estáticas: se cargan en el primer render (ver _setup)
+        self.brand_color = brand_color or DEFAULT_BRAND_COLOR
+        self.template = None
+        self.styles = None
     
-    def _setup_custom_styles(self):
-        """Configura estilos personalizados."""
-        # Título principal
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1f77b4'),
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Subtítulo
-        self.styles.add(ParagraphStyle(
-            name='CustomSubtitle',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=20,
-            spaceBefore=20,
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Texto normal mejorado
-        self.styles.add(ParagraphStyle(
-            name='CustomBody',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            textColor=colors.HexColor('#34495e'),
-            spaceAfter=12,
-            leading=14
-        ))
+    def generate(self) -> str:
+        """Genera el PDF completo en `output_path`."""
+        if not self.output_path:
+            raise ValueError("output_path is required to write the PDF; use render() for in-memory PDFs")
+        if self.incremental:
+            pdf_bytes = self.render()
+            with open(self.output_path, 'wb') as f:
+                f.write(pdf_bytes)
+            return self.output_path
+        
+        began = self._begin_profile()
+        try:
+            self._setup()
+            self._build(self.output_path)
+            self.output_size = os.path.getsize(self.output_path)
+            self._finish_profile()
+        finally:
+            self._cancel_profile(began)
+        return self.output_path
+    
+    def render(self) -> bytes:
+        """Genera el PDF completo en memoria, sin escribir a disco."""
+        began = self._begin_profile()
+        try:
+            self._setup()
+            if self.incremental:
+                pdf_bytes = self._render_incremental()
+            else:
+                buffer = io.BytesIO()
+                self._build(buffer)
+                pdf_bytes = buffer.getvalue()
+            self.output_size = len(pdf_bytes)
+            self._finish_profile()
+        finally:
+            self._cancel_profile(began)
+        return pdf_bytes
+    
+    def _setup(self):
+        """Estilos y páginas estáticas, compilados una vez por proceso y color de marca."""
+        if self.template is None:
+            with self._stage('setup'):
+                self.template = get_report_template(self.brand_color)
+                self.styles = self.template.styles
+    
+    def _stage(self, name: str, section: Optional[str] = None):
+        """Etapa medida por el profiler (no-op sin profiler)."""
+        if self.profiler:
+            return self.profiler.stage(name, section)
+        return nullcontext({})
+    
+    def _begin_profile(self) -> bool:
+        """Empieza a medir si el profiler no estaba activo; devuelve si lo empezó este render."""
+        if self.profiler and not self.profiler.active:
+            self.profiler.begin()
+            return True
+        return False
+    
+    def _finish_profile(self):
+        if self.profiler and self.profiler.active:
+            self.profile = self.profiler.finish(self.output_size)
+    
+    def _cancel_profile(self, began: bool):
+        # Un render que falla no deja tracemalloc encendido
+        if began and self.profiler.active:
+            self.profiler.cancel()
+    
+    def _sections(self) -> List[Tuple[str, Dict[str, Any], Callable[[], List]]]:
+        """Secciones del reporte: (nombre, datos que dibuja, constructor de sus flowables)."""
+        date = self.generated_at.strftime('%B %d, %Y')
+        sections = [
+            # Página 1: Executive Summary
+            ('page_1', {
+                'client_name': self.client_name,
+                'date': date,
+                'metrics': self.data.get('metrics', {}),
+                'growth_horizons': self.data.get('growth_horizons', {}),
+                'insights': self.data.get('insights', [])
+            }, self._create_page_1),
+            # Página 2: Performance Deep Dive
+            ('page_2', {
+                'charts': self.data.get('charts', {}),
+                'breakdowns': self.data.get('breakdowns', [])[:DataAnalyzer.MAX_REPORT_BREAKDOWNS]
+            }, self._create_page_2),
+            # Página 3: Trends & Insights
+            ('page_3', {}, self._create_page_3),
+            # Página 4: Action Items
+            ('page_4', {'client_name': self.client_name, 'date': date}, self._create_page_4)
+        ]
         
-        # Insight destacado
-        self.styles.add(ParagraphStyle(
-            name='Insight',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            textColor=colors.HexColor('#27ae60'),
-            spaceAfter=10,
-            leftIndent=20,
-            fontName='Helvetica-Bold'
-        ))
+        # Anexo opcional: tablas completas, paginadas por bloques
+        if self.data.get('appendix'):
+            sections.append(('appendix', {'appendix': self.data['appendix']}, self._create_appendix))
+        return sections
     
-    def generate(self) -> str:
-        """Genera el PDF completo."""
-        doc = SimpleDocTemplate(
-            self.output_path,
-            pagesize=letter,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=72
-        )
+    def _render_incremental(self) -> bytes:
+        """Reutiliza el PDF de cada sección cuyos datos no cambiaron y renderiza solo las demás.
+
+        Cada sección es un PDF propio en la caché, con clave por sus datos de
+        entrada, el color de marca y el modo compacto; al final se unen las páginas.
+        Las secciones sin datos del cliente (ej. la página 3) se comparten entre clientes.
+        """
+        cache = self.page_cache or get_page_cache()
+        self.reused_sections, self.rendered_sections = [], []
+        parts = []
+        for section in self._sections():
+            name, inputs, _ = section
+            key = cache.key_for(name, {
+                'inputs': inputs,
+                'brand_color': self.template.brand_color,
+                'compact': self.compact
+            })
+            with self._stage('cache_lookup', name):
+                pdf_bytes = cache.get(key)
+            if pdf_bytes is None:
+                buffer = io.BytesIO()
+                self._build(buffer, [section])
+                pdf_bytes = buffer.getvalue()
+                cache.store(key, pdf_bytes)
+                self.rendered_sections.append(name)
+            else:
+                self.reused_sections.append(name)
+            parts.append(pdf_bytes)
         
+        with self._stage('assemble') as stage:
+            pdf_bytes = assemble_pdfs(parts)
+            stage['output_bytes'] = len(pdf_bytes)
+        return pdf_bytes
+    
+    def _build(self, target, sections: Optional[List] = None):
+        """Arma las secciones (todas por defecto) y las escribe en `target` (ruta o buffer binario)."""
+        sections = sections or self._sections()
         story = []
-        
-        # Página 1: Executive Summary
-        story.extend(self._create_page_1())
-        story.append(PageBreak())
-        
-        # Página 2: Performance Deep Dive
-        story.extend(self._create_page_2())
-        story.append(PageBreak())
-        
-        # Página 3: Trends & Insights
-        story.extend(self._create_page_3())
-        story.append(PageBreak())
-        
-        # Página 4: Action Items
-        story.extend(self._create_page_4())
+        # Primer flowable de cada sección, para atribuirle las páginas al medir
+        first_flowables = {}
+        for name, _, create_section in sections:
+            if story:
+                story.append(PageBreak())
+            with self._stage('flowables', name):
+                elements = create_section()
+            if elements:
+                first_flowables[id(elements[0])] = name
+            story.extend(elements)
+        
+        layout = dict(pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
+        if self.compact:
+            layout['pageCompression'] = 1
+        if self.profiler and self.profiler.active:
+            doc = self.profiler.doc_template(target, first_flowables, **layout)
+        else:
+            doc = SimpleDocTemplate(target, **layout)
         
         # Build PDF
-        doc.build(story)
-        
-        return self.output_path
+        with self._stage('layout', sections[0][0] if len(sections) == 1 else None) as stage, \
+                _stream_encoding(self.compact):
+            doc.build(story)
+            stage['output_bytes'] = target.tell() if hasattr(target, 'tell') else os.path.getsize(target)
     
     def _create_page_1(self) -> List:
         """Página 1: Executive Summary."""
@@ -118,18 +274,18 @@ class PDFReportGenerator:
         ))
         
         # Fecha
-        current_date = datetime.now().strftime("%B %d, %Y")
+        current_date = self.generated_at.strftime("%B %d, %Y")
         elements.append(Paragraph(
             f"Generated: {current_date}",
             self.styles['CustomBody']
         ))
         
         elements.append(Spacer(1, 20))
-        elements.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#1f77b4')))
+        elements.append(HRFlowable(width="100%", thickness=2, color=self.template.brand))
         elements.append(Spacer(1, 20))
         
         # Key Metrics Table
-        elements.append(Paragraph("KEY METRICS", self.styles['CustomSubtitle']))
+        elements.append(Paragraph("KEY METRICS", self.styles['CompactSubtitle']))
         
         metrics = self.data.get('metrics', {})
         metrics_data = [['Metric', 'Value', 'Change']]
@@ -152,25 +308,33 @@ class PDFReportGenerator:
             metrics_data.append([label, value_str, change])
         
         metrics_table = Table(metrics_data, colWidths=[3*inch, 1.5*inch, 1*inch])
-        metrics_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('TOPPADDING', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-        ]))
+        metrics_table.setStyle(self.template.table_styles['metrics'])
         
         elements.append(metrics_table)
-        elements.append(Spacer(1, 30))
+        elements.append(Spacer(1, 12))
+        
+        # Growth by period (WoW / MoM / QoQ / YoY), si hay historia suficiente
+        growth_horizons = self.data.get('growth_horizons', {})
+        if growth_horizons:
+            elements.append(Paragraph("GROWTH BY PERIOD", self.styles['CompactSubtitle']))
+            
+            growth_data = [['Period', 'Current', 'Previous', 'Change']]
+            for horizon in growth_horizons.values():
+                growth_data.append([
+                    horizon['label'],
+                    f"${horizon['current']:,.2f}",
+                    f"${horizon['previous']:,.2f}",
+                    f"{horizon['value']:+.1f}%"
+                ])
+            
+            growth_table = Table(growth_data, colWidths=[2.2*inch, 1.4*inch, 1.4*inch, 1*inch])
+            growth_table.setStyle(self.template.table_styles['growth'])
+            
+            elements.append(growth_table)
+            elements.append(Spacer(1, 12))
         
         # Quick Insights
-        elements.append(Paragraph("QUICK INSIGHTS", self.styles['CustomSubtitle']))
+        elements.append(Paragraph("QUICK INSIGHTS", self.styles['CompactSubtitle']))
         
         insights = self.data.get('insights', [])
         for insight in insights:
@@ -186,29 +350,22 @@ class PDFReportGenerator:
             self.styles['CustomBody']
         ))
         
-        return elements
+        return self._one_page(elements)
     
     def _create_page_2(self) -> List:
         """Página 2: Performance Deep Dive."""
         elements = []
         
         elements.append(Paragraph("PERFORMANCE DEEP DIVE", self.styles['CustomTitle']))
-        elements.append(Spacer(1, 20))
-        
-        # Revenue Breakdown
-        elements.append(Paragraph("Revenue Breakdown", self.styles['CustomSubtitle']))
         
         charts = self.data.get('charts', {})
         
-        # Crear gráfico de línea simple (Revenue Over Time)
+        # Revenue Breakdown: gráfico de línea simple (Revenue Over Time)
         if charts.get('line_chart'):
             line_data = charts['line_chart']
             
-            # Descripción del gráfico
-            elements.append(Paragraph(
-                f"<b>{line_data['title']}</b>",
-                self.styles['CustomBody']
-            ))
+            # Título del gráfico como subtítulo de la sección
+            elements.append(Paragraph(line_data['title'], self.styles['CompactSubtitle']))
             
             # Tabla con datos de tendencia
             trend_data = [['Date', 'Revenue']]
@@ -218,25 +375,23 @@ class PDFReportGenerator:
             for date, revenue in zip(x_data, y_data):
                 trend_data.append([str(date)[:10], f"${revenue:,.2f}"])
             
-            trend_table = Table(trend_data, colWidths=[2.5*inch, 2.5*inch])
-            trend_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.Color(0.95, 0.95, 0.95)),
-            ]))
+            trend_table = Table(trend_data, colWidths=[0.95*inch, 1.15*inch])
+            trend_table.setStyle(self.template.table_styles['trend'])
             
-            elements.append(trend_table)
-            elements.append(Spacer(1, 20))
+            # Chart y tabla lado a lado: la página entera entra en una hoja
+            line_drawing = chart_drawing('line', line_data, self.template.brand_color,
+                                         width=LINE_CHART_WIDTH, height=PAGE_2_CHART_HEIGHT)
+            if line_drawing is not None:
+                elements.append(self._row([line_drawing, trend_table], [LINE_CHART_WIDTH + 0.1*inch, 2.2*inch]))
+            else:
+                elements.append(trend_table)
+            elements.append(Spacer(1, 10))
         
         # Category Performance
         if charts.get('pie_chart'):
             pie_data = charts['pie_chart']
             
-            elements.append(Paragraph("Category Performance", self.styles['CustomSubtitle']))
+            elements.append(Paragraph("Category Performance", self.styles['CompactSubtitle']))
             
             category_data = [['Category', 'Revenue', '% of Total']]
             total = sum(pie_data['values'])
@@ -244,28 +399,45 @@ class PDFReportGenerator:
             for label, value in zip(pie_data['labels'][:5], pie_data['values'][:5]):
                 percentage = (value / total * 100) if total > 0 else 0
                 category_data.append([
-                    str(label),
+                    _clip(str(label), 1.6*inch, size=10),
                     f"${value:,.2f}",
                     f"{percentage:.1f}%"
                 ])
             
-            category_table = Table(category_data, colWidths=[2*inch, 1.75*inch, 1.25*inch])
-            category_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27ae60')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.Color(0.95, 0.98, 0.95)),
-            ]))
+            category_table = Table(category_data, colWidths=[1.6*inch, 1.4*inch, 0.9*inch])
+            category_table.setStyle(self.template.table_styles['category'])
             
-            elements.append(category_table)
-        
-        elements.append(Spacer(1, 20))
+            # Participación (torta) junto a la tabla de top categorías
+            pie_drawing = chart_drawing('pie', pie_data, self.template.brand_color,
+                                        width=PIE_CHART_WIDTH, height=PAGE_2_CHART_HEIGHT)
+            if pie_drawing is not None:
+                elements.append(self._row([pie_drawing, category_table], [PIE_CHART_WIDTH, 3.9*inch]))
+            else:
+                elements.append(category_table)
+        
+        elements.append(Spacer(1, 12))
+        
+        # Breakdowns por otras dimensiones y pares (slices del cubo), en columnas
+        breakdowns = self.data.get('breakdowns', [])[:DataAnalyzer.MAX_REPORT_BREAKDOWNS]
+        if breakdowns:
+            cells = []
+            for breakdown in breakdowns:
+                breakdown_data = [[
+                    _clip(' × '.join(breakdown['dimensions']), 1.1*inch, bold=True),
+                    _clip(breakdown['measure'], 0.9*inch, bold=True)
+                ]]
+                for label, value in zip(breakdown['labels'][:5], breakdown['values'][:5]):
+                    breakdown_data.append([_clip(label, 1.1*inch), f"{value:,.2f}"])
+                
+                breakdown_table = Table(breakdown_data, colWidths=[1.1*inch, 0.9*inch])
+                breakdown_table.setStyle(self.template.table_styles['breakdown'])
+                cells.append([Paragraph(breakdown['title'], self.styles['CellTitle']), breakdown_table])
+            
+            elements.append(self._row(cells, [2.1*inch] * len(cells)))
+            elements.append(Spacer(1, 6))
         
         # Performance Analysis
-        elements.append(Paragraph("Analysis", self.styles['CustomSubtitle']))
+        elements.append(Paragraph("Analysis", self.styles['CompactSubtitle']))
         elements.append(Paragraph(
             "Key performance indicators show consistent growth across all major categories. "
             "The data reveals strong customer demand and effective marketing strategies. "
@@ -273,134 +445,60 @@ class PDFReportGenerator:
             self.styles['CustomBody']
         ))
         
-        return elements
+        return self._one_page(elements)
     
-    def _create_page_3(self) -> List:
-        """Página 3: Trends & Insights."""
-        elements = []
-        
-        elements.append(Paragraph("TRENDS & INSIGHTS", self.styles['CustomTitle']))
-        elements.append(Spacer(1, 20))
-        
-        # Key Trends
-        elements.append(Paragraph("Key Trends Identified", self.styles['CustomSubtitle']))
-        
-        trends = [
-            ("Revenue Growth", "↑ 12%", "Strong upward trend in overall revenue compared to previous period"),
-            ("Customer Engagement", "↑ 8%", "Increased customer interaction and repeat purchases"),
-            ("Top Categories", "Stable", "Consistent performance from best-selling product lines"),
-            ("New Opportunities", "+3", "Emerging categories showing potential for growth")
-        ]
-        
-        trends_data = [['Trend', 'Change', 'Description']]
-        for trend, change, desc in trends:
-            trends_data.append([trend, change, desc])
-        
-        trends_table = Table(trends_data, colWidths=[1.5*inch, 0.75*inch, 3*inch])
-        trends_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e74c3c')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (1, -1), 'CENTER'),
-            ('ALIGN', (2, 0), (2, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.Color(0.98, 0.95, 0.95)),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    @staticmethod
+    def _row(cells: List, col_widths: List[float]) -> Table:
+        """Fila de flowables lado a lado, sin bordes ni padding extra."""
+        row = Table([cells], colWidths=col_widths, hAlign='LEFT')
+        row.setStyle(TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+            ('TOPPADDING', (0, 0), (-1, -1), 0),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
         ]))
-        
-        elements.append(trends_table)
-        elements.append(Spacer(1, 30))
-        
-        # Insights Deep Dive
-        elements.append(Paragraph("Detailed Insights", self.styles['CustomSubtitle']))
-        
-        insights_text = [
-            "<b>Customer Behavior:</b> Analysis shows increased purchasing frequency, "
-            "particularly in high-value categories. Customer retention rates remain strong.",
-            
-            "<b>Product Performance:</b> Top-performing products continue to drive revenue growth. "
-            "Consider expanding inventory in these categories to meet demand.",
-            
-            "<b>Market Opportunities:</b> Emerging trends indicate potential for new product lines. "
-            "Early adoption could provide competitive advantage.",
-            
-            "<b>Operational Efficiency:</b> Current processes support growth trajectory. "
-            "Minor optimizations could further improve margins."
-        ]
-        
-        for insight in insights_text:
-            elements.append(Paragraph(insight, self.styles['CustomBody']))
-            elements.append(Spacer(1, 10))
-        
-        return elements
+        return row
+    
+    @staticmethod
+    def _one_page(elements: List) -> List:
+        """La sección en una sola página: si con datos largos no entra, se encoge."""
+        return [KeepInFrame(0, 0, elements, mode='shrink')]
+    
+    def _create_page_3(self) -> List:
+        """Página 3: Trends & Insights (estática, desde la plantilla)."""
+        return self.template.static('page_3')
     
     def _create_page_4(self) -> List:
         """Página 4: Action Items & Recommendations."""
-        elements = []
-        
-        elements.append(Paragraph("ACTION ITEMS & RECOMMENDATIONS", self.styles['CustomTitle']))
-        elements.append(Spacer(1, 20))
-        
-        # Priority Actions
-        elements.append(Paragraph("Priority Actions", self.styles['CustomSubtitle']))
-        
-        actions_data = [
-            ['Priority', 'Action', 'Timeline', 'Impact'],
-            ['HIGH', 'Expand top-performing category inventory', '1-2 weeks', 'High'],
-            ['HIGH', 'Launch targeted marketing for emerging products', '2-3 weeks', 'Medium'],
-            ['MEDIUM', 'Optimize pricing strategy for mid-tier products', '3-4 weeks', 'Medium'],
-            ['MEDIUM', 'Improve customer retention programs', '4-6 weeks', 'High'],
-            ['LOW', 'Review and update product descriptions', '6-8 weeks', 'Low']
-        ]
-        
-        actions_table = Table(actions_data, colWidths=[0.8*inch, 2.5*inch, 1*inch, 0.7*inch])
-        actions_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#9b59b6')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.Color(0.97, 0.95, 0.98)),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        
-        elements.append(actions_table)
-        elements.append(Spacer(1, 30))
-        
-        # Recommendations
-        elements.append(Paragraph("Strategic Recommendations", self.styles['CustomSubtitle']))
-        
-        recommendations = [
-            ("<b>Short-term (1-3 months):</b>", 
-             "Focus on maximizing revenue from existing top performers while testing new product introductions. "
-             "Monitor customer feedback closely and adjust inventory levels accordingly."),
-            
-            ("<b>Medium-term (3-6 months):</b>", 
-             "Expand into emerging categories showing strong early indicators. "
-             "Develop comprehensive marketing campaigns to support new product launches."),
-            
-            ("<b>Long-term (6-12 months):</b>", 
-             "Build brand loyalty through enhanced customer experience initiatives. "
-             "Consider strategic partnerships to expand market reach and product offerings.")
-        ]
-        
-        for title, text in recommendations:
-            elements.append(Paragraph(title, self.styles['CustomBody']))
-            elements.append(Paragraph(text, self.styles['CustomBody']))
-            elements.append(Spacer(1, 10))
-        
-        elements.append(Spacer(1, 20))
-        elements.append(HRFlowable(width="100%", thickness=1, color=colors.grey))
-        elements.append(Spacer(1, 10))
+        elements = self.template.static('page_4')
         
         # Footer
         elements.append(Paragraph(
-            f"<i>This report was automatically generated for {self.client_name} on {datetime.now().strftime('%B %d, %Y')}. "
+            f"<i>This report was automatically generated for {self.client_name} on {self.generated_at.strftime('%B %d, %Y')}. "
             "For questions or additional analysis, please contact your account manager.</i>",
             self.styles['CustomBody']
         ))
         
         return elements
-
+    
+    def _create_appendix(self) -> List:
+        """Anexo: serie diaria completa y todas las categorías."""
+        elements = []
+        
+        elements.append(Paragraph("APPENDIX: FULL DATA", self.styles['CustomTitle']))
+        elements.append(Spacer(1, 10))
+        
+        for table in self.data['appendix']:
+            rows = len(table['data'][0]) if table['data'] else 0
+            elements.append(Paragraph(f"{table['title']} ({rows:,} rows)", self.styles['CustomSubtitle']))
+            elements.append(ChunkedTable(
+                table['columns'],
+                table['data'],
+                table['formats'],
+                col_widths=[3.1*inch, 2*inch, 1.2*inch],
+                style=self.template.table_styles['appendix']
+            ))
+            elements.append(Spacer(1, 20))
+        
+        return elements
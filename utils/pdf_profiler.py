@@ -0,0 +1,200 @@
+"""
+Instrumentación del render de PDFs: tiempo, pico de memoria y tamaño de
+salida por etapa (plantilla, flowables de cada página, layout) y por
+página física del documento.
+El resultado es un dict serializable a JSON; opcionalmente imprime una
+línea por etapa y se lo pasa a un hook para mandarlo a otro colector.
+"""
+
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from reportlab.platypus import ActionFlowable, PageBreak, SimpleDocTemplate
+
+
+MB = 1024 ** 2
+
+
+class PDFProfiler:
+    """Mide las etapas de un render de PDFReportGenerator.
+
+    Con `memory=True` el pico se mide con tracemalloc (solo memoria de
+    Python, y el render se hace más lento: usarlo para diagnosticar, no
+    siempre). `hook` recibe el resultado de cada render terminado.
+    """
+    
+    def __init__(self, memory: bool = True, log: bool = False,
+                 hook: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.memory = memory
+        self.log = log
+        self.hook = hook
+        self.result: Optional[Dict[str, Any]] = None
+        self._stages: List[Dict[str, Any]] = []
+        self._pages: List[Dict[str, Any]] = []
+        self._open: List[Dict[str, Any]] = []
+        self._started_tracing = False
+        self._start: Optional[float] = None
+        self._total: Optional[Dict[str, Any]] = None
+        self._section: Optional[str] = None
+        self._first_flowables: Dict[int, str] = {}
+        self._page = None
+    
+    @property
+    def active(self) -> bool:
+        return self._start is not None
+    
+    def begin(self):
+        """Empieza a medir un render nuevo."""
+        self._stages, self._pages, self._open = [], [], []
+        self._section = None
+        self.result = None
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._start = time.perf_counter()
+        self._total = self._scope()
+    
+    def _scope(self) -> Dict[str, Any]:
+        scope = {'start': time.perf_counter(), 'memory': 0, 'peak': 0}
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # El pico global se reinicia: antes se reparte entre los scopes abiertos
+            self._fold(peak)
+            tracemalloc.reset_peak()
+            scope['memory'] = scope['peak'] = current
+        self._open.append(scope)
+        return scope
+    
+    def _fold(self, peak: int):
+        for scope in self._open:
+            scope['peak'] = max(scope['peak'], peak)
+    
+    def _close(self, scope: Dict[str, Any], record: Dict[str, Any]) -> Dict[str, Any]:
+        record['seconds'] = time.perf_counter() - scope['start']
+        if self.memory:
+            self._fold(tracemalloc.get_traced_memory()[1])
+            record['peak_mb'] = (scope['peak'] - scope['memory']) / MB
+        self._open.remove(scope)
+        return record
+    
+    def stage(self, name: str, section: Optional[str] = None) -> '_Stage':
+        """Context manager de una etapa; `output_bytes` se puede fijar adentro."""
+        return _Stage(self, name, section)
+    
+    def doc_template(self, target, sections: Dict[int, str], **kwargs) -> SimpleDocTemplate:
+        """SimpleDocTemplate que registra cada página; `sections` mapea id(flowable) -> sección."""
+        self._first_flowables = sections
+        return _ProfiledDocTemplate(target, self, **kwargs)
+    
+    def _page_begin(self, doc):
+        self._page = (self._scope(), {'page': len(self._pages) + 1, 'section': None})
+    
+    def _page_flowable(self, flowable):
+        self._section = self._first_flowables.get(id(flowable), self._section)
+        _, record = self._page
+        # Saltos y acciones de plantilla no son contenido de la página
+        if record['section'] is None and not isinstance(flowable, (ActionFlowable, PageBreak)):
+            record['section'] = self._section
+    
+    def _page_end(self, doc):
+        scope, record = self._page
+        # Tamaño del content stream de la página, antes de comprimir
+        record['content_bytes'] = sum(len(op) + 1 for op in doc.canv._code)
+        self._pages.append(self._close(scope, record))
+    
+    def finish(self, output_size: Optional[int] = None) -> Dict[str, Any]:
+        """Cierra el render: arma el resultado, lo loguea y llama al hook."""
+        try:
+            total = self._close(self._total, {'output_bytes': output_size})
+        finally:
+            self._stop()
+        
+        self.result = {
+            'total_seconds': total['seconds'],
+            'peak_mb': total.get('peak_mb'),
+            'output_bytes': output_size,
+            'stages': self._stages,
+            'pages': self._pages
+        }
+        if self.log:
+            for line in self.format_lines():
+                print(line)
+        if self.hook:
+            try:
+                self.hook(self.result)
+            except Exception as e:
+                # Un colector roto no debe romper la generación del reporte
+                print(f"Error in PDF profile hook: {e}")
+        return self.result
+    
+    def cancel(self):
+        """Descarta un render que no terminó (ej. falló): sin resultado ni hook."""
+        self._stop()
+        self._open = []
+    
+    def _stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._start = None
+    
+    def format_lines(self) -> List[str]:
+        """Una línea por etapa y por página del último resultado."""
+        if not self.result:
+            return []
+        
+        def line(label: str, record: Dict[str, Any]) -> str:
+            text = f"[pdf] {label:22s} {record['seconds'] * 1000:8.1f} ms"
+            if record.get('peak_mb') is not None:
+                text += f" {record['peak_mb']:7.2f} MB"
+            for key in ('output_bytes', 'content_bytes'):
+                if record.get(key) is not None:
+                    text += f" {record[key] / 1024:8.1f} KB"
+            return text
+        
+        lines = []
+        for stage in self.result['stages']:
+            label = stage['stage'] + (f" {stage['section']}" if stage.get('section') else '')
+            lines.append(line(label, stage))
+        for page in self.result['pages']:
+            lines.append(line(f"page {page['page']} ({page['section'] or '-'})", page))
+        lines.append(line('total', {
+            'seconds': self.result['total_seconds'],
+            'peak_mb': self.result['peak_mb'],
+            'output_bytes': self.result['output_bytes']
+        }))
+        return lines
+
+
+class _Stage:
+    def __init__(self, profiler: PDFProfiler, name: str, section: Optional[str]):
+        self.profiler = profiler
+        self.record = {'stage': name, 'section': section, 'output_bytes': None}
+        self._scope = None
+    
+    def __enter__(self) -> Dict[str, Any]:
+        if self.profiler.active:
+            self._scope = self.profiler._scope()
+        return self.record
+    
+    def __exit__(self, *exc):
+        if self._scope is not None:
+            self.profiler._stages.append(self.profiler._close(self._scope, self.record))
+
+
+class _ProfiledDocTemplate(SimpleDocTemplate):
+    """SimpleDocTemplate que avisa al profiler el inicio y fin de cada página."""
+    
+    def __init__(self, target, profiler: PDFProfiler, **kwargs):
+        super().__init__(target, **kwargs)
+        self.profiler = profiler
+    
+    def beforePage(self):
+        self.profiler._page_begin(self)
+    
+    def afterPage(self):
+        self.profiler._page_end(self)
+    
+    def afterFlowable(self, flowable):
+        self.profiler._page_flowable(flowable)
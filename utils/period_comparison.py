@@ -0,0 +1,83 @@
+"""
+Motor de comparación de períodos para métricas de crecimiento (WoW, MoM, QoQ, YoY).
+Precalcula una vez las sumas acumuladas sobre las fechas ordenadas y responde
+cualquier ventana con búsqueda binaria, en O(log n) por consulta.
+"""
+
+from typing import Dict, Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+Offset = Union[pd.Timedelta, pd.DateOffset]
+
+
+class PeriodComparator:
+    """Sumas por ventana de tiempo sobre una serie de totales por fecha."""
+    
+    HORIZONS = {
+        'wow': (pd.Timedelta(days=7), 'Growth vs Last Week'),
+        'mom': (pd.DateOffset(months=1), 'Growth vs Last Month'),
+        'qoq': (pd.DateOffset(months=3), 'Growth vs Last Quarter'),
+        'yoy': (pd.DateOffset(years=1), 'Growth vs Last Year'),
+    }
+    
+    def __init__(self, totals: pd.Series):
+        """`totals`: valores indexados por fecha (ej. revenue diario)."""
+        dates = pd.to_datetime(totals.index)
+        values = pd.to_numeric(pd.Series(totals.to_numpy()), errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        
+        valid = ~dates.isna()
+        order = np.argsort(dates[valid].to_numpy(), kind='stable')
+        self.dates = dates[valid].to_numpy()[order]
+        self.cumulative = np.concatenate(([0.0], np.cumsum(values[valid][order])))
+    
+    @property
+    def latest(self) -> Optional[pd.Timestamp]:
+        return pd.Timestamp(self.dates[-1]) if len(self.dates) else None
+    
+    def _position(self, when: Optional[pd.Timestamp]) -> int:
+        if when is None:
+            return len(self.dates)
+        return int(np.searchsorted(self.dates, np.datetime64(when), side='left'))
+    
+    def window_sum(self, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp] = None) -> float:
+        """Suma en [start, end). `None` significa sin límite por ese lado."""
+        left = 0 if start is None else self._position(start)
+        right = self._position(end)
+        if right <= left:
+            return 0.0
+        return float(self.cumulative[right] - self.cumulative[left])
+    
+    def compare_windows(self, current_start, current_end, previous_start, previous_end) -> Dict[str, Any]:
+        """Compara dos ventanas arbitrarias [start, end)."""
+        current = self.window_sum(current_start, current_end)
+        previous = self.window_sum(previous_start, previous_end)
+        growth = ((current - previous) / previous) * 100 if previous > 0 else None
+        return {'current': current, 'previous': previous, 'growth': growth}
+    
+    def trailing(self, offset: Offset) -> Dict[str, Any]:
+        """Última ventana hasta la fecha más reciente vs. la ventana anterior del mismo largo."""
+        latest = self.latest
+        if latest is None:
+            return {'current': 0.0, 'previous': 0.0, 'growth': None}
+        
+        window_start = latest - offset
+        return self.compare_windows(window_start, None, window_start - offset, window_start)
+    
+    def horizons(self, keys=None) -> Dict[str, Dict[str, Any]]:
+        """Crecimiento para varios horizontes; omite los que no tienen período anterior."""
+        results = {}
+        for key in keys or self.HORIZONS:
+            offset, label = self.HORIZONS[key]
+            comparison = self.trailing(offset)
+            if comparison['growth'] is not None:
+                results[key] = {
+                    'value': float(comparison['growth']),
+                    'label': label,
+                    'format': 'percentage',
+                    'current': comparison['current'],
+                    'previous': comparison['previous']
+                }
+        return results
@@ -0,0 +1,260 @@
+"""
+Histórico de reportes como log append-only, con compactación y retención.
+Cada cliente tiene su segmento JSONL (una línea por reporte enviado):
+guardar un reporte es agregar una línea, y el histórico de un cliente se
+lee recién cuando se pide. La compactación reescribe cada segmento
+aplicando la política de retención (borrar lo muy viejo y/o quedarse con
+un reporte por semana o mes de lo viejo).
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from .file_lock import FileLock, file_stamp
+
+
+# Bloque de lectura al recorrer un segmento desde el final
+TAIL_BLOCK = 16 * 1024
+
+
+class RetentionPolicy:
+    """Qué se conserva del histórico al compactar.
+
+    - `max_age_days`: los reportes más viejos se borran.
+    - `downsample_after_days`: de los más viejos que esto se conserva solo el
+      último reporte de cada período (`'week'` o `'month'`).
+    Sin ninguno de los dos se conserva todo.
+    """
+    
+    def __init__(self, max_age_days: Optional[int] = None, downsample_after_days: Optional[int] = None,
+                 downsample_period: str = 'week'):
+        if downsample_period not in ('week', 'month'):
+            raise ValueError(f"Unknown downsample period: {downsample_period}")
+        self.max_age_days = max_age_days
+        self.downsample_after_days = downsample_after_days
+        self.downsample_period = downsample_period
+    
+    @classmethod
+    def from_env(cls) -> 'RetentionPolicy':
+        """AUTOREPORT_HISTORY_MAX_AGE_DAYS, AUTOREPORT_HISTORY_DOWNSAMPLE_DAYS y _PERIOD."""
+        def days(name: str) -> Optional[int]:
+            value = os.getenv(name, '')
+            return int(value) if value.strip() else None
+        
+        return cls(
+            max_age_days=days('AUTOREPORT_HISTORY_MAX_AGE_DAYS'),
+            downsample_after_days=days('AUTOREPORT_HISTORY_DOWNSAMPLE_DAYS'),
+            downsample_period=os.getenv('AUTOREPORT_HISTORY_DOWNSAMPLE_PERIOD', 'week')
+        )
+    
+    @property
+    def active(self) -> bool:
+        return self.max_age_days is not None or self.downsample_after_days is not None
+    
+    def _period(self, date: datetime) -> tuple:
+        if self.downsample_period == 'month':
+            return date.year, date.month
+        return tuple(date.isocalendar()[:2])
+    
+    def apply(self, reports: List[Dict], now: Optional[datetime] = None) -> List[Dict]:
+        """Reportes que sobreviven (en orden, del más viejo al más nuevo)."""
+        if not self.active:
+            return reports
+        now = now or datetime.now()
+        max_age = now - timedelta(days=self.max_age_days) if self.max_age_days is not None else None
+        downsample = (now - timedelta(days=self.downsample_after_days)
+                      if self.downsample_after_days is not None else None)
+        
+        kept = []
+        last_period = None
+        for report in reports:
+            try:
+                date = datetime.fromisoformat(report['date'])
+            except (KeyError, TypeError, ValueError):
+                # Sin fecha legible no hay cómo decidir: se conserva (y no lo reemplaza el siguiente)
+                kept.append(report)
+                last_period = None
+                continue
+            if max_age and date < max_age:
+                continue
+            if downsample and date < downsample:
+                period = self._period(date)
+                # El último del período reemplaza al anterior
+                if kept and period == last_period:
+                    kept[-1] = report
+                else:
+                    kept.append(report)
+                last_period = period
+                continue
+            kept.append(report)
+            last_period = None
+        return kept
+
+
+class ReportLog:
+    """Segmentos JSONL por cliente en `log_dir` (`<client_id>.jsonl`).
+    
+    Las escrituras toman un lock de archivo (`log_dir/.lock`), así una
+    compactación en un proceso no pierde un reporte agregado en otro.
+    """
+    
+    def __init__(self, log_dir: str):
+        self.log_dir = log_dir
+        os.makedirs(log_dir, exist_ok=True)
+        self._lock = FileLock(os.path.join(log_dir, '.lock'))
+        # client_id -> (huella del segmento, contadores): válidos mientras el archivo no cambie
+        self._stats: Dict[int, tuple] = {}
+    
+    def _path(self, client_id: int) -> str:
+        return os.path.join(self.log_dir, f"{client_id}.jsonl")
+    
+    def append(self, client_id: int, report: Dict):
+        """Agrega un reporte al final del segmento del cliente (O(1), sin reescribir nada)."""
+        line = json.dumps(report, separators=(',', ':')) + '\n'
+        path = self._path(client_id)
+        with self._lock:
+            before = file_stamp(path)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line)
+            
+            # Contadores al día sin releer, si nadie más tocó el segmento
+            cached = self._stats.get(client_id)
+            if before is None or (cached and cached[0] == before):
+                count = cached[1]['report_count'] if cached and before else 0
+                self._stats[client_id] = (file_stamp(path), {
+                    'report_count': count + 1,
+                    'last_report_at': report.get('date')
+                })
+    
+    def write(self, client_id: int, reports: List[Dict]) -> bool:
+        """Reemplaza el segmento del cliente por `reports`, de forma atómica."""
+        with self._lock:
+            return self._write(client_id, reports)
+    
+    def _write(self, client_id: int, reports: List[Dict]) -> bool:
+        # Un corte a mitad deja el segmento anterior
+        fd, tmp_path = tempfile.mkstemp(dir=self.log_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(report, separators=(',', ':')) + '\n' for report in reports)
+            os.replace(tmp_path, self._path(client_id))
+        except OSError as e:
+            print(f"Error writing report history for client {client_id}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        return True
+    
+    def read(self, client_id: int) -> List[Dict]:
+        """Histórico completo del cliente, del más viejo al más nuevo."""
+        try:
+            with open(self._path(client_id), 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return []
+        
+        reports = []
+        for line in lines:
+            try:
+                reports.append(json.loads(line))
+            except ValueError:
+                # Línea cortada por un corte a mitad de escritura: se ignora
+                continue
+        return reports
+    
+    def tail(self, client_id: int, offset: int = 0, limit: int = 5) -> List[Dict]:
+        """Reportes del más nuevo al más viejo, salteando `offset`.
+        
+        Lee el segmento desde el final por bloques: el costo depende de
+        `offset + limit`, no del largo del histórico.
+        """
+        wanted = offset + limit
+        try:
+            f = open(self._path(client_id), 'rb')
+        except FileNotFoundError:
+            return []
+        
+        with f:
+            position = f.seek(0, os.SEEK_END)
+            buffer = b''
+            while position > 0 and buffer.count(b'\n') <= wanted:
+                size = min(TAIL_BLOCK, position)
+                position -= size
+                f.seek(position)
+                buffer = f.read(size) + buffer
+        
+        lines = buffer.split(b'\n')
+        if position > 0:
+            # La primera línea del bloque puede estar cortada
+            lines = lines[1:]
+        reports = []
+        for line in reversed(lines):
+            if not line.strip():
+                continue
+            try:
+                reports.append(json.loads(line))
+            except ValueError:
+                continue
+            if len(reports) == wanted:
+                break
+        return reports[offset:]
+    
+    def stats(self, client_id: int) -> Dict:
+        """`report_count` y `last_report_at` del cliente; solo relee si el segmento cambió."""
+        path = self._path(client_id)
+        stamp = file_stamp(path)
+        if stamp is None:
+            return {'report_count': 0, 'last_report_at': None}
+        cached = self._stats.get(client_id)
+        if cached and cached[0] == stamp:
+            return dict(cached[1])
+        
+        # Lo escribió otro proceso (o es la primera vez): contar líneas sin parsear JSON
+        count = 0
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                count += block.count(b'\n')
+        last = self.tail(client_id, 0, 1)
+        stats = {'report_count': count, 'last_report_at': last[0].get('date') if last else None}
+        self._stats[client_id] = (stamp, stats)
+        return dict(stats)
+    
+    def delete(self, client_id: int):
+        with self._lock:
+            try:
+                os.remove(self._path(client_id))
+            except FileNotFoundError:
+                pass
+    
+    def client_ids(self) -> List[int]:
+        return sorted(int(name[:-len('.jsonl')]) for name in os.listdir(self.log_dir)
+                      if name.endswith('.jsonl') and name[:-len('.jsonl')].isdigit())
+    
+    def compact(self, policy: RetentionPolicy, now: Optional[datetime] = None) -> int:
+        """Reescribe cada segmento con lo que conserva `policy`. Devuelve cuántos reportes quitó."""
+        removed = 0
+        for client_id in self.client_ids():
+            with self._lock:
+                reports = self.read(client_id)
+                kept = policy.apply(reports, now)
+                if len(kept) < len(reports) and self._write(client_id, kept):
+                    removed += len(reports) - len(kept)
+        
+        with open(self._marker, 'w') as f:
+            f.write((now or datetime.now()).isoformat())
+        return removed
+    
+    @property
+    def _marker(self) -> str:
+        return os.path.join(self.log_dir, '.compacted')
+    
+    def compacted_at(self) -> Optional[datetime]:
+        """Fecha de la última compactación (None si nunca)."""
+        try:
+            with open(self._marker, 'r') as f:
+                return datetime.fromisoformat(f.read().strip())
+        except (OSError, ValueError):
+            return None
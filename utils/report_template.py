@@ -0,0 +1,350 @@
+"""
+Plantillas precompiladas para PDFReportGenerator.
+Los estilos y el contenido estático de las páginas 3 y 4 (con sus cortes de
+línea ya calculados) se construyen una sola vez por proceso y por color de
+marca, para los últimos MAX_TEMPLATES colores usados; cada reporte solo arma
+sus celdas dinámicas y recibe copias livianas de lo estático.
+"""
+
+import copy
+from typing import Dict, List
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
+from reportlab.lib.units import inch
+from reportlab.platypus import Flowable, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus.flowables import HRFlowable
+
+from .result_cache import ResultCache
+
+
+DEFAULT_BRAND_COLOR = '#1f77b4'
+
+TRENDS = [
+    ("Revenue Growth", "↑ 12%", "Strong upward trend in overall revenue compared to previous period"),
+    ("Customer Engagement", "↑ 8%", "Increased customer interaction and repeat purchases"),
+    ("Top Categories", "Stable", "Consistent performance from best-selling product lines"),
+    ("New Opportunities", "+3", "Emerging categories showing potential for growth")
+]
+
+DETAILED_INSIGHTS = [
+    "<b>Customer Behavior:</b> Analysis shows increased purchasing frequency, "
+    "particularly in high-value categories. Customer retention rates remain strong.",
+    
+    "<b>Product Performance:</b> Top-performing products continue to drive revenue growth. "
+    "Consider expanding inventory in these categories to meet demand.",
+    
+    "<b>Market Opportunities:</b> Emerging trends indicate potential for new product lines. "
+    "Early adoption could provide competitive advantage.",
+    
+    "<b>Operational Efficiency:</b> Current processes support growth trajectory. "
+    "Minor optimizations could further improve margins."
+]
+
+ACTIONS = [
+    ['Priority', 'Action', 'Timeline', 'Impact'],
+    ['HIGH', 'Expand top-performing category inventory', '1-2 weeks', 'High'],
+    ['HIGH', 'Launch targeted marketing for emerging products', '2-3 weeks', 'Medium'],
+    ['MEDIUM', 'Optimize pricing strategy for mid-tier products', '3-4 weeks', 'Medium'],
+    ['MEDIUM', 'Improve customer retention programs', '4-6 weeks', 'High'],
+    ['LOW', 'Review and update product descriptions', '6-8 weeks', 'Low']
+]
+
+RECOMMENDATIONS = [
+    ("<b>Short-term (1-3 months):</b>",
+     "Focus on maximizing revenue from existing top performers while testing new product introductions. "
+     "Monitor customer feedback closely and adjust inventory levels accordingly."),
+    
+    ("<b>Medium-term (3-6 months):</b>",
+     "Expand into emerging categories showing strong early indicators. "
+     "Develop comprehensive marketing campaigns to support new product launches."),
+    
+    ("<b>Long-term (6-12 months):</b>",
+     "Build brand loyalty through enhanced customer experience initiatives. "
+     "Consider strategic partnerships to expand market reach and product offerings.")
+]
+
+
+class StaticParagraph(Paragraph):
+    """Paragraph cuyo corte de líneas se calcula una vez por ancho disponible.
+
+    Las copias (copy.copy) comparten la memoria de cortes, así que el texto
+    estático se parsea y se parte en líneas una sola vez por proceso.
+    """
+    
+    def __init__(self, text, style, *args, **kwargs):
+        super().__init__(text, style, *args, **kwargs)
+        self._wrap_memo = {}
+    
+    def wrap(self, availWidth, availHeight):
+        memo = self._wrap_memo.get(availWidth)
+        if memo is None:
+            width, height = super().wrap(availWidth, availHeight)
+            self._wrap_memo[availWidth] = (self.blPara, self._wrapWidths, width, height)
+            return width, height
+        
+        self.blPara, self._wrapWidths, self.width, self.height = memo
+        return self.width, self.height
+
+
+def build_styles(brand_color: str = DEFAULT_BRAND_COLOR) -> StyleSheet1:
+    """Hoja de estilos del reporte; el color de marca se usa en los títulos."""
+    styles = getSampleStyleSheet()
+    
+    # Título principal
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor(brand_color),
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+    
+    # Subtítulo
+    styles.add(ParagraphStyle(
+        name='CustomSubtitle',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#2c3e50'),
+        spaceAfter=20,
+        spaceBefore=20,
+        fontName='Helvetica-Bold'
+    ))
+    
+    # Subtítulo compacto: páginas con varios bloques (charts, tablas) en una hoja
+    styles.add(ParagraphStyle(
+        name='CompactSubtitle',
+        parent=styles['CustomSubtitle'],
+        fontSize=14,
+        spaceAfter=6,
+        spaceBefore=8
+    ))
+    
+    # Título de celda (ej. breakdowns en columnas)
+    styles.add(ParagraphStyle(
+        name='CellTitle',
+        parent=styles['Normal'],
+        fontSize=9,
+        leading=11,
+        textColor=colors.HexColor('#2c3e50'),
+        spaceAfter=4,
+        fontName='Helvetica-Bold'
+    ))
+    
+    # Texto normal mejorado
+    styles.add(ParagraphStyle(
+        name='CustomBody',
+        parent=styles['Normal'],
+        fontSize=11,
+        textColor=colors.HexColor('#34495e'),
+        spaceAfter=12,
+        leading=14
+    ))
+    
+    # Insight destacado
+    styles.add(ParagraphStyle(
+        name='Insight',
+        parent=styles['Normal'],
+        fontSize=12,
+        textColor=colors.HexColor('#27ae60'),
+        spaceAfter=10,
+        leftIndent=20,
+        fontName='Helvetica-Bold'
+    ))
+    
+    return styles
+
+
+class ReportTemplate:
+    """Estilos, estilos de tabla y flowables estáticos de un tema (color de marca)."""
+    
+    def __init__(self, brand_color: str = DEFAULT_BRAND_COLOR):
+        self.brand_color = brand_color
+        self.brand = colors.HexColor(brand_color)
+        self.styles = build_styles(brand_color)
+        self.table_styles = self._build_table_styles()
+        self._static = {
+            'page_3': self._build_page_3(),
+            'page_4': self._build_page_4()
+        }
+    
+    def _build_table_styles(self) -> Dict[str, TableStyle]:
+        """TableStyles de las tablas dinámicas (se comparten entre reportes)."""
+        return {
+            'metrics': TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), self.brand),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 12),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+                ('FONTSIZE', (0, 1), (-1, -1), 10),
+                ('TOPPADDING', (0, 1), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+            ]),
+            'growth': TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), self.brand),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ]),
+            'trend': TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.Color(0.95, 0.95, 0.95)),
+            ]),
+            'category': TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#27ae60')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.Color(0.95, 0.98, 0.95)),
+            ]),
+            'breakdown': TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 8),
+                ('TOPPADDING', (0, 0), (-1, -1), 2),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ]),
+            # Anexo: filas de alto fijo (ChunkedTable), texto a la izquierda y números a la derecha
+            'appendix': TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), self.brand),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 8),
+                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+                ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('TOPPADDING', (0, 0), (-1, -1), 1),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+                ('LINEBELOW', (0, 0), (-1, -1), 0.25, colors.lightgrey),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.Color(0.96, 0.96, 0.96)]),
+            ]),
+        }
+    
+    def _build_page_3(self) -> List[Flowable]:
+        """Página 3: Trends & Insights (todo estático)."""
+        elements = []
+        
+        elements.append(StaticParagraph("TRENDS & INSIGHTS", self.styles['CustomTitle']))
+        elements.append(Spacer(1, 20))
+        
+        # Key Trends
+        elements.append(StaticParagraph("Key Trends Identified", self.styles['CustomSubtitle']))
+        
+        trends_data = [['Trend', 'Change', 'Description']]
+        for trend, change, desc in TRENDS:
+            trends_data.append([trend, change, desc])
+        
+        trends_table = Table(trends_data, colWidths=[1.5*inch, 0.75*inch, 3*inch])
+        trends_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e74c3c')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (1, -1), 'CENTER'),
+            ('ALIGN', (2, 0), (2, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.Color(0.98, 0.95, 0.95)),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]))
+        
+        elements.append(trends_table)
+        elements.append(Spacer(1, 30))
+        
+        # Insights Deep Dive
+        elements.append(StaticParagraph("Detailed Insights", self.styles['CustomSubtitle']))
+        
+        for insight in DETAILED_INSIGHTS:
+            elements.append(StaticParagraph(insight, self.styles['CustomBody']))
+            elements.append(Spacer(1, 10))
+        
+        return elements
+    
+    def _build_page_4(self) -> List[Flowable]:
+        """Página 4: Action Items & Recommendations, sin el footer (que lleva cliente y fecha)."""
+        elements = []
+        
+        elements.append(StaticParagraph("ACTION ITEMS & RECOMMENDATIONS", self.styles['CustomTitle']))
+        elements.append(Spacer(1, 20))
+        
+        # Priority Actions
+        elements.append(StaticParagraph("Priority Actions", self.styles['CustomSubtitle']))
+        
+        actions_table = Table(ACTIONS, colWidths=[0.8*inch, 2.5*inch, 1*inch, 0.7*inch])
+        actions_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#9b59b6')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.Color(0.97, 0.95, 0.98)),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]))
+        
+        elements.append(actions_table)
+        elements.append(Spacer(1, 30))
+        
+        # Recommendations
+        elements.append(StaticParagraph("Strategic Recommendations", self.styles['CustomSubtitle']))
+        
+        for title, text in RECOMMENDATIONS:
+            elements.append(StaticParagraph(title, self.styles['CustomBody']))
+            elements.append(StaticParagraph(text, self.styles['CustomBody']))
+            elements.append(Spacer(1, 10))
+        
+        elements.append(Spacer(1, 20))
+        elements.append(HRFlowable(width="100%", thickness=1, color=colors.grey))
+        elements.append(Spacer(1, 10))
+        
+        return elements
+    
+    def static(self, name: str) -> List[Flowable]:
+        """Copias livianas de los flowables estáticos de una página.
+
+        reportlab guarda el estado del layout en cada flowable; las copias
+        permiten usar la plantilla en varios reportes (y threads) a la vez.
+        """
+        return [copy.copy(flowable) for flowable in self._static[name]]
+
+
+# Plantillas compiladas que se conservan (LRU por color de marca). Cada una pesa
+# poco, pero los colores vienen de los clientes: sin tope, la caché crece con ellos
+MAX_TEMPLATES = 32
+
+_templates = ResultCache(max_entries=MAX_TEMPLATES, copy_values=False)
+
+
+def _compile(key: str) -> ReportTemplate:
+    try:
+        return ReportTemplate(key)
+    except ValueError as e:
+        if key == DEFAULT_BRAND_COLOR:
+            raise
+        # Color inválido: se usa el tema por defecto
+        print(f"Invalid brand color {key}: {e}")
+        return get_report_template(DEFAULT_BRAND_COLOR)
+
+
+def get_report_template(brand_color: str = DEFAULT_BRAND_COLOR) -> ReportTemplate:
+    """Devuelve la plantilla compilada del proceso para un color de marca."""
+    key = (brand_color or DEFAULT_BRAND_COLOR).lower()
+    return _templates.get_or_compute(key, lambda: _compile(key))
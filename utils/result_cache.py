@@ -0,0 +1,110 @@
+"""
+Caché de resultados de análisis compartida entre reruns y sesiones.
+Las entradas se indexan por un fingerprint del contenido del DataFrame
+más el esquema detectado, con tamaño acotado y expulsión LRU. Cada sesión
+recibe su propia copia: modificar un resultado no afecta a las demás.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import pandas as pd
+
+
+def dataframe_fingerprint(df: pd.DataFrame, schema: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Hash estable del contenido del DataFrame + esquema detectado."""
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=True).values
+    except TypeError:
+        # Celdas no hasheables (listas, dicts): no se puede cachear
+        return None
+    
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(row_hashes.tobytes())
+    digest.update(json.dumps({
+        'columns': [str(col) for col in df.columns],
+        'dtypes': [str(dtype) for dtype in df.dtypes],
+        'schema': schema or {}
+    }, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Caché LRU acotada y thread-safe para resultados de análisis.
+
+    Con `copy_values` (default) guarda y devuelve copias profundas, así nadie
+    comparte objetos mutables (DataFrames, dicts) con otra sesión. Las cachés
+    de valores inmutables o que copian por su cuenta pasan False.
+    """
+    
+    def __init__(self, max_entries: int = 64, copy_values: bool = True):
+        self.max_entries = max_entries
+        self.copy_values = copy_values
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def _copy(self, value: Any) -> Any:
+        return copy.deepcopy(value) if self.copy_values else value
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Obtiene una entrada (copia) y la marca como usada recientemente."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = self._entries[key]
+        # La copia se hace fuera del lock: lo guardado nunca se modifica
+        return self._copy(value)
+    
+    def set(self, key: Hashable, value: Any):
+        """Guarda una entrada (copia), expulsando la menos usada si hace falta."""
+        value = self._copy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Devuelve el valor cacheado o lo calcula y lo guarda."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            # Se calcula fuera del lock: dos sesiones pueden calcular a la vez,
+            # pero ninguna bloquea a las demás mientras tanto.
+            value = compute()
+            self.set(key, value)
+        return value
+    
+    def clear(self):
+        """Vacía la caché."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+
+# Una sola caché por proceso: Streamlit importa el módulo una vez y todas
+# las sesiones del servidor la comparten.
+_shared_cache = ResultCache()
+
+
+def get_shared_cache() -> ResultCache:
+    """Devuelve la caché compartida del proceso."""
+    return _shared_cache
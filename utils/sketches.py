@@ -0,0 +1,90 @@
+"""
+Sketches mergeables para conteos de valores distintos en modo streaming.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class DistinctCounter:
+    """Cuenta valores distintos: exacto hasta `exact_limit`, luego HyperLogLog."""
+    
+    def __init__(self, precision: int = 14, exact_limit: int = 50000):
+        self.precision = precision
+        self.m = 1 << precision
+        self.exact_limit = exact_limit
+        self._exact = np.empty(0, dtype=np.uint64)
+        self.registers = None
+    
+    @staticmethod
+    def _hash(values: pd.Series) -> np.ndarray:
+        values = values.dropna()
+        if len(values) == 0:
+            return np.empty(0, dtype=np.uint64)
+        return pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+    
+    def add(self, values: pd.Series) -> 'DistinctCounter':
+        """Añade los valores de un chunk."""
+        self._add_hashes(self._hash(values))
+        return self
+    
+    def _add_hashes(self, hashes: np.ndarray):
+        if self.registers is None:
+            self._exact = np.union1d(self._exact, hashes)
+            if len(self._exact) > self.exact_limit:
+                # Pasa a modo aproximado con memoria fija (2^precision bytes)
+                self.registers = np.zeros(self.m, dtype=np.uint8)
+                self._update_registers(self._exact)
+                self._exact = np.empty(0, dtype=np.uint64)
+        else:
+            self._update_registers(hashes)
+    
+    def _update_registers(self, hashes: np.ndarray):
+        if len(hashes) == 0:
+            return
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        # Bit centinela: el rango queda acotado a 64 - p + 1
+        rest = (hashes << p) | (np.uint64(1) << (p - np.uint64(1)))
+        rank = (_leading_zeros(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+    
+    def merge(self, other: 'DistinctCounter') -> 'DistinctCounter':
+        """Combina otro contador (mismo `precision`) en este."""
+        if other.registers is None:
+            self._add_hashes(other._exact)
+        else:
+            if self.registers is None:
+                self.registers = np.zeros(self.m, dtype=np.uint8)
+                self._update_registers(self._exact)
+                self._exact = np.empty(0, dtype=np.uint64)
+            np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+    
+    @property
+    def is_exact(self) -> bool:
+        return self.registers is None
+    
+    def count(self) -> int:
+        """Número estimado (o exacto) de valores distintos."""
+        if self.registers is None:
+            return int(len(self._exact))
+        
+        m = float(self.m)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            # Corrección de rango bajo (linear counting)
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+def _leading_zeros(values: np.ndarray) -> np.ndarray:
+    """Ceros a la izquierda de enteros uint64 no nulos (exacto, por mitades de 32 bits)."""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    with np.errstate(divide='ignore'):
+        high_bits = np.floor(np.log2(high))
+        low_bits = np.floor(np.log2(low))
+    return np.where(high > 0, 31 - high_bits, 63 - low_bits).astype(np.int64)
@@ -0,0 +1,213 @@
+"""
+Análisis en streaming para CSVs más grandes que la memoria.
+Lee el archivo por chunks y mantiene agregados parciales mergeables
+(sumas, conteos, totales por día y categoría, sketches de clientes).
+Produce las mismas métricas, charts e insights que DataAnalyzer; con
+fechas que traen hora, la serie temporal queda por día.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, Optional, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from .aggregation import AggregationPlan
+from .cube import MetricCube
+from .data_analyzer import DataAnalyzer
+from .result_cache import ResultCache
+from .sketches import DistinctCounter
+
+
+def resolve_data_path(data_dir: str, name: str) -> Optional[str]:
+    """
+    Ruta real de `name` dentro de `data_dir`, o None si sale del directorio
+    (.., rutas absolutas, symlinks) o no es un archivo. Nunca distingue entre
+    "no existe" y "no permitido".
+    """
+    if not data_dir or not name:
+        return None
+    root = os.path.realpath(data_dir)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+        return None
+    return path
+
+
+class PartialAggregates:
+    """Agregados parciales por chunk; se combinan y responden como un AggregationPlan.
+
+    Las agrupaciones por una columna de `date_columns` se hacen por día: con
+    timestamps (ej. un evento por segundo) un grupo por valor crecería con el
+    archivo, y la memoria tiene que quedar acotada. Las `distinct_columns`
+    llevan un sketch de valores distintos y su conteo de no nulos, para
+    medir su `distinct_ratio` sobre el archivo completo.
+    """
+    
+    MERGEABLE = ('sum', 'count', 'min', 'max', 'nunique')
+    
+    def __init__(self, requests: Iterable[Tuple[Optional[str], str, str]], date_columns: Iterable[str] = (),
+                 distinct_columns: Iterable[str] = ()):
+        self.requests = list(requests)
+        self.date_columns = set(date_columns)
+        self.distinct_columns = list(distinct_columns)
+        for by, value, how in self.requests:
+            if how not in self.MERGEABLE:
+                raise ValueError(f"Aggregation is not mergeable: {how}")
+            if how == 'nunique' and by is not None:
+                raise ValueError("Grouped nunique is not supported in streaming mode")
+        
+        self.rows = 0
+        self.totals: Dict[Tuple, Any] = {}
+        self.grouped: Dict[Tuple, pd.Series] = {}
+        self.distinct: Dict[str, DistinctCounter] = {}
+        self.non_null: Dict[str, int] = {}
+    
+    def update(self, chunk: pd.DataFrame) -> 'PartialAggregates':
+        """Incorpora un chunk: un groupby por clave, igual que en memoria."""
+        self.rows += len(chunk)
+        days = {by: self._day(chunk[by]) for by, _, _ in self.requests if by in self.date_columns}
+        if days:
+            chunk = chunk.copy(deep=False)
+            for col, values in days.items():
+                chunk[col] = values
+        plan = AggregationPlan(chunk)
+        
+        distinct = [value for _, value, how in self.requests if how == 'nunique']
+        for col in dict.fromkeys(distinct + self.distinct_columns):
+            self.distinct.setdefault(col, DistinctCounter()).add(chunk[col])
+        for col in self.distinct_columns:
+            self.non_null[col] = self.non_null.get(col, 0) + int(chunk[col].notna().sum())
+        for by, value, how in self.requests:
+            if how != 'nunique':
+                plan.add(by, value, how)
+        
+        for by, value, how in self.requests:
+            if how != 'nunique':
+                self._combine((by, value, how), plan.result(by, value, how))
+        return self
+    
+    @staticmethod
+    def _day(values: pd.Series) -> pd.Series:
+        if not pd.api.types.is_datetime64_any_dtype(values):
+            values = pd.to_datetime(values, errors='coerce')
+        return values.dt.normalize()
+    
+    def merge(self, other: 'PartialAggregates') -> 'PartialAggregates':
+        """Combina los agregados de otro lector (ej. otro archivo o worker)."""
+        self.rows += other.rows
+        for key, value in other.totals.items():
+            self._combine(key, value)
+        for key, series in other.grouped.items():
+            self._combine(key, series)
+        for col, counter in other.distinct.items():
+            self.distinct.setdefault(col, DistinctCounter()).merge(counter)
+        for col, count in other.non_null.items():
+            self.non_null[col] = self.non_null.get(col, 0) + count
+        return self
+    
+    def _combine(self, key: Tuple, value: Any):
+        by, _, how = key
+        store = self.totals if by is None else self.grouped
+        if key not in store:
+            store[key] = value
+            return
+        
+        current = store[key]
+        if by is None:
+            if how in ('sum', 'count'):
+                store[key] = current + value
+            elif how == 'min':
+                store[key] = np.nanmin([current, value])
+            else:
+                store[key] = np.nanmax([current, value])
+        elif how in ('sum', 'count'):
+            store[key] = current.add(value, fill_value=0)
+        elif how == 'min':
+            store[key] = current.combine(value, min, fill_value=np.inf)
+        else:
+            store[key] = current.combine(value, max, fill_value=-np.inf)
+    
+    def result(self, by: Optional[str], value: str, how: str = 'sum') -> Any:
+        """Misma interfaz que AggregationPlan.result."""
+        if how == 'nunique':
+            return self.distinct[value].count()
+        if by is None:
+            return self.totals[(by, value, how)]
+        return self.grouped[(by, value, how)].sort_index()
+    
+    def distinct_ratio(self, col: str) -> float:
+        """Valores distintos (estimados) sobre valores no nulos de una `distinct_column`."""
+        non_null = self.non_null.get(col, 0)
+        if not non_null:
+            return 0.0
+        return min(self.distinct[col].count() / non_null, 1.0)
+    
+    def top(self, by: str, value: str, n: int = 10, how: str = 'sum') -> pd.Series:
+        """Top-n grupos por valor descendente."""
+        return self.result(by, value, how).sort_values(ascending=False, kind='stable').head(n)
+
+
+class StreamingAnalyzer(DataAnalyzer):
+    """DataAnalyzer que lee el CSV por chunks con memoria acotada."""
+    
+    def __init__(self, source, chunksize: int = 200_000, cache: Optional[ResultCache] = None,
+                 sample_size: int = 10000, preview_rows: int = 100, **read_csv_kwargs):
+        self.source = source
+        self.chunksize = chunksize
+        
+        reader = pd.read_csv(source, chunksize=chunksize, **read_csv_kwargs)
+        first = next(reader)
+        
+        # La detección de tipos se hace sobre el primer chunk
+        super().__init__(first, cache=cache, sample_size=sample_size)
+        
+        self.aggregates = PartialAggregates(self._plan_requests(), date_columns=self.detected_columns['dates'],
+                                            distinct_columns=self.detected_columns['categories'])
+        self._cube_dimensions, self._cube_measures = self._cube_columns()
+        self._stream_cube: Optional[MetricCube] = None
+        digest = hashlib.blake2b(digest_size=16)
+        self._consume(first, digest)
+        
+        cleaning = self.detected_columns['cleaning']
+        for chunk in reader:
+            for col, report in self._apply_conversions(chunk, self.detected_columns).items():
+                cleaning[col]['coerced'] += report['coerced']
+            self._consume(chunk, digest)
+        
+        # Con el archivo completo: el primer chunk sobreestima el ratio de las categorías
+        profiles = self.detected_columns['profiles']
+        for col in self.detected_columns['categories']:
+            profiles[col]['cardinality'] = self.aggregates.distinct[col].count()
+            profiles[col]['distinct_ratio'] = self.aggregates.distinct_ratio(col)
+        
+        schema = {key: self.detected_columns[key] for key in ('numeric', 'dates', 'categories', 'metrics')}
+        digest.update(json.dumps({'streaming': True, 'schema': schema}, sort_keys=True, default=str).encode())
+        self._fingerprint = digest.hexdigest()
+        
+        # Solo se conserva una vista previa; los agregados reemplazan al plan
+        self.df = first.head(preview_rows).copy()
+        self._plan = self.aggregates
+    
+    def _consume(self, chunk: pd.DataFrame, digest):
+        self.aggregates.update(chunk)
+        if self._cube_dimensions and self._cube_measures:
+            # Las celdas del cubo son sumas y conteos: se combinan chunk a chunk
+            chunk_cube = MetricCube.build(chunk, self._cube_dimensions, self._cube_measures, max_order=0)
+            if self._stream_cube is None:
+                self._stream_cube = chunk_cube
+            else:
+                self._stream_cube.merge(chunk_cube)
+        digest.update(pd.util.hash_pandas_object(chunk, index=False).values.tobytes())
+    
+    def record_count(self) -> int:
+        """Número total de registros leídos en todos los chunks."""
+        return self.aggregates.rows
+    
+    def _compute_cube(self) -> Optional[MetricCube]:
+        """El cubo acumulado durante la lectura, con sus rollups materializados."""
+        if self._stream_cube is None:
+            return None
+        return self._stream_cube.materialize()